@@ -1,15 +1,38 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, g, request, jsonify, stream_with_context
 from flask_cors import CORS
 from kg_gen import KGGen
-from text_processor import TextProcessor
+from text_processor import TextProcessor, TOKENIZATION_MODES
 from services.graph_service import GraphService
+from services.graph_snapshot import SnapshotStore
+from services.llm_cache import LLMResultCache
+from services.llm_client import LLMClient
+from services.kg_extraction import ChunkedExtractor, IncrementalMerge, merge_graphs
+from services.job_queue import JobQueue, JobStatus, QueueFullError
+from services.entity_resolution import EntityResolver, rewrite_graph
+from services.graph_context import extract_neighbourhood, graph_from_data
+from services.streaming import JsonArrayStreamParser, format_sse
+from services.cluster_summarizer import ClusterSummarizer
+from services.process_stats import worker_stats
+from services.rate_limiter import GCRARateLimiter, MemoryBackend, SQLiteBackend
+from services.instrumentation import instrumentation
+from services.stub_llm import StubKGGen
+from services.token_store import join_pair_keys
+from services.association import WEIGHTINGS
+from services.centrality import SPECTRAL_CENTRALITIES
+from services.admission import (
+    AdmissionController, FAST_PARSE_COST, OverloadedError, PARSE_COST, RequestTooLargeError,
+    estimate_graph_cost, estimate_parse_cost, estimate_text_cost
+)
 import os
 from dotenv import load_dotenv
 import json
 import logging
-import traceback
+import math
+import threading
 import time
+import traceback
 from functools import wraps
+from typing import Dict, List, Optional, Tuple
 
 # Load environment variables
 load_dotenv()
@@ -21,46 +44,408 @@ logger = logging.getLogger(__name__)
 app = Flask(__name__)
 CORS(app)
 
-# Rate limiting configuration
-RATE_LIMIT = 60  # requests per minute
-request_timestamps = []
+# Per-stage timings in a Server-Timing header and Prometheus metrics on /metrics
+instrumentation.enabled = os.getenv("METRICS_ENABLED", "true").lower() == "true"
 
-def rate_limit(f):
-    @wraps(f)
-    def decorated_function(*args, **kwargs):
-        current_time = time.time()
-        # Remove timestamps older than 1 minute
-        request_timestamps[:] = [ts for ts in request_timestamps if current_time - ts < 60]
-        
-        if len(request_timestamps) >= RATE_LIMIT:
-            logger.warning("Rate limit exceeded")
-            return jsonify({
-                'error': 'Rate limit exceeded. Please wait a moment before trying again.',
-                'retry_after': 60 - (current_time - request_timestamps[0])
-            }), 429
-            
-        request_timestamps.append(current_time)
-        return f(*args, **kwargs)
-    return decorated_function
+@app.before_request
+def start_timing():
+    g.timing_started = instrumentation.start_request()
+
+@app.after_request
+def add_server_timing(response):
+    endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+    started = g.pop('timing_started', None)
+    if started is None:
+        # Timed by an outer layer (asgi.py), which only needs the route
+        instrumentation.name_request(endpoint)
+        return response
+
+    header = instrumentation.finish_request(started, endpoint, request.method, response.status_code)
+    if header:
+        response.headers['Server-Timing'] = header
+    return response
+
+@app.teardown_request
+def stop_timing(exc):
+    # after_request does not run when a view raises
+    if g.pop('timing_started', None) is not None:
+        instrumentation.abandon_request()
+
+# Rate limiting: each client gets RATE_LIMIT budget units per minute, and
+# endpoints are charged by cost (LLM calls use more of the budget)
+RATE_LIMIT = int(os.getenv("RATE_LIMIT", "60"))
+LLM_REQUEST_COST = int(os.getenv("RATE_LIMIT_LLM_COST", "5"))
+RATE_LIMIT_TRUST_PROXY = os.getenv("RATE_LIMIT_TRUST_PROXY", "false").lower() == "true"
+
+if os.getenv("RATE_LIMIT_BACKEND", "memory") == "sqlite":
+    # Shared by all worker processes on this host
+    rate_limit_backend = SQLiteBackend(os.getenv(
+        "RATE_LIMIT_PATH",
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "rate_limit.sqlite3")
+    ))
+else:
+    rate_limit_backend = MemoryBackend()
+rate_limiter = GCRARateLimiter(RATE_LIMIT, period=60, backend=rate_limit_backend)
+
+def _client_key() -> str:
+    """Identify the client a request is charged to."""
+    if RATE_LIMIT_TRUST_PROXY and request.headers.get('X-Forwarded-For'):
+        return request.headers['X-Forwarded-For'].split(',')[0].strip()
+    return request.remote_addr or 'unknown'
+
+def rate_limit(f=None, cost: int = 1):
+    """
+    Limit requests per client. Use as @rate_limit or @rate_limit(cost=n).
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            result = rate_limiter.hit(_client_key(), cost=cost)
+            if not result.allowed:
+                logger.warning(f"Rate limit exceeded for {_client_key()}")
+                response = jsonify({
+                    'error': 'Rate limit exceeded. Please wait a moment before trying again.',
+                    'retry_after': result.retry_after
+                })
+                response.headers['Retry-After'] = str(math.ceil(result.retry_after))
+                return response, 429
+
+            return f(*args, **kwargs)
+        return decorated_function
+
+    return decorator(f) if f is not None else decorator
+
+# Admission control: CPU-heavy requests are charged their estimated cost
+# (see services/admission.py) against a per-process capacity, so a few huge
+# requests cannot pin every worker thread while the rest time out
+app.config['MAX_CONTENT_LENGTH'] = int(os.getenv("MAX_REQUEST_BYTES", 5 * 1024 * 1024))
+admission = AdmissionController(
+    capacity=int(float(os.getenv("ADMISSION_CAPACITY", 2e8))),
+    max_request_cost=int(float(os.getenv("ADMISSION_MAX_COST", 1e8))),
+    queue_timeout=float(os.getenv("ADMISSION_QUEUE_TIMEOUT", 5)),
+    max_waiting=int(os.getenv("ADMISSION_MAX_WAITING", 32))
+)
+
+@app.errorhandler(413)
+def request_entity_too_large(e):
+    return jsonify({'error': f"Request body exceeds {app.config['MAX_CONTENT_LENGTH']} bytes"}), 413
+
+def admission_response(e: Exception) -> Tuple[Response, int]:
+    """Turn an admission error into a 413 or a 503 with Retry-After."""
+    if isinstance(e, RequestTooLargeError):
+        return jsonify({
+            'error': 'Request is too large to process. Send less text or a smaller window.',
+            'cost': e.cost,
+            'max_cost': e.limit
+        }), 413
+
+    response = jsonify({
+        'error': 'Server is busy. Please try again shortly.',
+        'retry_after': e.retry_after
+    })
+    response.headers['Retry-After'] = str(math.ceil(e.retry_after))
+    return response, 503
+
+def admission_control(estimate):
+    """
+    Admit a request only when its estimated cost fits. estimate(data) gets the
+    JSON body and returns the cost; ValueError or TypeError means a bad request.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            try:
+                cost = estimate(request.get_json(silent=True) or {})
+            except (TypeError, ValueError) as e:
+                return jsonify({'error': str(e)}), 400
+
+            try:
+                units = admission.acquire(cost)
+            except (RequestTooLargeError, OverloadedError) as e:
+                logger.warning(f"Request not admitted (cost {cost}): {str(e)}")
+                return admission_response(e)
+
+            start = time.monotonic()
+            try:
+                return f(*args, **kwargs)
+            finally:
+                admission.release(units, time.monotonic() - start)
+        return decorated_function
+    return decorator
+
+MAX_WINDOW_SIZES = 16
+MAX_WINDOW_SIZE = 100
+
+def window_size_of(data: Dict) -> int:
+    window_size = data.get('window_size', 4)
+    if (isinstance(window_size, bool) or not isinstance(window_size, int)
+            or not 1 <= window_size <= MAX_WINDOW_SIZE):
+        raise ValueError(f'window_size must be an integer between 1 and {MAX_WINDOW_SIZE}')
+    return window_size
+
+def window_sizes_of(data: Dict) -> List[int]:
+    window_sizes = data.get('window_sizes') or []
+    if not isinstance(window_sizes, list) or len(window_sizes) > MAX_WINDOW_SIZES:
+        raise ValueError(f'window_sizes must be a list of at most {MAX_WINDOW_SIZES} window sizes')
+    return [window_size_of({'window_size': window_size}) for window_size in window_sizes]
+
+def tokenization_of(data: Dict) -> str:
+    tokenization = data.get('tokenization') or text_processor.tokenization
+    if tokenization not in TOKENIZATION_MODES:
+        raise ValueError(f"tokenization must be one of {', '.join(TOKENIZATION_MODES)}")
+    return tokenization
+
+def weighting_of(data: Dict) -> str:
+    weighting = data.get('weighting') or 'count'
+    if weighting not in WEIGHTINGS:
+        raise ValueError(f"weighting must be one of {', '.join(WEIGHTINGS)}")
+    return weighting
+
+def _parse_cost(tokenization: str) -> int:
+    return FAST_PARSE_COST if tokenization == 'fast' else PARSE_COST
+
+def text_request_cost(data: Dict) -> int:
+    text = str(data.get('text') or '')
+    window_size = max([window_size_of(data)] + window_sizes_of(data))
+    tokenization = tokenization_of(data)
+    weighting_of(data)
+    # Texts still in the token store are not parsed again
+    return estimate_text_cost(
+        text, window_size,
+        parsed=text_processor.token_store.contains(text, tokenization),
+        parse_cost=_parse_cost(tokenization),
+        # Progressive requests leave betweenness to a background job
+        with_betweenness=not data.get('progressive')
+    )
+
+def documents_request_cost(data: Dict) -> int:
+    documents = _documents_of(data)
+    return estimate_text_cost(
+        '\n'.join(text for _, text in documents), window_size_of(data),
+        parse_cost=_parse_cost(tokenization_of(data))
+    )
+
+def parse_request_cost(data: Dict) -> int:
+    return estimate_parse_cost(str(data.get('text') or ''))
+
+def server_graph_cost(data: Dict) -> int:
+    graph = graph_service.graph
+    return estimate_graph_cost(
+        graph.number_of_nodes(), graph.number_of_edges(), with_betweenness=not data.get('progressive')
+    )
+
+def graph_request_cost(data: Dict) -> int:
+    # GET /api/graph takes its options from the query string
+    return server_graph_cost({'progressive': request.args.get('progressive', '').lower() in ('1', 'true')})
+
+def cluster_request_cost(data: Dict) -> int:
+    if data.get('nodes'):
+        return estimate_graph_cost(len(data['nodes']), len(data.get('edges') or []), with_betweenness=False)
+    graph = graph_service.graph
+    return estimate_graph_cost(graph.number_of_nodes(), graph.number_of_edges(), with_betweenness=False)
+
+def expand_request_cost(data: Dict) -> int:
+    # The neighbourhood is bounded; building a graph from graphData is not
+    graph_data = data.get('graphData') or {}
+    if not isinstance(graph_data, dict):
+        raise ValueError('graphData must be an object')
+    return estimate_graph_cost(
+        len(graph_data.get('nodes') or []), len(graph_data.get('edges') or []), with_betweenness=False
+    )
+
+def sse_response(events) -> Response:
+    """Wrap an iterator of formatted SSE messages in an unbuffered streaming response."""
+    return Response(events, mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
 
 # Initialize services
-api_key = os.getenv("GOOGLE_API_KEY")
-if not api_key:
-    logger.error("GOOGLE_API_KEY environment variable is not set")
-    raise ValueError("GOOGLE_API_KEY environment variable is not set")
-
-kg = KGGen(
-    model="gemini/gemini-2.0-flash",
-    temperature=0.0,
-    api_key=api_key
+LLM_BACKEND = os.getenv("LLM_BACKEND", "kggen")
+LLM_MODEL = "gemini/gemini-2.0-flash"
+LLM_TEMPERATURE = 0.0
+
+if LLM_BACKEND == "stub":
+    # Local stand-in for load tests and offline development; no API key needed
+    LLM_MODEL = "stub"
+    stub_output = None
+    if os.getenv("STUB_LLM_OUTPUT"):
+        with open(os.getenv("STUB_LLM_OUTPUT"), 'r') as f:
+            stub_output = json.load(f)
+    kg = StubKGGen(
+        latency=float(os.getenv("STUB_LLM_LATENCY", 0.5)),
+        jitter=float(os.getenv("STUB_LLM_JITTER", 0.0)),
+        error_rate=float(os.getenv("STUB_LLM_ERROR_RATE", 0.0)),
+        output=stub_output
+    )
+else:
+    api_key = os.getenv("GOOGLE_API_KEY")
+    if not api_key:
+        logger.error("GOOGLE_API_KEY environment variable is not set")
+        raise ValueError("GOOGLE_API_KEY environment variable is not set")
+
+    kg = KGGen(
+        model=LLM_MODEL,
+        temperature=LLM_TEMPERATURE,
+        api_key=api_key
+    )
+
+# Persistent LLM result cache; identical calls are answered without hitting the API.
+# It lives in the user's cache directory rather than the source tree.
+llm_cache = None
+if os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true":
+    llm_cache = LLMResultCache(
+        path=os.getenv("LLM_CACHE_PATH") or os.path.join(
+            os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+            "knowledge-graph-from-text", "llm_cache.sqlite3"
+        ),
+        ttl_seconds=float(os.getenv("LLM_CACHE_TTL", 7 * 24 * 3600)),
+        max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", 10000)),
+        max_bytes=int(os.getenv("LLM_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+    )
+
+# Concurrent identical calls are coalesced; upstream calls are capped per process
+llm_queue_timeout = os.getenv("LLM_QUEUE_TIMEOUT")
+llm_client = LLMClient(
+    kg,
+    model=LLM_MODEL,
+    temperature=LLM_TEMPERATURE,
+    cache=llm_cache,
+    max_concurrent=int(os.getenv("LLM_MAX_CONCURRENCY", 4)),
+    queue_timeout=float(llm_queue_timeout) if llm_queue_timeout else None
 )
 
+# Long documents are extracted as overlapping chunks on a bounded worker pool
+kg_extractor = ChunkedExtractor(
+    llm_client.generate,
+    chunk_size=int(os.getenv("KG_CHUNK_TOKENS", 400)),
+    overlap=int(os.getenv("KG_CHUNK_OVERLAP", 50)),
+    max_workers=int(os.getenv("KG_MAX_WORKERS", 4))
+)
+
+# Cluster analysis labels each locally computed cluster with one small LLM call
+CLUSTER_GENERATION_CONFIG = {
+    "temperature": 0.0,
+    "max_output_tokens": 300
+}
+
+cluster_summarizer = ClusterSummarizer(
+    lambda prompt: llm_client.generate_text(prompt, generation_config=CLUSTER_GENERATION_CONFIG),
+    max_terms=int(os.getenv("CLUSTER_SUMMARY_TERMS", 10)),
+    max_clusters=int(os.getenv("CLUSTER_MAX_TOP_LEVEL", 12)),
+    max_workers=int(os.getenv("KG_MAX_WORKERS", 4))
+)
+
+# Background jobs keep long LLM round-trips off the request threads
+job_queue = JobQueue(
+    max_workers=int(os.getenv("JOB_WORKERS", 2)),
+    result_ttl=float(os.getenv("JOB_RESULT_TTL", 600)),
+    max_pending=int(os.getenv("JOB_MAX_PENDING", 100))
+)
+
+# Deferred graph metrics run on their own worker, one at a time, so they
+# cannot hold up the LLM jobs; only the job for the current graph matters
+metrics_queue = JobQueue(
+    max_workers=1,
+    result_ttl=float(os.getenv("JOB_RESULT_TTL", 600)),
+    max_pending=int(os.getenv("JOB_MAX_PENDING", 100))
+)
+
+def _queue_of(job_id: str) -> JobQueue:
+    """The queue a job was submitted to."""
+    return metrics_queue if metrics_queue.get(job_id) is not None else job_queue
+
 # Initialize text processor and graph service
-text_processor = TextProcessor()
-graph_service = GraphService()
+# Word vectors can be served from a memory-mapped store shared by all workers
+text_processor = TextProcessor(
+    vector_store_path=os.getenv("VECTOR_STORE_PATH") or None,
+    vector_dtype=os.getenv("VECTOR_STORE_DTYPE", "float32"),
+    token_store_documents=int(os.getenv("TOKEN_STORE_DOCUMENTS", 32)),
+    # 'fast' skips tagger, parser and NER on the co-occurrence path
+    tokenization=os.getenv("TOKENIZATION_MODE", "full")
+)
+graph_service = GraphService(history_size=int(os.getenv("GRAPH_HISTORY_SIZE", 8)))
+
+# Near-duplicate KG-Gen entities are merged before nodes are built
+entity_resolver = None
+if os.getenv("ENTITY_RESOLUTION_ENABLED", "true").lower() == "true":
+    entity_resolver = EntityResolver(
+        text_processor.nlp,
+        similarity_threshold=float(os.getenv("ENTITY_SIMILARITY_THRESHOLD", 0.9))
+    )
+
+# Graph snapshots are stored as memory-mapped flat files under this directory
+snapshot_store = SnapshotStore(os.getenv(
+    "GRAPH_SNAPSHOT_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "snapshots")
+))
+
+# Background job computing the deferred metrics of the current graph, if any
+_metrics_job: Dict = {'generation': None, 'id': None}
+_metrics_job_lock = threading.Lock()
+
+def _complete_graph_metrics(generation: int, base_version: str) -> Dict:
+    """
+    Job body: compute deferred metrics and return them as a delta against the progressive version.
+    
+    The computation holds admission capacity like a synchronous request
+    would, and is skipped if the job was cancelled or its graph replaced
+    while it waited.
+    """
+    job = metrics_queue.current_job()
+    if (job is not None and job.cancel_requested) or graph_service.generation != generation:
+        raise RuntimeError('The graph changed before its metrics were computed')
+
+    graph = graph_service.graph
+    with admission.admit(estimate_graph_cost(graph.number_of_nodes(), graph.number_of_edges())):
+        graph_data = graph_service.complete_deferred_metrics(generation)
+    if graph_data is None:
+        raise RuntimeError('The graph changed before its metrics were ready')
+    return graph_service.versioned_response(graph_data, base_version)
+
+def schedule_deferred_metrics(graph_data: Dict) -> Optional[Dict]:
+    """
+    Queue the metrics missing from progressive graph data.
+
+    A job for an older graph generation is cancelled; one for the same
+    generation is reused.
+
+    Args:
+        graph_data (Dict): Graph data of the current graph
+
+    Returns:
+        Optional[Dict]: Job handle for the response, or None if nothing is
+            pending or the job queue is full
+    """
+    if not graph_data.get('pending_metrics'):
+        return None
+
+    with _metrics_job_lock:
+        generation = graph_service.generation
+        job = metrics_queue.get(_metrics_job['id']) if _metrics_job['id'] else None
+        if job is not None and _metrics_job['generation'] != generation:
+            metrics_queue.cancel(job.id)
+            job = None
+        if job is None or job.status in (JobStatus.FAILED, JobStatus.CANCELLED):
+            try:
+                job = metrics_queue.submit(
+                    _complete_graph_metrics, generation, graph_data['version'],
+                    kind='graph-metrics', priority=1
+                )
+            except QueueFullError as e:
+                logger.warning(f"Deferred metrics not scheduled: {str(e)}")
+                return None
+            _metrics_job.update(generation=generation, id=job.id)
+
+    return {
+        'job_id': job.id,
+        'status_url': f'/api/jobs/{job.id}',
+        'events_url': f'/api/jobs/{job.id}/events'
+    }
 
 @app.route('/api/process-text', methods=['POST'])
 @rate_limit
+@admission_control(text_request_cost)
 def process_text():
     """
     Process input text and return tokens, co-occurrences, and graph data.
@@ -72,36 +457,283 @@ def process_text():
             return jsonify({'error': 'Text is required'}), 400
             
         text = data.get('text', '')
-        window_size = data.get('window_size', 4)
-        
         if not text:
             return jsonify({'error': 'Text is required'}), 400
-            
-        # Update window size if different from default
-        if window_size != text_processor.window_size:
-            text_processor.window_size = window_size
-            
-        # Process text
-        result = text_processor.process(text)
-        
-        # Build graph
+
+        window_size = window_size_of(data)
+        window_sizes = window_sizes_of(data)
+        tokenization = tokenization_of(data)
+
+        weighting = weighting_of(data)
+
+        # Tokens come from the token store when the text was seen before, so
+        # changing the window only recounts co-occurrences; counts and weights
+        # of recent windows are kept with the tokens
+        by_window = None
+        if window_sizes:
+            by_window = text_processor.process_windows(
+                text, window_sizes + [window_size], tokenization
+            )['cooccurrences_by_window']
+        result = text_processor.process(text, window_size, tokenization, weighting)
+
+        # Build graph; in progressive mode the expensive metrics follow from a job
+        progressive = bool(data.get('progressive'))
         graph_data = graph_service.build_graph(
             tokens=result['tokens'],
-            cooccurrences=result['cooccurrences']
+            cooccurrences=result['cooccurrences'],
+            weights=result['weights'],
+            progressive=progressive
         )
-        
-        return jsonify({
-            **result,
-            'graph': graph_data
-        })
-        
+
+        with instrumentation.stage('serialize'):
+            response = {
+                'tokens': result['tokens'],
+                'cooccurrences': join_pair_keys(result['cooccurrences']),
+                'weighting': weighting,
+                'graph': graph_service.versioned_response(graph_data, data.get('since_version'))
+            }
+            if progressive:
+                response['metrics_job'] = schedule_deferred_metrics(graph_data)
+            if by_window is not None:
+                response['cooccurrences_by_window'] = {
+                    str(size): join_pair_keys(counts) for size, counts in by_window.items()
+                }
+            return jsonify(response)
+
     except Exception as e:
         logger.error(f"Error processing text: {str(e)}")
         logger.error(f"Traceback: {traceback.format_exc()}")
         return jsonify({'error': str(e)}), 500
 
+MAX_PROVENANCE_SNIPPETS = 100
+
+def _documents_of(data: Dict) -> List[Tuple[str, str]]:
+    """
+    Read the documents of a request as (id, text) pairs.
+
+    Documents are strings, or objects with 'text' and an optional 'id';
+    they are numbered by position otherwise.
+
+    Raises:
+        ValueError: If the documents are missing or malformed
+    """
+    documents = data.get('documents')
+    if not isinstance(documents, list) or not documents:
+        raise ValueError('documents must be a non-empty list')
+
+    result = []
+    for i, document in enumerate(documents):
+        if isinstance(document, dict):
+            document_id, text = str(document.get('id', i)), document.get('text')
+        else:
+            document_id, text = str(i), document
+        if not isinstance(text, str):
+            raise ValueError(f'Document {document_id} has no text')
+        result.append((document_id, text))
+    return result
+
+@app.route('/api/process-documents', methods=['POST'])
+@rate_limit
+@admission_control(documents_request_cost)
+def process_documents():
+    """
+    Build one co-occurrence graph from several documents and index where
+    every node and edge occurs, for /api/provenance.
+    """
+    try:
+        # Already validated by the admission cost estimate
+        data = request.get_json(silent=True) or {}
+        documents = _documents_of(data)
+
+        result = text_processor.process_documents(documents, window_size_of(data), tokenization_of(data))
+        graph_data = graph_service.build_graph(
+            tokens=result['tokens'],
+            cooccurrences=result['cooccurrences'],
+            provenance=result['provenance']
+        )
+
+        with instrumentation.stage('serialize'):
+            return jsonify({
+                'documents': len(documents),
+                'token_count': len(result['tokens']),
+                'graph': graph_data
+            })
+
+    except Exception as e:
+        logger.error(f"Error processing documents: {str(e)}")
+        logger.error(f"Traceback: {traceback.format_exc()}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/provenance', methods=['GET'])
+def get_provenance():
+    """
+    Return the snippets supporting a node (?node=id) or an edge
+    (?source=id&target=id) of a graph built by /api/process-documents.
+    """
+    provenance = graph_service.provenance
+    if provenance is None:
+        return jsonify({'error': 'The current graph was not built from indexed documents'}), 404
+
+    try:
+        limit = max(1, min(int(request.args.get('limit', 10)), MAX_PROVENANCE_SNIPPETS))
+    except ValueError:
+        return jsonify({'error': 'limit must be an integer'}), 400
+
+    node = request.args.get('node')
+    source, target = request.args.get('source'), request.args.get('target')
+    if node:
+        result = {'node': node, **provenance.node_provenance(node, limit)}
+    elif source and target:
+        result = {'source': source, 'target': target, **provenance.edge_provenance(source, target, limit)}
+    else:
+        return jsonify({'error': 'Pass node, or source and target'}), 400
+
+    if not result['occurrences']:
+        return jsonify({**result, 'error': 'Not found in the indexed documents'}), 404
+    return jsonify(result)
+
+# Query endpoints over the server-side graph; results carry the graph
+# generation so clients can tell when cached results are out of date
+MAX_QUERY_HOPS = 3
+MAX_QUERY_NODES = 2000
+
+def _query_response(result: Dict, index) -> Response:
+    return jsonify({**result, 'generation': index.generation})
+
+def _node_list(data: Dict, name: str) -> List[str]:
+    nodes = data.get(name)
+    if not isinstance(nodes, list) or not nodes:
+        raise ValueError(f'{name} must be a non-empty list of node ids')
+    if len(nodes) > MAX_QUERY_NODES:
+        raise ValueError(f'At most {MAX_QUERY_NODES} nodes can be queried at once')
+    return [str(node) for node in nodes]
+
+def _bounded_int(value, name: str, low: int, high: int) -> int:
+    if isinstance(value, bool) or not isinstance(value, (int, str)):
+        raise ValueError(f'{name} must be an integer')
+    try:
+        value = int(value)
+    except ValueError:
+        raise ValueError(f'{name} must be an integer')
+    if not low <= value <= high:
+        raise ValueError(f'{name} must be between {low} and {high}')
+    return value
+
+@app.route('/api/graph/neighbours', methods=['POST'])
+@rate_limit
+def graph_neighbours():
+    """
+    Return the nodes within `hops` of the given nodes and the edges between them.
+    """
+    data = request.get_json(silent=True) or {}
+    try:
+        seeds = _node_list(data, 'nodes')
+        hops = _bounded_int(data.get('hops', 1), 'hops', 1, MAX_QUERY_HOPS)
+        limit = _bounded_int(data.get('limit', 500), 'limit', 1, MAX_QUERY_NODES)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    try:
+        index = graph_service.query_index()
+        return _query_response(index.neighbours(seeds, hops=hops, limit=limit), index)
+    except Exception as e:
+        logger.error(f"Error querying neighbours: {str(e)}")
+        logger.error(f"Traceback: {traceback.format_exc()}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/graph/shortest-path', methods=['POST'])
+@rate_limit
+def graph_shortest_path():
+    """
+    Return the shortest path between two nodes; stronger edges are shorter.
+    """
+    data = request.get_json(silent=True) or {}
+    source, target = data.get('source'), data.get('target')
+    if source is None or target is None:
+        return jsonify({'error': 'source and target are required'}), 400
+
+    try:
+        index = graph_service.query_index()
+        path = index.shortest_path(str(source), str(target), weighted=bool(data.get('weighted', True)))
+        if path is None:
+            return jsonify({'error': 'No path between these nodes', 'generation': index.generation}), 404
+        return _query_response(path, index)
+    except Exception as e:
+        logger.error(f"Error finding shortest path: {str(e)}")
+        logger.error(f"Traceback: {traceback.format_exc()}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/graph/top', methods=['GET'])
+@rate_limit
+def graph_top_nodes():
+    """
+    Return the top k nodes by a metric (?metric=degree&k=10&order=desc).
+    """
+    try:
+        k = _bounded_int(request.args.get('k', 10), 'k', 1, MAX_QUERY_NODES)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    try:
+        metric = request.args.get('metric', 'degree')
+        if metric in SPECTRAL_CENTRALITIES:
+            # Cheap enough to compute on demand, warm-started from the last graph
+            graph_service.calculate_spectral_centrality(metric)
+        index = graph_service.query_index()
+        if metric not in index.metrics:
+            return jsonify({'error': f"Unknown metric; available: {', '.join(index.metric_names())}"}), 400
+        nodes = index.top_k(metric, k, ascending=request.args.get('order') == 'asc')
+        return _query_response({'metric': metric, 'nodes': nodes}, index)
+    except Exception as e:
+        logger.error(f"Error ranking nodes: {str(e)}")
+        logger.error(f"Traceback: {traceback.format_exc()}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/graph/subgraph', methods=['POST'])
+@rate_limit
+def graph_subgraph():
+    """
+    Return the subgraph induced by a set of nodes.
+    """
+    data = request.get_json(silent=True) or {}
+    try:
+        nodes = _node_list(data, 'nodes')
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    try:
+        index = graph_service.query_index()
+        return _query_response(index.subgraph(nodes), index)
+    except Exception as e:
+        logger.error(f"Error extracting subgraph: {str(e)}")
+        logger.error(f"Traceback: {traceback.format_exc()}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/graph', methods=['GET'])
+@rate_limit
+@admission_control(graph_request_cost)
+def get_graph():
+    """
+    Return the current graph, or only its changes since ?since_version=.
+    
+    With ?progressive=true, metrics that are not computed yet are left out
+    and delivered by the job in 'metrics_job'.
+    """
+    try:
+        progressive = request.args.get('progressive', '').lower() in ('1', 'true')
+        graph_data = graph_service.get_graph_data(progressive)
+        response = graph_service.versioned_response(graph_data, request.args.get('since_version'))
+        if progressive:
+            response = {**response, 'metrics_job': schedule_deferred_metrics(graph_data)}
+        return jsonify(response)
+    except Exception as e:
+        logger.error(f"Error getting graph: {str(e)}")
+        logger.error(f"Traceback: {traceback.format_exc()}")
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/api/filter-edges', methods=['POST'])
 @rate_limit
+@admission_control(server_graph_cost)
 def filter_edges():
     """
     Filter graph edges based on minimum weight threshold.
@@ -109,217 +741,702 @@ def filter_edges():
     try:
         data = request.get_json()
         min_weight = data.get('min_weight', 0.0)
+        progressive = bool(data.get('progressive'))
         
-        filtered_data = graph_service.filter_edges_by_weight(min_weight)
-        return jsonify(filtered_data)
+        filtered_data = graph_service.filter_edges_by_weight(min_weight, progressive)
+        response = graph_service.versioned_response(filtered_data, data.get('since_version'))
+        if progressive:
+            response = {**response, 'metrics_job': schedule_deferred_metrics(filtered_data)}
+        return jsonify(response)
         
     except Exception as e:
         logger.error(f"Error filtering edges: {str(e)}")
         logger.error(f"Traceback: {traceback.format_exc()}")
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/generate-graph', methods=['POST'])
+@app.route('/api/snapshots', methods=['GET'])
+def list_snapshots():
+    """
+    List the names of stored graph snapshots.
+    """
+    return jsonify({'snapshots': snapshot_store.list()})
+
+@app.route('/api/snapshots', methods=['POST'])
 @rate_limit
-def generate_graph():
+@admission_control(server_graph_cost)
+def save_snapshot():
+    """
+    Save the current graph and its metrics as a named snapshot.
+    """
     try:
         data = request.get_json()
         
+        if not data or not data.get('name'):
+            return jsonify({'error': 'Snapshot name is required'}), 400
+            
+        try:
+            path = snapshot_store.path_for(data['name'])
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+            
+        manifest = graph_service.save_snapshot(path)
+        
+        return jsonify({
+            'name': data['name'],
+            'node_count': manifest['node_count'],
+            'edge_count': manifest['edge_count']
+        })
+        
+    except Exception as e:
+        logger.error(f"Error saving snapshot: {str(e)}")
+        logger.error(f"Traceback: {traceback.format_exc()}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/snapshots/<name>/restore', methods=['POST'])
+@rate_limit
+def restore_snapshot(name):
+    """
+    Restore a named snapshot as the current graph.
+    
+    The snapshot files are memory-mapped, so this returns immediately unless
+    the request asks for the full graph with include_graph.
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        
+        try:
+            snapshot = snapshot_store.open(name)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        except KeyError:
+            return jsonify({'error': f'Snapshot not found: {name}'}), 404
+            
+        summary = graph_service.restore_snapshot(snapshot)
+        
+        if data.get('include_graph'):
+            summary['graph'] = graph_service.get_graph_data()
+            
+        return jsonify({'name': name, **summary})
+        
+    except Exception as e:
+        logger.error(f"Error restoring snapshot: {str(e)}")
+        logger.error(f"Traceback: {traceback.format_exc()}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/llm-stats', methods=['GET'])
+def llm_stats():
+    """
+    Return live LLM call and cache hit counters.
+    """
+    return jsonify(llm_client.stats())
+
+@app.route('/api/worker-stats', methods=['GET'])
+def get_worker_stats():
+    """
+    Return memory usage of the server processes.
+
+    Under the pre-fork server (gunicorn.conf.py) this lists the master and
+    every worker with their RSS and proportional (PSS) share, showing how
+    much of the preloaded model is shared copy-on-write.
+    """
+    try:
+        return jsonify(worker_stats())
+    except Exception as e:
+        logger.error(f"Error collecting worker stats: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/admission-stats', methods=['GET'])
+def admission_stats():
+    """
+    Return admission control counters and the capacity in use.
+    """
+    return jsonify(admission.stats())
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """
+    Return stage and request latency metrics in the Prometheus text format.
+    """
+    if not instrumentation.enabled:
+        return jsonify({'error': 'Metrics are disabled'}), 404
+    return Response(instrumentation.render(), mimetype='text/plain; version=0.0.4')
+
+KG_CONTEXT = "Extract key concepts and relationships"
+
+def _key_terms(label: str) -> List[str]:
+    """Key terms shown for a node label."""
+    return [term['term'] for term in text_processor.extract_key_terms(label, max_terms=5)]
+
+def _resolve_entities(kg_result) -> Tuple[object, Dict[str, List[str]]]:
+    """
+    Merge near-duplicate entities and point relations at the canonical ids.
+    
+    Returns:
+        Tuple: (rewritten KG-Gen result, canonical entity -> merged spellings)
+    """
+    aliases = {}
+    if entity_resolver is not None:
+        entity_mapping = entity_resolver.resolve(kg_result.entities)
+        kg_result = rewrite_graph(kg_result, entity_mapping)
+        for alias, canonical in entity_mapping.items():
+            if alias != canonical:
+                aliases.setdefault(canonical, []).append(alias)
+    return kg_result, aliases
+
+def _kg_result_to_graph(kg_result, aliases: Dict[str, List[str]], with_key_terms: bool = True) -> Dict:
+    """
+    Convert KG-Gen output to our graph format.
+    
+    Args:
+        kg_result: KG-Gen result with entities and relations
+        aliases (Dict[str, List[str]]): Merged spellings per entity
+        with_key_terms (bool): Whether to extract key terms for every node
+        
+    Returns:
+        Dict: Graph with 'nodes' and 'edges'
+    """
+    nodes = []
+    edges = []
+    
+    # Create nodes from entities
+    # KG-Gen returns a set of entities
+    for entity in kg_result.entities:
+        node = {
+            'id': entity,
+            'label': entity,
+            'aliases': sorted(aliases.get(entity, []))
+        }
+        if with_key_terms:
+            node['keyTerms'] = _key_terms(entity)
+        nodes.append(node)
+    
+    # Create edges from relations
+    # KG-Gen returns a set of (source, relation_type, target) tuples
+    for i, relation in enumerate(kg_result.relations):
+        source, relation_type, target = relation
+        edge = {
+            'id': f'e{i}',
+            'source': source,
+            'target': target,
+            'label': relation_type
+        }
+        edges.append(edge)
+    
+    return {
+        'nodes': nodes,
+        'edges': edges
+    }
+
+@app.route('/api/generate-graph', methods=['POST'])
+@rate_limit(cost=LLM_REQUEST_COST)
+@admission_control(parse_request_cost)
+def generate_graph():
+    """
+    Generate a knowledge graph from text with KG-Gen.
+    """
+    payload, status = _generate_graph(request.get_json(silent=True))
+    return jsonify(payload), status
+
+def _generate_graph(data: Optional[Dict], processed_tokens: Optional[List[str]] = None) -> Tuple[Dict, int]:
+    """
+    Generate a knowledge graph from text with KG-Gen.
+    
+    Shared by the endpoint, background jobs and the ASGI service.
+    
+    Args:
+        data (Optional[Dict]): Request payload
+        processed_tokens (Optional[List[str]]): Topic-modeling tokens of the
+            text, if already computed elsewhere
+        
+    Returns:
+        Tuple[Dict, int]: Response body and HTTP status code
+    """
+    try:
         if not data or 'text' not in data:
-            return jsonify({'error': 'Text is required'}), 400
+            return {'error': 'Text is required'}, 400
             
         text = data.get('text', '')
         if not text:
-            return jsonify({'error': 'Text is required'}), 400
+            return {'error': 'Text is required'}, 400
         
         # Preprocess text before generating graph
-        processed_tokens = text_processor.process_for_topic_modeling(text)
-        processed_text = ' '.join(processed_tokens)
+        if processed_tokens is None:
+            processed_tokens = text_processor.process_for_topic_modeling(text)
             
-        # Generate the knowledge graph using KG-Gen
+        # Generate the knowledge graph using KG-Gen, one call per chunk
         try:
-            kg_result = kg.generate(
-                input_data=processed_text,
-                context="Extract key concepts and relationships"
+            kg_result = kg_extractor.extract(
+                processed_tokens,
+                context=KG_CONTEXT
             )
             
-            # Convert KG-Gen output to our graph format
-            nodes = []
-            edges = []
-            
-            # Create nodes from entities
-            # KG-Gen returns a set of entities
-            for entity in kg_result.entities:
-                node = {
-                    'id': entity,
-                    'label': entity,
-                    'keyTerms': [term['term'] for term in text_processor.extract_key_terms(entity, max_terms=5)]
-                }
-                nodes.append(node)
-            
-            # Create edges from relations
-            # KG-Gen returns a set of (source, relation_type, target) tuples
-            for i, relation in enumerate(kg_result.relations):
-                source, relation_type, target = relation
-                edge = {
-                    'id': f'e{i}',
-                    'source': source,
-                    'target': target,
-                    'label': relation_type
-                }
-                edges.append(edge)
-            
-            result = {
-                'nodes': nodes,
-                'edges': edges
-            }
+            kg_result, aliases = _resolve_entities(kg_result)
+            result = _kg_result_to_graph(kg_result, aliases)
                     
-            return jsonify(result)
+            return result, 200
             
         except ValueError as e:
-            return jsonify({'error': str(e)}), 400
+            return {'error': str(e)}, 400
         except Exception as e:
             logger.error(f"Error generating graph: {str(e)}")
             logger.error(f"Traceback: {traceback.format_exc()}")
-            return jsonify({'error': 'Failed to generate knowledge graph: ' + str(e)}), 500
+            return {'error': 'Failed to generate knowledge graph: ' + str(e)}, 500
         
     except Exception as e:
         logger.error(f"Unexpected error in generate_graph: {str(e)}")
         logger.error(f"Traceback: {traceback.format_exc()}")
-        return jsonify({'error': 'Invalid response format'}), 500
+        return {'error': 'Invalid response format'}, 500
 
 @app.route('/api/analyze-clusters', methods=['POST'])
-@rate_limit
+@rate_limit(cost=LLM_REQUEST_COST)
+@admission_control(cluster_request_cost)
 def analyze_clusters():
-    try:
-        data = request.get_json()
-        
-        if not data or 'nodes' not in data or 'edges' not in data:
-            return jsonify({'error': 'Graph data is required'}), 400
-
-        # Process nodes to extract key terms
-        for node in data['nodes']:
-            if 'label' in node and not node.get('keyTerms'):
-                terms = text_processor.extract_key_terms(node['label'], max_terms=5)
-                node['keyTerms'] = [term['term'] for term in terms]
-
-        # Limit the number of nodes and edges
-        max_nodes = 50
-        max_edges = 100
-        nodes = data['nodes'][:max_nodes]
-        edges = data['edges'][:max_edges]
+    """
+    Identify clusters of related concepts in a graph.
+    """
+    payload, status = _analyze_clusters(request.get_json(silent=True))
+    return jsonify(payload), status
+
+def _analyze_clusters(data: Optional[Dict]) -> Tuple[Dict, int]:
+    """
+    Identify clusters of related concepts in a graph.
+    
+    Shared by the endpoint and background jobs.
+    
+    Args:
+        data (Optional[Dict]): Request payload
         
-        # Generate the cluster analysis using KGGen
+    Returns:
+        Tuple[Dict, int]: Response body and HTTP status code
+    """
+    try:
+        # Analyze the graph sent by the client, or the server-side graph if none was sent
+        if data and data.get('nodes'):
+            graph = graph_from_data(data)
+            centrality = {
+                node['id']: node['betweenness'] for node in data['nodes']
+                if isinstance(node, dict) and isinstance(node.get('betweenness'), (int, float))
+            } or None
+        elif graph_service.graph.number_of_nodes():
+            graph = graph_service.graph
+            centrality = graph_service.cached_betweenness()
+        else:
+            return {'error': 'Graph data is required'}, 400
+
+        # Partition the full graph locally; only compact cluster summaries reach the LLM
         try:
-            cluster_result = kg.generate(
-                input_data=json.dumps({"nodes": nodes, "edges": edges}),
-                context="Analyze this graph data and identify 2-3 meaningful clusters of related concepts"
-            )
-            
-            # Convert to expected cluster format
-            clusters = []
-            for i, (entity, relations) in enumerate(zip(cluster_result.get('entities', []), cluster_result.get('relations', []))):
-                cluster = {
-                    "id": str(i + 1),
-                    "label": entity,
-                    "nodes": [r[0] for r in relations if r[0] in [n['id'] for n in nodes]],
-                    "edges": [e['id'] for e in edges if e['source'] in cluster['nodes'] and e['target'] in cluster['nodes']],
-                    "summary": f"Cluster of concepts related to {entity}",
-                    "keyTerms": [r[2] for r in relations if isinstance(r[2], str)][:5],
-                    "level": 0,
-                    "color": "#4f46e5"
-                }
-                clusters.append(cluster)
+            clusters = cluster_summarizer.analyze(graph, centrality=centrality)
             
-            return jsonify({"clusters": clusters})
+            return {"clusters": clusters}, 200
             
         except Exception as e:
             logger.error(f"Error in cluster analysis: {str(e)}")
             logger.error(f"Traceback: {traceback.format_exc()}")
-            return jsonify({'error': str(e)}), 500
+            return {'error': str(e)}, 500
             
     except Exception as e:
         logger.error(f"Error in analyze_clusters: {str(e)}")
         logger.error(f"Traceback: {traceback.format_exc()}")
-        return jsonify({
+        return {
             'error': f'Failed to analyze clusters: {str(e)}',
             'traceback': traceback.format_exc()
-        }), 500
+        }, 500
+
+# Bounds for the graph context sent to the LLM by /api/expand-cluster
+EXPAND_CONTEXT_TOKENS = int(os.getenv("EXPAND_CONTEXT_TOKENS", 1500))
+MAX_EXPAND_HOPS = 3
+
+def _cluster_seeds(cluster_id: str, data: Dict) -> List[str]:
+    """
+    Work out which graph nodes belong to the cluster being expanded.
+    
+    Uses explicit nodeIds if given, otherwise the clusterNodes of the matching
+    cluster node in graphData, otherwise the cluster id itself.
+    """
+    def node_id(node):
+        return node.get('id') if isinstance(node, dict) else node
+
+    if isinstance(data.get('nodeIds'), list):
+        candidates = data['nodeIds']
+    else:
+        candidates = [cluster_id]
+        for node in (data.get('graphData') or {}).get('nodes', []):
+            if isinstance(node, dict) and node.get('id') == cluster_id and node.get('clusterNodes'):
+                candidates = [node_id(member) for member in node['clusterNodes']]
+                break
+
+    return [seed for seed in candidates if isinstance(seed, (str, int))]
 
 @app.route('/api/expand-cluster', methods=['POST'])
-@rate_limit
+@rate_limit(cost=LLM_REQUEST_COST)
+@admission_control(expand_request_cost)
 def expand_cluster():
+    """
+    Expand a cluster into more detailed nodes and edges.
+    """
+    payload, status = _expand_cluster(request.get_json(silent=True))
+    return jsonify(payload), status
+
+def _expand_cluster_prompt(data: Optional[Dict]) -> Tuple[Optional[str], Optional[Dict], int]:
+    """
+    Build the expansion prompt for a cluster.
+    
+    Args:
+        data (Optional[Dict]): Request payload
+        
+    Returns:
+        Tuple: (prompt, None, 200) on success or (None, error body, status code)
+    """
+    if not data or 'clusterId' not in data:
+        return None, {'error': 'Cluster ID is required'}, 400
+
     try:
-        data = request.get_json()
+        hops = _bounded_int(data.get('hops', 2), 'hops', 1, MAX_EXPAND_HOPS)
+    except ValueError as e:
+        return None, {'error': str(e)}, 400
+
+    cluster_id = data['clusterId']
+    seeds = _cluster_seeds(cluster_id, data)
+
+    # Only the cluster's neighbourhood goes into the prompt, preferably
+    # taken from the server-side graph rather than the request body
+    if any(seed in graph_service.graph for seed in seeds):
+        context = graph_service.neighbourhood_context(seeds, hops=hops, token_budget=EXPAND_CONTEXT_TOKENS)
+    elif data.get('graphData'):
+        context = extract_neighbourhood(
+            graph_from_data(data['graphData']),
+            seeds,
+            hops=hops,
+            token_budget=EXPAND_CONTEXT_TOKENS
+        )
+    else:
+        return None, {'error': f'Cluster not found in graph: {cluster_id}'}, 404
+
+    if not context['nodes']:
+        return None, {'error': f'Cluster not found in graph: {cluster_id}'}, 404
+
+    # Only the seeds that fit into the context budget are listed
+    included = {node['id'] for node in context['nodes']}
+    cluster_nodes = [seed for seed in dict.fromkeys(seeds) if seed in included]
+
+    prompt = f"""Given this cluster from a knowledge graph, expand it into more detailed nodes and edges.
+    Return ONLY a JSON object with the expanded nodes and edges in this exact format:
+    {{
+        "nodes": [
+            {{"id": "detail1", "label": "Detailed Concept 1"}},
+            {{"id": "detail2", "label": "Detailed Concept 2"}}
+        ],
+        "edges": [
+            {{"source": "detail1", "target": "detail2", "label": "detailed relationship"}}
+        ]
+    }}
+
+    Cluster ID: {cluster_id}
+    Cluster nodes: {json.dumps(cluster_nodes)}
+    Cluster neighbourhood: {json.dumps({'nodes': context['nodes'], 'edges': context['edges']})}
+    """
+    return prompt, None, 200
+
+def _strip_code_fence(text: str) -> str:
+    """Remove a surrounding ```json ... ``` fence from a model response."""
+    result = text.strip()
+    if result.startswith('```json'):
+        result = result[7:]
+    if result.startswith('```'):
+        result = result[3:]
+    if result.endswith('```'):
+        result = result[:-3]
+    return result.strip()
+
+def _parse_expansion(response_text: str) -> Dict:
+    """
+    Parse and validate the model's expansion response.
+    
+    Raises:
+        ValueError: If the response is not a JSON object with nodes and edges
+    """
+    expanded_data = json.loads(_strip_code_fence(response_text))
+    
+    if not isinstance(expanded_data, dict) or 'nodes' not in expanded_data or 'edges' not in expanded_data:
+        raise ValueError("Invalid expansion response format")
+    
+    return expanded_data
+
+EXPAND_GENERATION_CONFIG = {
+    "temperature": 0.2,
+    "max_output_tokens": 1000
+}
+
+def _expand_cluster(data: Optional[Dict]) -> Tuple[Dict, int]:
+    """
+    Expand a cluster into more detailed nodes and edges.
+    
+    Shared by the endpoint and background jobs.
+    
+    Args:
+        data (Optional[Dict]): Request payload
         
-        if not data or 'clusterId' not in data or 'graphData' not in data:
-            return jsonify({'error': 'Cluster ID and graph data are required'}), 400
-
-        cluster_id = data['clusterId']
-        graph_data = data['graphData']
-
-        prompt = f"""Given this cluster from a knowledge graph, expand it into more detailed nodes and edges.
-        Return ONLY a JSON object with the expanded nodes and edges in this exact format:
-        {{
-            "nodes": [
-                {{"id": "detail1", "label": "Detailed Concept 1"}},
-                {{"id": "detail2", "label": "Detailed Concept 2"}}
-            ],
-            "edges": [
-                {{"source": "detail1", "target": "detail2", "label": "detailed relationship"}}
-            ]
-        }}
-
-        Cluster ID: {cluster_id}
-        Original graph: {json.dumps(graph_data)}
-        """
+    Returns:
+        Tuple[Dict, int]: Response body and HTTP status code
+    """
+    try:
+        prompt, error, status = _expand_cluster_prompt(data)
+        if error is not None:
+            return error, status
 
         try:
-            response = kg.model.generate_content(
-                prompt,
-                generation_config={
-                    "temperature": 0.2,
-                    "max_output_tokens": 1000
-                }
-            )
-            
-            result = response.text.strip()
-            if result.startswith('```json'):
-                result = result[7:]
-            if result.startswith('```'):
-                result = result[3:]
-            if result.endswith('```'):
-                result = result[:-3]
-            result = result.strip()
-            
-            expanded_data = json.loads(result)
+            response_text = llm_client.generate_text(prompt, generation_config=EXPAND_GENERATION_CONFIG)
+            expanded_data = _parse_expansion(response_text)
             
             # Process expanded nodes to extract key terms
-            if 'nodes' in expanded_data:
-                for node in expanded_data['nodes']:
-                    if 'label' in node:
-                        terms = text_processor.extract_key_terms(node['label'], max_terms=5)
-                        node['keyTerms'] = [term['term'] for term in terms]
+            for node in expanded_data['nodes']:
+                if 'label' in node:
+                    node['keyTerms'] = _key_terms(node['label'])
             
-            if not isinstance(expanded_data, dict) or 'nodes' not in expanded_data or 'edges' not in expanded_data:
-                raise ValueError("Invalid expansion response format")
-            
-            return jsonify(expanded_data)
+            return expanded_data, 200
             
         except Exception as e:
             logger.error(f"Error expanding cluster: {str(e)}")
             logger.error(f"Traceback: {traceback.format_exc()}")
-            return jsonify({
+            return {
                 'error': f'Failed to expand cluster: {str(e)}',
                 'traceback': traceback.format_exc()
-            }), 500
+            }, 500
             
     except Exception as e:
         logger.error(f"Error in expand_cluster: {str(e)}")
         logger.error(f"Traceback: {traceback.format_exc()}")
-        return jsonify({
+        return {
             'error': f'Failed to expand cluster: {str(e)}',
             'traceback': traceback.format_exc()
-        }), 500
+        }, 500
+
+@app.route('/api/generate-graph/stream', methods=['POST'])
+@rate_limit(cost=LLM_REQUEST_COST)
+@admission_control(parse_request_cost)
+def generate_graph_stream():
+    """
+    Stream knowledge-graph generation as Server-Sent Events.
+    
+    Events: 'entities' and 'relations' as each chunk finishes, 'graph' with the
+    resolved nodes and edges, 'key_terms' per node, then 'done' (or 'error').
+    """
+    data = request.get_json(silent=True)
+    if not data or not data.get('text'):
+        return jsonify({'error': 'Text is required'}), 400
+
+    processed_tokens = text_processor.process_for_topic_modeling(data['text'])
+
+    def events():
+        try:
+            chunk_count = len(kg_extractor.split(processed_tokens))
+            results = {}
+            # Each chunk is diffed against what was already sent; the full merge runs once at the end
+            sent = IncrementalMerge()
+
+            for index, chunk_result in kg_extractor.iter_extract(processed_tokens, context=KG_CONTEXT):
+                results[index] = chunk_result
+                new = sent.add(chunk_result)
+                new_entities = sorted(new.entities)
+                new_relations = sorted(new.relations)
+
+                progress = {'chunk': index, 'completed': len(results), 'chunks': chunk_count}
+                yield format_sse('entities', {**progress, 'entities': new_entities})
+                yield format_sse('relations', {**progress, 'relations': [list(r) for r in new_relations]})
+
+            kg_result, aliases = _resolve_entities(
+                merge_graphs([results[i] for i in sorted(results)])
+            )
+            graph = _kg_result_to_graph(kg_result, aliases, with_key_terms=False)
+            yield format_sse('graph', graph)
+
+            for node in graph['nodes']:
+                node['keyTerms'] = _key_terms(node['label'])
+                yield format_sse('key_terms', {'id': node['id'], 'keyTerms': node['keyTerms']})
+
+            yield format_sse('done', graph)
+
+        except Exception as e:
+            logger.error(f"Error streaming graph generation: {str(e)}")
+            logger.error(f"Traceback: {traceback.format_exc()}")
+            yield format_sse('error', {'error': 'Failed to generate knowledge graph: ' + str(e)})
+
+    return sse_response(stream_with_context(events()))
+
+@app.route('/api/expand-cluster/stream', methods=['POST'])
+@rate_limit(cost=LLM_REQUEST_COST)
+@admission_control(expand_request_cost)
+def expand_cluster_stream():
+    """
+    Stream a cluster expansion as Server-Sent Events.
+    
+    Nodes and edges are sent as 'node' and 'edge' events as soon as each one
+    has been fully generated, followed by 'key_terms' per node and 'done'
+    with the complete expansion (or 'error').
+    """
+    try:
+        prompt, error, status = _expand_cluster_prompt(request.get_json(silent=True))
+    except Exception as e:
+        logger.error(f"Error in expand_cluster_stream: {str(e)}")
+        return jsonify({'error': f'Failed to expand cluster: {str(e)}'}), 500
+    if error is not None:
+        return jsonify(error), status
+
+    def events():
+        try:
+            parser = JsonArrayStreamParser(('nodes', 'edges'))
+            response_text = ''
+
+            for text in llm_client.stream_text(prompt, generation_config=EXPAND_GENERATION_CONFIG):
+                response_text += text
+                for key, item in parser.feed(text):
+                    yield format_sse('node' if key == 'nodes' else 'edge', item)
+
+            expanded_data = _parse_expansion(response_text)
+            for node in expanded_data['nodes']:
+                if 'label' in node:
+                    node['keyTerms'] = _key_terms(node['label'])
+                    yield format_sse('key_terms', {'id': node.get('id'), 'keyTerms': node['keyTerms']})
+
+            yield format_sse('done', expanded_data)
+
+        except Exception as e:
+            logger.error(f"Error streaming cluster expansion: {str(e)}")
+            logger.error(f"Traceback: {traceback.format_exc()}")
+            yield format_sse('error', {'error': f'Failed to expand cluster: {str(e)}'})
+
+    return sse_response(stream_with_context(events()))
+
+# Endpoint handlers that can also run as background jobs
+JOB_HANDLERS = {
+    'generate-graph': _generate_graph,
+    'analyze-clusters': _analyze_clusters,
+    'expand-cluster': _expand_cluster
+}
+
+# Cost estimators of the job handlers; jobs hold admission capacity like the endpoints
+JOB_COSTS = {
+    'generate-graph': parse_request_cost,
+    'analyze-clusters': cluster_request_cost,
+    'expand-cluster': expand_request_cost
+}
+
+# Upper bound for long-polling a job, in seconds
+MAX_JOB_WAIT = 30
+# Client job priorities range from -MAX_JOB_PRIORITY to MAX_JOB_PRIORITY
+MAX_JOB_PRIORITY = 10
+
+def _run_job(handler, data: Dict, cost: int) -> Dict:
+    """Run an endpoint handler inside a job, turning error responses into failures."""
+    with admission.admit(cost):
+        payload, status = handler(data)
+    if status >= 400:
+        raise RuntimeError(payload.get('error', f'Job failed with status {status}'))
+    return payload
+
+@app.route('/api/jobs', methods=['POST'])
+@rate_limit(cost=LLM_REQUEST_COST)
+def submit_job():
+    """
+    Queue an LLM-backed request and return its job id immediately.
+    """
+    try:
+        data = request.get_json(silent=True)
+        
+        if not data or data.get('type') not in JOB_HANDLERS:
+            return jsonify({'error': f'Job type must be one of: {", ".join(JOB_HANDLERS)}'}), 400
+        try:
+            priority = _bounded_int(data.get('priority', 0), 'priority', -MAX_JOB_PRIORITY, MAX_JOB_PRIORITY)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        payload = data.get('payload') or {}
+        if not isinstance(payload, dict):
+            return jsonify({'error': 'payload must be an object'}), 400
+        try:
+            cost = JOB_COSTS[data['type']](payload)
+            admission.check(cost)
+        except (TypeError, ValueError) as e:
+            return jsonify({'error': str(e)}), 400
+        except RequestTooLargeError as e:
+            return admission_response(e)
+            
+        try:
+            job = job_queue.submit(
+                _run_job,
+                JOB_HANDLERS[data['type']],
+                payload,
+                cost,
+                kind=data['type'],
+                priority=priority
+            )
+        except QueueFullError as e:
+            response = jsonify({'error': str(e)})
+            response.headers['Retry-After'] = '5'
+            return response, 503
+            
+        response = jsonify(job.to_dict())
+        response.headers['Location'] = f'/api/jobs/{job.id}'
+        return response, 202
+        
+    except Exception as e:
+        logger.error(f"Error submitting job: {str(e)}")
+        logger.error(f"Traceback: {traceback.format_exc()}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """
+    Return a job's status and, once finished, its result.
+    
+    With ?wait=<seconds> the request blocks until the job finishes or the
+    wait elapses, so clients can long-poll instead of polling in a loop.
+    """
+    wait = min(request.args.get('wait', 0, type=float), MAX_JOB_WAIT)
+    queue = _queue_of(job_id)
+    job = queue.wait(job_id, wait) if wait > 0 else queue.get(job_id)
+    
+    if job is None:
+        return jsonify({'error': f'Job not found: {job_id}'}), 404
+        
+    return jsonify(job.to_dict())
+
+@app.route('/api/jobs/<job_id>/events', methods=['GET'])
+def job_events(job_id):
+    """
+    Push a job's result as a server-sent event once it finishes.
+    
+    Emits 'status' events while the job runs and one 'done' event with the
+    finished job.
+    """
+    queue = _queue_of(job_id)
+    if queue.get(job_id) is None:
+        return jsonify({'error': f'Job not found: {job_id}'}), 404
+
+    def events():
+        while True:
+            job = queue.wait(job_id, MAX_JOB_WAIT)
+            if job is None:
+                yield format_sse('error', {'error': f'Job not found: {job_id}'})
+                return
+            if job.finished:
+                yield format_sse('done', job.to_dict())
+                return
+            yield format_sse('status', job.to_dict())
+
+    return sse_response(stream_with_context(events()))
+
+@app.route('/api/jobs/<job_id>', methods=['DELETE'])
+def cancel_job(job_id):
+    """
+    Cancel a pending or running job.
+    """
+    job = _queue_of(job_id).cancel(job_id)
+    
+    if job is None:
+        return jsonify({'error': f'Job not found: {job_id}'}), 404
+        
+    return jsonify(job.to_dict())
 
 if __name__ == '__main__':
     app.run(debug=True, port=5000) 
\ No newline at end of file
@@ -0,0 +1,345 @@
+"""
+Unified ASGI service for the backend.
+
+Run from the backend directory with:
+
+    uvicorn asgi:app --port 5000
+
+Serves every endpoint of the Flask app in app.py and the text endpoints of
+the former FastAPI service in src/python/api.py from one process:
+
+- spaCy and graph work runs in a process pool, so a long parse never blocks
+  the event loop or other requests.
+- LLM calls wait on the network in a thread pool while the event loop keeps
+  serving. KG-Gen's client is synchronous, so no native async call exists.
+- All other endpoints (snapshots, jobs, streams, stats) are served by the
+  Flask app mounted underneath.
+"""
+import asyncio
+import contextvars
+import functools
+import math
+import os
+import logging
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Callable, Optional, Union
+
+import uvicorn
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from starlette.middleware.wsgi import WSGIMiddleware
+
+import app as flask_app
+from services.nlp_pool import NLPProcessPool
+from services.admission import OverloadedError, RequestTooLargeError
+from services.instrumentation import instrumentation
+
+logger = logging.getLogger(__name__)
+
+nlp_pool = NLPProcessPool(
+    max_workers=int(os.getenv("NLP_POOL_WORKERS", 2)),
+    factory_kwargs={
+        'vector_store_path': os.getenv("VECTOR_STORE_PATH") or None,
+        'vector_dtype': os.getenv("VECTOR_STORE_DTYPE", "float32")
+    }
+)
+
+# Threads that wait on LLM responses; LLMClient bounds the live calls itself
+llm_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("LLM_THREADS", 16)),
+    thread_name_prefix='llm'
+)
+
+
+async def run_blocking(fn: Callable, *args):
+    """Run a blocking, I/O-bound call on the LLM thread pool."""
+    loop = asyncio.get_running_loop()
+    # Carry the request context over so stage timings reach Server-Timing
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(llm_executor, functools.partial(context.run, fn, *args))
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    nlp_pool.shutdown()
+    llm_executor.shutdown(wait=False, cancel_futures=True)
+
+
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(CORSMiddleware, allow_origins=['*'], allow_methods=['*'], allow_headers=['*'])
+
+
+@app.middleware("http")
+async def server_timing(request: Request, call_next):
+    # Stages timed inside the process pool are not included; they run in other processes
+    started = instrumentation.start_request()
+    try:
+        response = await call_next(request)
+    except Exception:
+        instrumentation.abandon_request()
+        raise
+
+    route = request.scope.get('route')
+    header = instrumentation.finish_request(
+        started,
+        route.path if route is not None else 'mounted',
+        request.method,
+        response.status_code
+    )
+    if header:
+        response.headers['Server-Timing'] = header
+    return response
+
+
+def rate_limited(request: Request, cost: int = 1) -> Optional[JSONResponse]:
+    """Charge a request to its client; return a 429 response if over the limit."""
+    client = request.client.host if request.client else 'unknown'
+    if flask_app.RATE_LIMIT_TRUST_PROXY and request.headers.get('x-forwarded-for'):
+        client = request.headers['x-forwarded-for'].split(',')[0].strip()
+
+    result = flask_app.rate_limiter.hit(client, cost=cost)
+    if result.allowed:
+        return None
+
+    logger.warning(f"Rate limit exceeded for {client}")
+    return JSONResponse(
+        {
+            'error': 'Rate limit exceeded. Please wait a moment before trying again.',
+            'retry_after': result.retry_after
+        },
+        status_code=429,
+        headers={'Retry-After': str(math.ceil(result.retry_after))}
+    )
+
+
+def not_admitted(e: Exception) -> JSONResponse:
+    """413 for a request that is too large, 503 with Retry-After when busy."""
+    if isinstance(e, RequestTooLargeError):
+        return JSONResponse(
+            {
+                'error': 'Request is too large to process. Send less text or a smaller window.',
+                'cost': e.cost,
+                'max_cost': e.limit
+            },
+            status_code=413
+        )
+    return JSONResponse(
+        {'error': 'Server is busy. Please try again shortly.', 'retry_after': e.retry_after},
+        status_code=503,
+        headers={'Retry-After': str(math.ceil(e.retry_after))}
+    )
+
+
+async def admit(data: Optional[dict], estimate: Callable) -> Union[int, JSONResponse]:
+    """
+    Reserve admission capacity for a request, as the Flask admission_control does.
+
+    Args:
+        data (Optional[dict]): Request body
+        estimate (Callable): Cost estimator from app.py
+
+    Returns:
+        Union[int, JSONResponse]: Reserved units, to be released with
+            flask_app.admission.release, or the error response to send
+    """
+    try:
+        cost = estimate(data or {})
+    except (TypeError, ValueError) as e:
+        return JSONResponse({'error': str(e)}, status_code=400)
+
+    # Waiting for capacity blocks, so it happens on a thread
+    try:
+        return await run_blocking(flask_app.admission.acquire, cost)
+    except (RequestTooLargeError, OverloadedError) as e:
+        logger.warning(f"Request not admitted (cost {cost}): {str(e)}")
+        return not_admitted(e)
+
+
+async def json_body(request: Request) -> Optional[dict]:
+    """Parse a JSON body like Flask's get_json(silent=True)."""
+    try:
+        return await request.json()
+    except ValueError:
+        return None
+
+
+class TextRequest(BaseModel):
+    text: str
+    max_terms: int = 10
+
+
+class TermRequest(BaseModel):
+    text: str
+    term: str
+    window_size: int = 5
+
+
+@app.post("/process")
+async def process(request: TextRequest):
+    try:
+        tokens = await nlp_pool.call('preprocess_text', request.text)
+        return {"tokens": tokens}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/extract-terms")
+async def extract_terms(request: TextRequest):
+    try:
+        terms = await nlp_pool.call('extract_key_terms', request.text, request.max_terms)
+        return {"terms": terms}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/related-terms")
+async def find_related(request: TermRequest):
+    try:
+        related = await nlp_pool.call('find_related_terms', request.term, request.text, request.window_size)
+        return {"related_terms": related}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/topic-tokens")
+async def get_topic_tokens(request: TextRequest):
+    try:
+        tokens = await nlp_pool.call('process_for_topic_modeling', request.text)
+        return {"tokens": tokens}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/api/process-text")
+async def process_text(request: Request):
+    """
+    Process input text and return tokens, co-occurrences, and graph data.
+    """
+    limited = rate_limited(request)
+    if limited is not None:
+        return limited
+
+    try:
+        data = await json_body(request)
+        if not data or not data.get('text'):
+            return JSONResponse({'error': 'Text is required'}, status_code=400)
+
+        units = await admit(data, flask_app.text_request_cost)
+        if isinstance(units, JSONResponse):
+            return units
+
+        # Progressive requests were admitted without betweenness, so the
+        # worker leaves it to the deferred metrics job as app.py does
+        progressive = bool(data.get('progressive'))
+        weighting = flask_app.weighting_of(data)
+        start = time.monotonic()
+        try:
+            result = await nlp_pool.process_text(
+                data['text'], flask_app.window_size_of(data), flask_app.tokenization_of(data),
+                weighting, progressive, flask_app.window_sizes_of(data)
+            )
+        finally:
+            flask_app.admission.release(units, time.monotonic() - start)
+
+        # Keep the built graph as the server-side graph for the other endpoints
+        graph_data = result['graph']
+        graph_service = flask_app.graph_service
+        graph_service.load_graph_data(graph_data)
+        result['weighting'] = weighting
+        result['graph'] = graph_service.versioned_response(graph_data, data.get('since_version'))
+        if progressive:
+            result['metrics_job'] = flask_app.schedule_deferred_metrics(graph_data)
+        return result
+
+    except Exception as e:
+        logger.error(f"Error processing text: {str(e)}")
+        logger.error(f"Traceback: {traceback.format_exc()}")
+        return JSONResponse({'error': str(e)}, status_code=500)
+
+
+@app.post("/api/generate-graph")
+async def generate_graph(request: Request):
+    """
+    Generate a knowledge graph from text with KG-Gen.
+    """
+    limited = rate_limited(request, cost=flask_app.LLM_REQUEST_COST)
+    if limited is not None:
+        return limited
+
+    data = await json_body(request)
+    units = await admit(data, flask_app.parse_request_cost)
+    if isinstance(units, JSONResponse):
+        return units
+
+    start = time.monotonic()
+    try:
+        tokens = None
+        if data and data.get('text'):
+            try:
+                tokens = await nlp_pool.call('process_for_topic_modeling', data['text'])
+            except Exception as e:
+                logger.error(f"Error preprocessing text: {str(e)}")
+                return JSONResponse({'error': str(e)}, status_code=500)
+
+        payload, status = await run_blocking(flask_app._generate_graph, data, tokens)
+    finally:
+        flask_app.admission.release(units, time.monotonic() - start)
+    return JSONResponse(payload, status_code=status)
+
+
+@app.post("/api/analyze-clusters")
+async def analyze_clusters(request: Request):
+    """
+    Identify clusters of related concepts in a graph.
+    """
+    limited = rate_limited(request, cost=flask_app.LLM_REQUEST_COST)
+    if limited is not None:
+        return limited
+
+    data = await json_body(request)
+    units = await admit(data, flask_app.cluster_request_cost)
+    if isinstance(units, JSONResponse):
+        return units
+
+    start = time.monotonic()
+    try:
+        payload, status = await run_blocking(flask_app._analyze_clusters, data)
+    finally:
+        flask_app.admission.release(units, time.monotonic() - start)
+    return JSONResponse(payload, status_code=status)
+
+
+@app.post("/api/expand-cluster")
+async def expand_cluster(request: Request):
+    """
+    Expand a cluster into more detailed nodes and edges.
+    """
+    limited = rate_limited(request, cost=flask_app.LLM_REQUEST_COST)
+    if limited is not None:
+        return limited
+
+    data = await json_body(request)
+    units = await admit(data, flask_app.expand_request_cost)
+    if isinstance(units, JSONResponse):
+        return units
+
+    start = time.monotonic()
+    try:
+        payload, status = await run_blocking(flask_app._expand_cluster, data)
+    finally:
+        flask_app.admission.release(units, time.monotonic() - start)
+    return JSONResponse(payload, status_code=status)
+
+
+# Everything not defined above is served by the Flask app
+app.mount("/", WSGIMiddleware(flask_app.app))
+
+
+if __name__ == '__main__':
+    uvicorn.run(app, host='127.0.0.1', port=5000)
@@ -0,0 +1,81 @@
+import random
+from collections import Counter
+from typing import Dict, List, Tuple
+
+# Function words keep the text parseable and give the stop-word filter work
+FUNCTION_WORDS = [
+    'the', 'of', 'and', 'to', 'in', 'is', 'that', 'for', 'it', 'as', 'with', 'on',
+    'by', 'this', 'are', 'from', 'which', 'be', 'an', 'can'
+]
+
+SYLLABLES = [
+    'gra', 'phe', 'no', 'de', 'lin', 'ker', 'ton', 'ma', 'si', 'vec', 'tor', 'ent',
+    'ro', 'pa', 'cen', 'tra', 'li', 'ty', 'clu', 'ster', 'mo', 'del', 'da', 'ta'
+]
+
+
+def vocabulary_size(tokens: int) -> int:
+    """Vocabulary size for a corpus of the given length (Heaps' law, K=7, beta=0.6)."""
+    return max(50, int(7 * tokens ** 0.6))
+
+
+def make_vocabulary(size: int, seed: int = 0) -> List[str]:
+    """Return `size` distinct pseudo-words."""
+    rng = random.Random(seed)
+    words = set()
+    while len(words) < size:
+        words.add(''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))))
+    return sorted(words)
+
+
+def generate_tokens(count: int, seed: int = 0) -> List[str]:
+    """
+    Generate a deterministic token stream with a Zipfian word distribution.
+
+    About a third of the tokens are function words, like in English prose.
+
+    Args:
+        count (int): Number of tokens
+        seed (int): Random seed
+
+    Returns:
+        List[str]: Tokens
+    """
+    rng = random.Random(seed)
+    vocabulary = make_vocabulary(vocabulary_size(count), seed)
+    weights = [1.0 / rank for rank in range(1, len(vocabulary) + 1)]
+    content = rng.choices(vocabulary, weights=weights, k=count)
+    return [
+        rng.choice(FUNCTION_WORDS) if rng.random() < 0.33 else word
+        for word in content
+    ]
+
+
+def generate_text(count: int, seed: int = 0, sentence_length: int = 18) -> str:
+    """
+    Generate deterministic text of roughly `count` tokens, split into sentences.
+
+    Args:
+        count (int): Number of word tokens
+        seed (int): Random seed
+        sentence_length (int): Words per sentence
+
+    Returns:
+        str: Text
+    """
+    tokens = generate_tokens(count, seed)
+    sentences = []
+    for start in range(0, len(tokens), sentence_length):
+        words = tokens[start:start + sentence_length]
+        sentences.append(' '.join(words).capitalize() + '.')
+    return ' '.join(sentences)
+
+
+def count_cooccurrences(tokens: List[str], window_size: int = 4) -> Dict[Tuple[str, str], int]:
+    """Count unordered token pairs within a window, in the shape GraphService.build_graph expects."""
+    counts: Counter = Counter()
+    for i, token in enumerate(tokens):
+        for other in tokens[i + 1:i + window_size + 1]:
+            if other != token:
+                counts[(token, other) if token < other else (other, token)] += 1
+    return dict(counts)
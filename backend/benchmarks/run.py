@@ -0,0 +1,315 @@
+"""
+Benchmarks for the NLP and graph hot paths.
+
+Run from the backend directory:
+
+    python -m benchmarks.run                       # all benchmarks, default sizes
+    python -m benchmarks.run --only build_graph betweenness --sizes 1000 10000
+    python -m benchmarks.run --update-baseline     # record benchmarks/baseline.json
+    python -m benchmarks.run --threshold 0.2       # fail if >20% slower than baseline
+
+Every benchmark runs on a deterministic synthetic corpus at each size (in
+tokens) up to its own maximum, because some paths (spaCy parsing,
+betweenness) are far too slow to run at a million tokens. Each size is
+timed `--repeat` times after a warm-up. Peak Python heap usage is then
+measured in a separate run under tracemalloc, which only sees allocations
+made through Python's allocator: numpy counts, spaCy's internal memory
+pools do not.
+
+The results are written as JSON and compared against the baseline. The
+process exits with status 1 when a benchmark is slower, or uses more
+memory, than the baseline by more than the thresholds. Baselines only
+mean something on the machine that recorded them.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from types import SimpleNamespace
+from typing import Callable, Dict, List, Optional
+
+import networkx as nx
+
+from benchmarks.corpus import count_cooccurrences, generate_text, generate_tokens
+from services.graph_service import GraphService
+from text_processor import TextProcessor
+
+DEFAULT_SIZES = [1000, 5000, 10000, 100000, 1000000]
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+WINDOW_SIZE = 4
+
+
+class EdgesOnlyGraphService(GraphService):
+    """GraphService with metrics switched off, to time graph building and filtering on their own."""
+
+    def calculate_betweenness_centrality(self, graph: Optional[nx.Graph] = None) -> Dict[str, float]:
+        return {}
+
+    def calculate_graph_metrics(self, graph: Optional[nx.Graph] = None,
+                                include_clustering: bool = True) -> Dict:
+        return {}
+
+    def calculate_spectral_centrality(self, measure: str) -> Dict[str, float]:
+        return {}
+
+
+class Benchmark:
+    """
+    A hot path timed at several corpus sizes.
+
+    prepare(size) builds the untimed input state, before_each(state) resets
+    it before every run, and run(state) is the timed call.
+    """
+
+    def __init__(self, name: str, prepare: Callable, run: Callable, max_size: int,
+                 before_each: Optional[Callable] = None):
+        self.name = name
+        self.prepare = prepare
+        self.run = run
+        self.max_size = max_size
+        self.before_each = before_each or (lambda state: None)
+
+
+_processor = None
+
+
+def text_processor():
+    """The spaCy-backed TextProcessor, loaded on first use."""
+    global _processor
+    if _processor is None:
+        _processor = TextProcessor(window_size=WINDOW_SIZE)
+        _processor.nlp.max_length = 20_000_000
+    return _processor
+
+
+def cooccurrence_graph(size: int) -> nx.Graph:
+    service = EdgesOnlyGraphService()
+    tokens = generate_tokens(size)
+    service.build_graph(tokens, count_cooccurrences(tokens, WINDOW_SIZE))
+    return service.graph
+
+
+def _prepare_build(size: int) -> tuple:
+    tokens = generate_tokens(size)
+    return tokens, count_cooccurrences(tokens, WINDOW_SIZE)
+
+
+def _prepare_filter(size: int) -> SimpleNamespace:
+    return SimpleNamespace(graph=cooccurrence_graph(size), service=EdgesOnlyGraphService())
+
+
+def _reset_filter(state: SimpleNamespace):
+    state.service.graph = state.graph.copy()
+
+
+def _prepare_serialize(size: int) -> Dict:
+    tokens = generate_tokens(size)
+    return EdgesOnlyGraphService().build_graph(tokens, count_cooccurrences(tokens, WINDOW_SIZE))
+
+
+def _prepare_service(size: int) -> GraphService:
+    service = GraphService()
+    service.graph = cooccurrence_graph(size)
+    return service
+
+
+BENCHMARKS = [
+    Benchmark(
+        'preprocess_text',
+        prepare=generate_text,
+        run=lambda text: text_processor().preprocess_text(text),
+        max_size=100000
+    ),
+    Benchmark(
+        'preprocess_text_fast',
+        prepare=generate_text,
+        run=lambda text: text_processor().preprocess_text_fast(text),
+        max_size=1000000
+    ),
+    Benchmark(
+        'extract_ngrams',
+        prepare=generate_tokens,
+        # extract_ngrams only reads window_size, so spaCy is not needed here
+        run=lambda tokens: TextProcessor.extract_ngrams(SimpleNamespace(window_size=WINDOW_SIZE), tokens),
+        max_size=1000000
+    ),
+    Benchmark(
+        'extract_key_terms',
+        prepare=generate_text,
+        run=lambda text: text_processor().extract_key_terms(text),
+        max_size=10000
+    ),
+    Benchmark(
+        'build_graph',
+        prepare=_prepare_build,
+        run=lambda state: EdgesOnlyGraphService().build_graph(*state),
+        max_size=1000000
+    ),
+    Benchmark(
+        'betweenness',
+        prepare=_prepare_service,
+        run=lambda service: service.calculate_betweenness_centrality(),
+        max_size=5000
+    ),
+    Benchmark(
+        'graph_metrics',
+        prepare=_prepare_service,
+        run=lambda service: service.calculate_graph_metrics(),
+        max_size=10000
+    ),
+    Benchmark(
+        'filter_edges',
+        prepare=_prepare_filter,
+        before_each=_reset_filter,
+        run=lambda state: state.service.filter_edges_by_weight(0.1),
+        max_size=1000000
+    ),
+    Benchmark(
+        'serialize',
+        prepare=_prepare_serialize,
+        run=lambda graph_data: json.dumps(graph_data),
+        max_size=1000000
+    ),
+]
+
+
+def measure(benchmark: Benchmark, size: int, repeat: int) -> Dict:
+    """
+    Time one benchmark at one size.
+
+    Returns:
+        Dict: median and minimum seconds, tokens per second and peak heap bytes
+    """
+    state = benchmark.prepare(size)
+
+    benchmark.before_each(state)
+    benchmark.run(state)
+
+    timings = []
+    for _ in range(repeat):
+        benchmark.before_each(state)
+        start = time.perf_counter()
+        benchmark.run(state)
+        timings.append(time.perf_counter() - start)
+
+    benchmark.before_each(state)
+    tracemalloc.start()
+    try:
+        benchmark.run(state)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    median = statistics.median(timings)
+    return {
+        'tokens': size,
+        'seconds': median,
+        'min_seconds': min(timings),
+        'tokens_per_second': size / median if median > 0 else None,
+        'peak_bytes': peak
+    }
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], threshold: float,
+            memory_threshold: float) -> List[str]:
+    """
+    Compare results against a baseline.
+
+    Args:
+        results (Dict[str, Dict]): Current results keyed by 'name@size'
+        baseline (Dict[str, Dict]): Baseline results keyed the same way
+        threshold (float): Allowed relative slowdown, e.g. 0.25 for 25%
+        memory_threshold (float): Allowed relative growth of peak memory
+
+    Returns:
+        List[str]: One message per regression
+    """
+    regressions = []
+    for key, result in results.items():
+        base = baseline.get(key)
+        if base is None:
+            continue
+        if result['seconds'] > base['seconds'] * (1 + threshold):
+            regressions.append(
+                f"{key}: {result['seconds']:.4f}s vs baseline {base['seconds']:.4f}s "
+                f"(+{result['seconds'] / base['seconds'] - 1:.0%})"
+            )
+        if base.get('peak_bytes') and result['peak_bytes'] > base['peak_bytes'] * (1 + memory_threshold):
+            regressions.append(
+                f"{key}: peak {result['peak_bytes']} bytes vs baseline {base['peak_bytes']} "
+                f"(+{result['peak_bytes'] / base['peak_bytes'] - 1:.0%})"
+            )
+    return regressions
+
+
+def environment() -> Dict:
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'networkx': nx.__version__
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--only', nargs='+', choices=[b.name for b in BENCHMARKS], help='benchmarks to run')
+    parser.add_argument('--sizes', nargs='+', type=int, default=DEFAULT_SIZES, help='corpus sizes in tokens')
+    parser.add_argument('--repeat', type=int, default=3, help='timed runs per size')
+    parser.add_argument('--output', help='write results JSON here')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='baseline JSON to compare against')
+    parser.add_argument('--update-baseline', action='store_true', help='write the results as the new baseline')
+    parser.add_argument('--threshold', type=float, default=0.25, help='allowed relative slowdown')
+    parser.add_argument('--memory-threshold', type=float, default=0.25, help='allowed relative peak memory growth')
+    args = parser.parse_args(argv)
+
+    selected = [b for b in BENCHMARKS if not args.only or b.name in args.only]
+    results = {}
+    for benchmark in selected:
+        for size in sorted(args.sizes):
+            if size > benchmark.max_size:
+                continue
+            result = measure(benchmark, size, args.repeat)
+            results[f'{benchmark.name}@{size}'] = result
+            print(
+                f"{benchmark.name:<18} {size:>9} tokens  {result['seconds'] * 1000:10.1f} ms  "
+                f"{result['tokens_per_second'] or 0:12.0f} tok/s  {result['peak_bytes'] / 2 ** 20:8.1f} MiB",
+                flush=True
+            )
+
+    report = {'environment': environment(), 'results': results}
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.update_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update-baseline to create one")
+        return 0
+
+    with open(args.baseline, 'r') as f:
+        baseline = json.load(f).get('results', {})
+
+    regressions = compare(results, baseline, args.threshold, args.memory_threshold)
+    if regressions:
+        print("Regressions:")
+        for message in regressions:
+            print(f"  {message}")
+        return 1
+
+    print("No regressions against baseline")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
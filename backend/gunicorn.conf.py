@@ -0,0 +1,33 @@
+"""
+Gunicorn configuration for the pre-fork server.
+
+Run from the backend directory with:
+
+    gunicorn app:app
+
+The app (and with it the spaCy model) is loaded once in the master process
+before the workers are forked, so the model's memory is shared between the
+workers copy-on-write instead of being loaded once per worker.
+"""
+import os
+
+from services.process_stats import freeze_shared_state
+
+bind = os.getenv('BIND', '127.0.0.1:5000')
+workers = int(os.getenv('WEB_CONCURRENCY', '4'))
+threads = int(os.getenv('GUNICORN_THREADS', '4'))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '120'))
+
+# Load the app in the master so workers inherit the model pages
+preload_app = True
+
+
+def on_starting(server):
+    # Lets /api/worker-stats find the master and its workers
+    os.environ['PREFORK_MASTER_PID'] = str(os.getpid())
+
+
+def when_ready(server):
+    import app
+    freeze_shared_state(app.text_processor.nlp)
+    server.log.info("Froze preloaded state for copy-on-write sharing")
@@ -0,0 +1,277 @@
+"""
+End-to-end load test for the backend API.
+
+Run from the backend directory:
+
+    python -m loadtest.run --concurrency 32 --duration 60
+    python -m loadtest.run --server gunicorn --concurrency 64
+    python -m loadtest.run --url http://127.0.0.1:5000 --mix process-text=1
+
+Unless --url points at a running server, the app is started in a
+subprocess (Flask's threaded server, gunicorn with gunicorn.conf.py, or
+uvicorn with asgi.py). It uses the stub LLM backend and the environment
+from loadtest.serve. Worker threads then send a weighted mix of
+/api/process-text, /api/filter-edges, /api/generate-graph and
+/api/expand-cluster requests, built from synthetic text, for the given
+duration. The report lists throughput, p50/p95/p99 latency, error rate
+and status codes, per endpoint and in total.
+"""
+import argparse
+import json
+import math
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from typing import Dict, List, Optional, Tuple
+
+from benchmarks.corpus import generate_text, generate_tokens
+from loadtest.serve import LOADTEST_ENV
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_MIX = {
+    'process-text': 40,
+    'filter-edges': 30,
+    'generate-graph': 20,
+    'expand-cluster': 10
+}
+
+TEXT_SIZES = (200, 1000, 3000)
+
+
+def parse_mix(value: str) -> Dict[str, float]:
+    """Parse 'process-text=40,filter-edges=30' into weights."""
+    mix = {}
+    for part in value.split(','):
+        name, _, weight = part.partition('=')
+        if name not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError(f"Unknown endpoint in mix: {name}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def percentile(sorted_values: List[float], fraction: float) -> Optional[float]:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = math.ceil(fraction * len(sorted_values))
+    return sorted_values[max(rank, 1) - 1]
+
+
+class RequestFactory:
+    """Builds request bodies from a fixed pool of synthetic texts."""
+
+    def __init__(self, distinct_texts: int, seed: int):
+        self.distinct_texts = distinct_texts
+        self.seed = seed
+
+    def text(self, rng: random.Random) -> str:
+        index = rng.randrange(self.distinct_texts)
+        return generate_text(TEXT_SIZES[index % len(TEXT_SIZES)], seed=self.seed + index)
+
+    def body(self, endpoint: str, rng: random.Random) -> Dict:
+        if endpoint == 'process-text':
+            return {'text': self.text(rng), 'window_size': 4}
+        if endpoint == 'filter-edges':
+            return {'min_weight': rng.choice([0.0, 0.1, 0.3])}
+        if endpoint == 'generate-graph':
+            return {'text': self.text(rng)}
+
+        # expand-cluster: a small cluster and its graph, as the frontend sends it
+        words = list(dict.fromkeys(generate_tokens(200, seed=self.seed + rng.randrange(self.distinct_texts))))[:12]
+        nodes = [{'id': word, 'label': word} for word in words]
+        edges = [{'source': a, 'target': b, 'weight': 1.0} for a, b in zip(words, words[1:])]
+        return {
+            'clusterId': words[0],
+            'nodeIds': words[:4],
+            'graphData': {'nodes': nodes, 'edges': edges}
+        }
+
+
+def send(url: str, body: Dict, timeout: float) -> Tuple[int, float]:
+    """POST a JSON body; return the status code (0 on connection errors) and latency."""
+    data = json.dumps(body).encode('utf-8')
+    request = urllib.request.Request(url, data=data, headers={'Content-Type': 'application/json'})
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as e:
+        e.read()
+        status = e.code
+    except (urllib.error.URLError, OSError):
+        status = 0
+    return status, time.perf_counter() - start
+
+
+def run_load(base_url: str, mix: Dict[str, float], concurrency: int, duration: float,
+             max_requests: Optional[int], timeout: float, factory: RequestFactory,
+             seed: int) -> Tuple[Dict[str, List[Tuple[int, float]]], float]:
+    """
+    Drive the load and collect (status, latency) samples per endpoint.
+
+    Returns:
+        Tuple: samples per endpoint and the wall-clock duration
+    """
+    endpoints = list(mix)
+    weights = [mix[name] for name in endpoints]
+    samples: Dict[str, List[Tuple[int, float]]] = {name: [] for name in endpoints}
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+    issued = [0]
+
+    def worker(index: int):
+        rng = random.Random(seed * 1000 + index)
+        while time.monotonic() < deadline:
+            with lock:
+                if max_requests is not None and issued[0] >= max_requests:
+                    return
+                issued[0] += 1
+            endpoint = rng.choices(endpoints, weights=weights)[0]
+            result = send(f'{base_url}/api/{endpoint}', factory.body(endpoint, rng), timeout)
+            with lock:
+                samples[endpoint].append(result)
+
+    threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return samples, time.perf_counter() - start
+
+
+def summarize(samples: List[Tuple[int, float]], elapsed: float) -> Dict:
+    """Throughput, latency percentiles and error rate for a set of samples."""
+    latencies = sorted(latency for _, latency in samples)
+    errors = sum(1 for status, _ in samples if not 200 <= status < 300)
+    statuses: Dict[str, int] = {}
+    for status, _ in samples:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+
+    def ms(value: Optional[float]) -> Optional[float]:
+        return round(value * 1000, 1) if value is not None else None
+
+    return {
+        'requests': len(samples),
+        'throughput_rps': round(len(samples) / elapsed, 2) if elapsed > 0 else 0.0,
+        'p50_ms': ms(percentile(latencies, 0.50)),
+        'p95_ms': ms(percentile(latencies, 0.95)),
+        'p99_ms': ms(percentile(latencies, 0.99)),
+        'max_ms': ms(latencies[-1] if latencies else None),
+        'errors': errors,
+        'error_rate': round(errors / len(samples), 4) if samples else 0.0,
+        'statuses': statuses
+    }
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def start_server(kind: str, port: int, env: Dict[str, str]) -> subprocess.Popen:
+    """Start the app in a subprocess with the stub LLM."""
+    bind = f'127.0.0.1:{port}'
+    commands = {
+        'flask': [sys.executable, '-m', 'loadtest.serve', '--port', str(port)],
+        'gunicorn': [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', '--bind', bind, 'app:app'],
+        'uvicorn': [sys.executable, '-m', 'uvicorn', 'asgi:app', '--host', '127.0.0.1', '--port', str(port)]
+    }
+    return subprocess.Popen(commands[kind], cwd=BACKEND_DIR, env=env)
+
+
+def wait_ready(base_url: str, process: subprocess.Popen, timeout: float):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Server exited with status {process.returncode}")
+        try:
+            with urllib.request.urlopen(f'{base_url}/api/llm-stats', timeout=2):
+                return
+        except (urllib.error.URLError, OSError):
+            time.sleep(0.5)
+    raise RuntimeError("Server did not become ready in time")
+
+
+def print_report(report: Dict):
+    columns = ('requests', 'throughput_rps', 'p50_ms', 'p95_ms', 'p99_ms', 'error_rate')
+    print(f"{'endpoint':<16}" + ''.join(f'{column:>16}' for column in columns))
+    for name, summary in list(report['endpoints'].items()) + [('total', report['total'])]:
+        print(f'{name:<16}' + ''.join(f'{str(summary[column]):>16}' for column in columns))
+    print(f"statuses: {report['total']['statuses']}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', help='target a running server instead of starting one')
+    parser.add_argument('--server', choices=['flask', 'gunicorn', 'uvicorn'], default='flask')
+    parser.add_argument('--concurrency', type=int, default=16, help='concurrent clients')
+    parser.add_argument('--duration', type=float, default=30, help='seconds to run')
+    parser.add_argument('--requests', type=int, help='stop after this many requests')
+    parser.add_argument('--mix', type=parse_mix, default=DEFAULT_MIX, help='e.g. process-text=40,filter-edges=30')
+    parser.add_argument('--llm-latency', type=float, default=0.5, help='stub LLM latency in seconds')
+    parser.add_argument('--llm-jitter', type=float, default=0.2, help='extra random stub latency')
+    parser.add_argument('--llm-error-rate', type=float, default=0.0, help='fraction of failing stub calls')
+    parser.add_argument('--distinct-texts', type=int, default=50, help='size of the pool of request texts')
+    parser.add_argument('--timeout', type=float, default=120, help='per-request timeout in seconds')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='write the report as JSON')
+    args = parser.parse_args(argv)
+
+    process = None
+    base_url = args.url.rstrip('/') if args.url else None
+    if base_url is None:
+        port = free_port()
+        base_url = f'http://127.0.0.1:{port}'
+        env = {**LOADTEST_ENV, **os.environ}
+        env.update({
+            'STUB_LLM_LATENCY': str(args.llm_latency),
+            'STUB_LLM_JITTER': str(args.llm_jitter),
+            'STUB_LLM_ERROR_RATE': str(args.llm_error_rate)
+        })
+        process = start_server(args.server, port, env)
+
+    try:
+        if process is not None:
+            wait_ready(base_url, process, timeout=300)
+
+        factory = RequestFactory(args.distinct_texts, args.seed)
+        samples, elapsed = run_load(
+            base_url, args.mix, args.concurrency, args.duration, args.requests,
+            args.timeout, factory, args.seed
+        )
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=30)
+
+    report = {
+        'config': {
+            'server': 'external' if args.url else args.server,
+            'concurrency': args.concurrency,
+            'duration_s': round(elapsed, 2),
+            'mix': args.mix,
+            'llm_latency': args.llm_latency
+        },
+        'endpoints': {name: summarize(endpoint_samples, elapsed) for name, endpoint_samples in samples.items()},
+        'total': summarize([sample for endpoint_samples in samples.values() for sample in endpoint_samples], elapsed)
+    }
+    print_report(report)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,38 @@
+"""
+Start the backend with the stub LLM for load testing.
+
+Run from the backend directory:
+
+    python -m loadtest.serve --port 5001
+
+Defaults the environment to the stub LLM backend, a rate limit that load
+tests will not hit and a disabled LLM result cache, so every generate or
+expand request pays the stub's latency. Variables already set in the
+environment take precedence.
+"""
+import argparse
+import os
+
+LOADTEST_ENV = {
+    'LLM_BACKEND': 'stub',
+    'RATE_LIMIT': '100000000',
+    'LLM_CACHE_ENABLED': 'false',
+    'METRICS_ENABLED': 'true'
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=5001)
+    args = parser.parse_args()
+
+    for name, value in LOADTEST_ENV.items():
+        os.environ.setdefault(name, value)
+
+    from app import app
+    app.run(host=args.host, port=args.port, threaded=True, debug=False, use_reloader=False)
+
+
+if __name__ == '__main__':
+    main()
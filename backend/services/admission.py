@@ -0,0 +1,232 @@
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+# Costs are in abstract work units. One unit is roughly one inner-loop step
+# of Brandes' betweenness algorithm (about 0.3 us on the benchmark machine);
+# parsing one token with spaCy takes about as long as PARSE_COST units.
+PARSE_COST = 300
+# The tokenizer-only fast mode takes about 1.5 us per token
+FAST_PARSE_COST = 5
+
+
+class RequestTooLargeError(Exception):
+    """Raised when a request's estimated cost exceeds the per-request limit."""
+
+    def __init__(self, cost: int, limit: int):
+        super().__init__(f"Request too large: estimated cost {cost} exceeds the limit of {limit}")
+        self.cost = cost
+        self.limit = limit
+
+
+class OverloadedError(Exception):
+    """Raised when no capacity became free in time; retry_after is a hint in seconds."""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def estimate_parse_cost(text: str) -> int:
+    """Cost of running text through the spaCy pipeline."""
+    return len(text.split()) * PARSE_COST
+
+
+def estimate_graph_cost(nodes: int, edges: int, with_betweenness: bool = True) -> int:
+    """
+    Cost of the metrics computed for a graph.
+
+    Args:
+        nodes (int): Number of nodes
+        edges (int): Number of edges
+        with_betweenness (bool): Whether betweenness centrality is computed,
+            which takes O(V * E) and dominates everything else
+
+    Returns:
+        int: Estimated cost
+    """
+    if with_betweenness:
+        return nodes * (nodes + edges)
+    return nodes + edges
+
+
+def estimate_text_cost(text: str, window_size: int, parsed: bool = False,
+                       parse_cost: int = PARSE_COST, with_betweenness: bool = True) -> int:
+    """
+    Cost of turning text into a co-occurrence graph with its metrics.
+
+    Counts come from a whitespace split, which is cheap and an upper bound for
+    what survives stop-word filtering.
+
+    Args:
+        text (str): Input text
+        window_size (int): Co-occurrence window size
+        parsed (bool): Whether the tokens are already stored, so no parse is needed
+        parse_cost (int): Cost per token of tokenizing and tagging
+        with_betweenness (bool): Whether betweenness is computed within the request
+
+    Returns:
+        int: Estimated cost
+    """
+    words = text.lower().split()
+    tokens = len(words)
+    distinct = len(set(words))
+
+    # Every token is paired with up to window_size neighbours on each side
+    pairs = tokens * 2 * window_size
+    edges = min(pairs // 2, distinct * (distinct - 1) // 2)
+    parse = 0 if parsed else tokens * parse_cost
+    return parse + pairs + estimate_graph_cost(distinct, edges, with_betweenness)
+
+
+class AdmissionController:
+    """
+    Admit CPU-heavy requests by estimated cost.
+
+    Requests costing more than max_request_cost are rejected outright. Others
+    hold their cost against a shared capacity while they run; when it is used
+    up they wait in FIFO order (so large requests are not starved by small
+    ones) for at most queue_timeout seconds. A request larger than the
+    capacity but within max_request_cost runs alone.
+    """
+
+    def __init__(self, capacity: int, max_request_cost: Optional[int] = None,
+                 queue_timeout: float = 5.0, max_waiting: int = 32):
+        """
+        Initialize the controller.
+
+        Args:
+            capacity (int): Total cost of requests running at once
+            max_request_cost (Optional[int]): Largest cost admitted; defaults to capacity
+            queue_timeout (float): Seconds a request may wait for capacity
+            max_waiting (int): Requests allowed to wait; further ones are rejected immediately
+        """
+        self.capacity = capacity
+        self.max_request_cost = max_request_cost if max_request_cost is not None else capacity
+        self.queue_timeout = queue_timeout
+        self.max_waiting = max_waiting
+
+        self._condition = threading.Condition()
+        self._in_use = 0
+        self._running = 0
+        self._waiting: deque = deque()
+        self._average_hold = 1.0
+        self._stats = {'admitted': 0, 'queued': 0, 'rejected_too_large': 0, 'rejected_overloaded': 0}
+
+    def check(self, cost: int):
+        """
+        Reject a request that could never be admitted.
+
+        Raises:
+            RequestTooLargeError: If cost exceeds max_request_cost
+        """
+        if cost > self.max_request_cost:
+            with self._condition:
+                self._stats['rejected_too_large'] += 1
+            raise RequestTooLargeError(cost, self.max_request_cost)
+
+    def acquire(self, cost: int) -> int:
+        """
+        Wait until the request fits into the free capacity and reserve it.
+
+        Args:
+            cost (int): Estimated cost of the request
+
+        Returns:
+            int: Reserved units, to be passed to release()
+
+        Raises:
+            RequestTooLargeError: If cost exceeds max_request_cost
+            OverloadedError: If the wait queue is full or the timeout passed
+        """
+        self.check(cost)
+        units = min(max(cost, 0), self.capacity)
+
+        with self._condition:
+            if not self._waiting and self._fits(units):
+                return self._reserve(units)
+
+            if len(self._waiting) >= self.max_waiting:
+                self._stats['rejected_overloaded'] += 1
+                raise OverloadedError("Server is busy; try again later", self._retry_after(units))
+
+            ticket = object()
+            self._waiting.append(ticket)
+            self._stats['queued'] += 1
+            deadline = time.monotonic() + self.queue_timeout
+            try:
+                while not (self._waiting[0] is ticket and self._fits(units)):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._stats['rejected_overloaded'] += 1
+                        raise OverloadedError("Server is busy; try again later", self._retry_after(units))
+                    self._condition.wait(remaining)
+                return self._reserve(units)
+            finally:
+                self._waiting.remove(ticket)
+                self._condition.notify_all()
+
+    def release(self, units: int, held_seconds: Optional[float] = None):
+        """
+        Return reserved units to the capacity.
+
+        Args:
+            units (int): Units returned by acquire()
+            held_seconds (Optional[float]): How long the request ran, for Retry-After estimates
+        """
+        with self._condition:
+            self._in_use -= units
+            self._running -= 1
+            if held_seconds is not None:
+                self._average_hold = 0.8 * self._average_hold + 0.2 * held_seconds
+            self._condition.notify_all()
+
+    @contextmanager
+    def admit(self, cost: int) -> Iterator[None]:
+        """
+        Hold capacity for the duration of a block.
+
+        Raises:
+            RequestTooLargeError: If cost exceeds max_request_cost
+            OverloadedError: If no capacity became free in time
+        """
+        units = self.acquire(cost)
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.release(units, time.monotonic() - start)
+
+    def stats(self) -> Dict:
+        """
+        Return admission counters and current usage.
+
+        Returns:
+            Dict: Counters, capacity in use, running and waiting requests
+        """
+        with self._condition:
+            return {
+                **self._stats,
+                'capacity': self.capacity,
+                'max_request_cost': self.max_request_cost,
+                'in_use': self._in_use,
+                'running': self._running,
+                'waiting': len(self._waiting)
+            }
+
+    def _fits(self, units: int) -> bool:
+        return self._running == 0 or self._in_use + units <= self.capacity
+
+    def _reserve(self, units: int) -> int:
+        self._in_use += units
+        self._running += 1
+        self._stats['admitted'] += 1
+        return units
+
+    def _retry_after(self, units: int) -> float:
+        # Each capacity's worth of queued work takes about one average request time
+        backlog = self._in_use + units * (len(self._waiting) + 1)
+        return max(1.0, self._average_hold * math.ceil(backlog / self.capacity))
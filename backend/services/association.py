@@ -0,0 +1,104 @@
+import numpy as np
+from scipy.sparse import coo_matrix
+
+# 'count' is the raw count normalized by the largest one
+WEIGHTINGS = ('count', 'pmi', 'npmi', 'llr')
+
+# Edge weights must stay in (0, 1]; pairs seen less often than chance get this floor
+WEIGHT_FLOOR = 1e-3
+
+
+def association_scores(rows: np.ndarray, cols: np.ndarray, counts: np.ndarray,
+                       n_tokens: int, method: str) -> np.ndarray:
+    """
+    Association score of every co-occurring pair.
+
+    The counts form the upper triangle of a symmetric sparse co-occurrence
+    matrix. A token's marginal is its row sum, i.e. how often it co-occurs
+    with anything, and probabilities are taken over the ordered pairs of the
+    symmetric matrix, so that p(a, b) <= min(p(a), p(b)) and NPMI stays
+    within [-1, 1].
+
+    Args:
+        rows (np.ndarray): Token id of the first token of each pair
+        cols (np.ndarray): Token id of the second token of each pair
+        counts (np.ndarray): Co-occurrence count of each pair
+        n_tokens (int): Number of distinct tokens
+        method (str): 'pmi', 'npmi', 'llr' (Dunning's G-squared) or 'count'
+
+    Returns:
+        np.ndarray: Score of each pair, aligned with counts
+
+    Raises:
+        ValueError: If the method is unknown
+    """
+    if method not in WEIGHTINGS:
+        raise ValueError(f"weighting must be one of {', '.join(WEIGHTINGS)}")
+    counts = np.asarray(counts, dtype=np.float64)
+    if method == 'count' or not len(counts):
+        return counts
+
+    matrix = coo_matrix((counts, (rows, cols)), shape=(n_tokens, n_tokens))
+    marginals = np.asarray(matrix.sum(axis=0)).ravel() + np.asarray(matrix.sum(axis=1)).ravel()
+    total = marginals.sum()
+    row_marginals, col_marginals = marginals[rows], marginals[cols]
+    joint = counts
+
+    if method in ('pmi', 'npmi'):
+        pmi = np.log(joint * total / (row_marginals * col_marginals))
+        if method == 'pmi':
+            return pmi
+        # Every pair is half of its two ordered pairs, so p(a, b) <= 1/2 and -log p > 0
+        return pmi / -np.log(joint / total)
+
+    # 2x2 contingency table of every pair over the ordered pairs of the matrix
+    observed = np.stack([
+        joint,
+        row_marginals - joint,
+        col_marginals - joint,
+        total - row_marginals - col_marginals + joint
+    ])
+    expected = np.stack([
+        row_marginals * col_marginals,
+        row_marginals * (total - col_marginals),
+        (total - row_marginals) * col_marginals,
+        (total - row_marginals) * (total - col_marginals)
+    ]) / total
+    with np.errstate(divide='ignore', invalid='ignore'):
+        terms = np.where(observed > 0, observed * np.log(observed / expected), 0.0)
+    g2 = 2 * terms.sum(axis=0)
+    # G-squared is large for avoidance as well; only attraction counts
+    return np.where(joint * total >= row_marginals * col_marginals, g2, 0.0)
+
+
+def association_weights(rows: np.ndarray, cols: np.ndarray, counts: np.ndarray,
+                        n_tokens: int, method: str) -> np.ndarray:
+    """
+    Edge weights in (0, 1] from association scores.
+
+    'count' divides by the largest count, as build_graph always did. NPMI is
+    mapped from [-1, 1] onto [0, 1]; PMI and LLR are divided by their largest
+    positive value. Their weights below WEIGHT_FLOOR are raised to it, so
+    negative association leaves a weak edge rather than none.
+
+    Args:
+        rows (np.ndarray): Token id of the first token of each pair
+        cols (np.ndarray): Token id of the second token of each pair
+        counts (np.ndarray): Co-occurrence count of each pair
+        n_tokens (int): Number of distinct tokens
+        method (str): One of WEIGHTINGS
+
+    Returns:
+        np.ndarray: Weight of each pair, aligned with counts
+    """
+    scores = association_scores(rows, cols, counts, n_tokens, method)
+    if not len(scores):
+        return scores
+    if method == 'count':
+        return scores / scores.max()
+    if method == 'npmi':
+        weights = (scores + 1) / 2
+    else:
+        largest = scores.max()
+        weights = scores / largest if largest > 0 else np.zeros_like(scores)
+    return np.clip(weights, WEIGHT_FLOOR, 1.0)
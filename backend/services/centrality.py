@@ -0,0 +1,128 @@
+import numpy as np
+from scipy.sparse import csr_matrix
+from typing import List, Optional, Tuple
+
+
+def _adjacency(indptr: np.ndarray, indices: np.ndarray, weights: np.ndarray) -> csr_matrix:
+    n = len(indptr) - 1
+    return csr_matrix((np.asarray(weights, dtype=np.float64), indices, indptr), shape=(n, n))
+
+
+def _start_vector(start: Optional[np.ndarray], n: int) -> np.ndarray:
+    if start is None or len(start) != n or not np.all(np.isfinite(start)) or start.sum() <= 0:
+        return np.full(n, 1.0 / n)
+    start = np.clip(np.asarray(start, dtype=np.float64), 0, None)
+    return start / start.sum()
+
+
+def pagerank(indptr: np.ndarray, indices: np.ndarray, weights: np.ndarray,
+             alpha: float = 0.85, start: Optional[np.ndarray] = None,
+             tol: float = 1e-8, max_iter: int = 200) -> Tuple[np.ndarray, int]:
+    """
+    Weighted PageRank of an undirected graph by sparse power iteration.
+
+    A node passes its rank on to its neighbours in proportion to the edge
+    weights; nodes without edges spread theirs uniformly. Converges to the
+    same scores as networkx.pagerank, and in far fewer iterations when
+    started from a nearby vector.
+
+    Args:
+        indptr (np.ndarray): CSR row pointers of the symmetric adjacency
+        indices (np.ndarray): CSR column indices
+        weights (np.ndarray): Edge weights aligned with indices
+        alpha (float): Damping factor
+        start (Optional[np.ndarray]): Initial vector, e.g. the previous result
+        tol (float): Convergence threshold per node on the L1 change
+        max_iter (int): Iteration limit
+
+    Returns:
+        Tuple[np.ndarray, int]: Scores summing to 1 and the iterations run
+    """
+    n = len(indptr) - 1
+    if n == 0:
+        return np.zeros(0), 0
+
+    adjacency = _adjacency(indptr, indices, weights)
+    strength = np.asarray(adjacency.sum(axis=1)).ravel()
+    dangling = strength == 0
+    # Row-normalized transition matrix; it is symmetric in structure, so x @ P is P.T @ x
+    inverse = np.divide(1.0, strength, out=np.zeros(n), where=~dangling)
+    transition = csr_matrix(adjacency.multiply(inverse[:, None]))
+
+    x = _start_vector(start, n)
+    for iteration in range(1, max_iter + 1):
+        previous = x
+        x = alpha * (previous @ transition) + (alpha * previous[dangling].sum() + 1 - alpha) / n
+        if np.abs(x - previous).sum() < n * tol:
+            break
+    return x, iteration
+
+
+def eigenvector_centrality(indptr: np.ndarray, indices: np.ndarray, weights: np.ndarray,
+                           start: Optional[np.ndarray] = None, tol: float = 1e-6,
+                           max_iter: int = 200) -> Tuple[np.ndarray, int]:
+    """
+    Weighted eigenvector centrality by sparse power iteration.
+
+    Iterates with A + I like networkx.eigenvector_centrality, so that
+    bipartite components converge instead of oscillating. As there, the
+    scores of components with a smaller leading eigenvalue fade towards zero.
+
+    Args:
+        indptr (np.ndarray): CSR row pointers of the symmetric adjacency
+        indices (np.ndarray): CSR column indices
+        weights (np.ndarray): Edge weights aligned with indices
+        start (Optional[np.ndarray]): Initial vector, e.g. the previous result
+        tol (float): Convergence threshold per node on the L1 change
+        max_iter (int): Iteration limit
+
+    Returns:
+        Tuple[np.ndarray, int]: Scores with unit Euclidean norm and the iterations run
+    """
+    n = len(indptr) - 1
+    if n == 0:
+        return np.zeros(0), 0
+
+    adjacency = _adjacency(indptr, indices, weights)
+    x = _start_vector(start, n)
+    x = x / np.linalg.norm(x)
+    for iteration in range(1, max_iter + 1):
+        previous = x
+        x = adjacency @ previous + previous
+        norm = np.linalg.norm(x)
+        if norm == 0:
+            return previous, iteration
+        x = x / norm
+        if np.abs(x - previous).sum() < n * tol:
+            break
+    return x, iteration
+
+
+def carry_over(previous_vocabulary: List[str], previous: np.ndarray, vocabulary: List[str]) -> np.ndarray:
+    """
+    Align a vector of an earlier graph generation with a new vocabulary.
+
+    Nodes that are new get the mean score of the ones carried over.
+
+    Args:
+        previous_vocabulary (List[str]): Node ids of the earlier vector
+        previous (np.ndarray): Earlier scores
+        vocabulary (List[str]): Node ids of the new graph
+
+    Returns:
+        np.ndarray: Start vector for the new graph
+    """
+    positions = {node: i for i, node in enumerate(previous_vocabulary)}
+    found = np.array([positions.get(node, -1) for node in vocabulary], dtype=np.int64)
+    known = found >= 0
+    start = np.empty(len(vocabulary))
+    start[known] = previous[found[known]]
+    start[~known] = start[known].mean() if known.any() else 1.0
+    return start
+
+
+# Node measures computed by power iteration, by the name they are reported under
+SPECTRAL_CENTRALITIES = {
+    'pagerank': pagerank,
+    'eigenvector': eigenvector_centrality
+}
@@ -0,0 +1,249 @@
+import json
+import logging
+import networkx as nx
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Set
+
+CLUSTER_COLORS = [
+    '#4f46e5', '#059669', '#d97706', '#dc2626', '#7c3aed', '#0891b2',
+    '#db2777', '#65a30d', '#ea580c', '#2563eb', '#9333ea', '#0d9488'
+]
+
+
+class ClusterSummarizer:
+    """
+    Map-reduce cluster analysis over the full graph.
+
+    The graph is partitioned locally (Louvain) and every part is reduced to a
+    compact summary: its most central terms, internal density and strongest
+    internal edges. Only these summaries are sent to the LLM, one call per
+    cluster, in parallel, so prompt size is bounded by max_terms no matter how
+    large the graph is. When there are more than max_clusters parts, the
+    parts are grouped again on the graph of clusters and each group is
+    summarized from its children, giving a second level. On each level only
+    the max_clusters largest clusters are labelled by the LLM; the rest are
+    labelled from their top terms, so a fragmented graph costs at most
+    2 * max_clusters calls.
+    """
+
+    def __init__(self, summarize_fn: Callable[[str], str], max_terms: int = 10,
+                 max_clusters: int = 12, max_workers: int = 4, seed: int = 0):
+        """
+        Initialize the summarizer.
+
+        Args:
+            summarize_fn (Callable[[str], str]): Sends a prompt to the LLM and returns its text
+            max_terms (int): Top terms included per cluster summary
+            max_clusters (int): Above this many clusters a second level is built;
+                also the number of clusters per level labelled by the LLM
+            max_workers (int): Concurrent LLM calls
+            seed (int): Seed for the community detection
+        """
+        self.summarize_fn = summarize_fn
+        self.max_terms = max_terms
+        self.max_clusters = max_clusters
+        self.max_workers = max_workers
+        self.seed = seed
+        self.logger = logging.getLogger(__name__)
+
+    def partition(self, graph: nx.Graph) -> List[Set]:
+        """
+        Split the graph into communities.
+
+        Nodes left in single-node communities are gathered into one residual
+        group so every node belongs to some cluster.
+
+        Args:
+            graph (nx.Graph): Graph to partition
+
+        Returns:
+            List[Set]: Node sets, largest first
+        """
+        if graph.number_of_nodes() == 0:
+            return []
+
+        communities = nx.community.louvain_communities(graph, weight='weight', seed=self.seed)
+        parts = [set(c) for c in communities if len(c) > 1]
+        residual = set().union(*(c for c in communities if len(c) == 1))
+        if residual:
+            parts.append(residual)
+
+        return sorted(parts, key=lambda part: (-len(part), min(map(str, part))))
+
+    def summarize_part(self, graph: nx.Graph, nodes: Set, centrality: Dict) -> Dict:
+        """
+        Reduce one cluster to a compact representation.
+
+        Args:
+            graph (nx.Graph): Full graph
+            nodes (Set): Cluster members
+            centrality (Dict): Node centrality scores
+
+        Returns:
+            Dict: size, density, top_terms and top_edges
+        """
+        subgraph = graph.subgraph(nodes)
+        top_terms = sorted(nodes, key=lambda node: (-centrality.get(node, 0.0), str(node)))[:self.max_terms]
+        top_edges = sorted(
+            subgraph.edges(data='weight', default=1.0),
+            key=lambda edge: -(edge[2] or 0.0)
+        )[:self.max_terms // 2]
+
+        return {
+            'size': len(nodes),
+            'density': round(nx.density(subgraph), 4) if len(nodes) > 1 else 0.0,
+            'top_terms': [str(term) for term in top_terms],
+            'top_edges': [[str(u), str(v)] for u, v, _ in top_edges]
+        }
+
+    def _prompt(self, summary: Dict, children: Optional[List[Dict]] = None) -> str:
+        if children is None:
+            description = json.dumps(summary)
+        else:
+            description = json.dumps({
+                'size': summary['size'],
+                'top_terms': summary['top_terms'],
+                'subclusters': [child['label'] for child in children]
+            })
+
+        return f"""You are labelling one cluster of a concept graph built from a text.
+        Return ONLY a JSON object of the form {{"label": "short label", "summary": "one or two sentences"}}.
+
+        Cluster: {description}
+        """
+
+    @staticmethod
+    def _term_label(summary: Dict) -> Dict:
+        """Label and summary made from the top terms, without the LLM."""
+        return {
+            'label': ', '.join(summary['top_terms'][:3]),
+            'summary': f"Cluster of concepts related to {', '.join(summary['top_terms'][:5])}"
+        }
+
+    def _label(self, summary: Dict, children: Optional[List[Dict]] = None) -> Dict:
+        """Ask the LLM for a label and summary, falling back to the top terms."""
+        fallback = self._term_label(summary)
+        try:
+            text = self.summarize_fn(self._prompt(summary, children)).strip()
+            if text.startswith('```json'):
+                text = text[7:]
+            text = text.strip('`').strip()
+            result = json.loads(text)
+            if not isinstance(result, dict) or not result.get('label'):
+                return fallback
+            return {'label': str(result['label']), 'summary': str(result.get('summary', fallback['summary']))}
+        except Exception as e:
+            self.logger.error(f"Error labelling cluster: {str(e)}")
+            return fallback
+
+    def _label_all(self, summaries: List[Dict], children: Optional[List[List[Dict]]] = None) -> List[Dict]:
+        """Label the first max_clusters summaries with the LLM, in parallel, and the rest from their terms."""
+        labelled = summaries[:self.max_clusters]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            if children is None:
+                labels = list(executor.map(self._label, labelled))
+            else:
+                labels = list(executor.map(self._label, labelled, children))
+        return labels + [self._term_label(summary) for summary in summaries[self.max_clusters:]]
+
+    def analyze(self, graph: nx.Graph, centrality: Optional[Dict] = None) -> List[Dict]:
+        """
+        Partition, summarize and label the whole graph.
+
+        Args:
+            graph (nx.Graph): Graph to analyze
+            centrality (Optional[Dict]): Node centrality; weighted degree if omitted
+
+        Returns:
+            List[Dict]: Clusters in the /api/analyze-clusters response format
+        """
+        if centrality is None:
+            strength = dict(graph.degree(weight='weight'))
+            top = max(strength.values(), default=0) or 1
+            centrality = {node: value / top for node, value in strength.items()}
+
+        parts = self.partition(graph)
+        summaries = [self.summarize_part(graph, part, centrality) for part in parts]
+        # Parts come largest first, so the LLM labels the biggest clusters
+        labels = self._label_all(summaries)
+
+        clusters = []
+        for i, (part, summary, label) in enumerate(zip(parts, summaries, labels)):
+            clusters.append(self._cluster(
+                cluster_id=str(i + 1),
+                graph=graph,
+                nodes=part,
+                summary=summary,
+                label=label,
+                level=0,
+                color=CLUSTER_COLORS[i % len(CLUSTER_COLORS)]
+            ))
+
+        if len(parts) > self.max_clusters:
+            clusters.extend(self._reduce(graph, parts, summaries, clusters, centrality))
+
+        return clusters
+
+    def _reduce(self, graph: nx.Graph, parts: List[Set], summaries: List[Dict],
+                clusters: List[Dict], centrality: Dict) -> List[Dict]:
+        """Group level-0 clusters on the graph of clusters and label the groups."""
+        membership = {node: i for i, part in enumerate(parts) for node in part}
+        quotient = nx.Graph()
+        quotient.add_nodes_from(range(len(parts)))
+        for u, v, weight in graph.edges(data='weight', default=1.0):
+            a, b = membership[u], membership[v]
+            if a != b:
+                previous = quotient.get_edge_data(a, b, {'weight': 0.0})['weight']
+                quotient.add_edge(a, b, weight=previous + (weight or 0.0))
+
+        groups = nx.community.louvain_communities(quotient, weight='weight', seed=self.seed)
+        groups = sorted((sorted(group) for group in groups if len(group) > 1), key=lambda g: (-len(g), g))
+        if not groups:
+            return []
+
+        group_summaries = []
+        group_children = []
+        for group in groups:
+            nodes = set().union(*(parts[i] for i in group))
+            summary = self.summarize_part(graph, nodes, centrality)
+            group_summaries.append(summary)
+            group_children.append([clusters[i] for i in group])
+
+        labels = self._label_all(group_summaries, group_children)
+
+        parents = []
+        for i, (group, summary, label) in enumerate(zip(groups, group_summaries, labels)):
+            parent = self._cluster(
+                cluster_id=f'g{i + 1}',
+                graph=graph,
+                nodes=set().union(*(parts[j] for j in group)),
+                summary=summary,
+                label=label,
+                level=1,
+                color=CLUSTER_COLORS[i % len(CLUSTER_COLORS)]
+            )
+            parent['children'] = [clusters[j]['id'] for j in group]
+            for j in group:
+                clusters[j]['parent'] = parent['id']
+            parents.append(parent)
+
+        return parents
+
+    @staticmethod
+    def _cluster(cluster_id: str, graph: nx.Graph, nodes: Set, summary: Dict, label: Dict,
+                 level: int, color: str) -> Dict:
+        edges = []
+        for u, v, data in graph.subgraph(nodes).edges(data=True):
+            edges.append(data.get('id') or f'{u}-{v}')
+
+        return {
+            'id': cluster_id,
+            'label': label['label'],
+            'nodes': sorted(nodes, key=str),
+            'edges': edges,
+            'summary': label['summary'],
+            'keyTerms': summary['top_terms'][:5],
+            'density': summary['density'],
+            'level': level,
+            'color': color
+        }
@@ -0,0 +1,179 @@
+import logging
+import numpy as np
+from collections import defaultdict
+from typing import Dict, Iterable, List
+from kg_gen.models import Graph
+
+
+class _UnionFind:
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+
+    def find(self, i: int) -> int:
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, i: int, j: int):
+        root_i, root_j = self.find(i), self.find(j)
+        if root_i != root_j:
+            self.parent[max(root_i, root_j)] = min(root_i, root_j)
+
+
+class EntityResolver:
+    """
+    Merge near-duplicate entities before they become graph nodes.
+
+    Candidates are generated by blocking instead of comparing every pair:
+    entities sharing a lemma key ("neural networks" / "Neural Network"), an
+    acronym and the multi-word entity it abbreviates ("NN"), and entities whose
+    spaCy vectors fall into the same random-hyperplane bucket. Only pairs inside
+    a vector bucket are scored with cosine similarity, so the work stays close
+    to linear in the number of entities.
+    """
+
+    def __init__(self, nlp, similarity_threshold: float = 0.9, hash_bits: int = 10,
+                 hash_tables: int = 4, seed: int = 0):
+        """
+        Initialize the resolver.
+
+        Args:
+            nlp: spaCy pipeline used for lemmas and vectors
+            similarity_threshold (float): Minimum cosine similarity to merge by vector
+            hash_bits (int): Hyperplanes per hash table (bucket granularity)
+            hash_tables (int): Independent hash tables (recall of the vector blocking)
+            seed (int): Seed for the random hyperplanes
+        """
+        self.nlp = nlp
+        self.similarity_threshold = similarity_threshold
+        self.hash_bits = hash_bits
+        self.hash_tables = hash_tables
+        self.seed = seed
+        self.logger = logging.getLogger(__name__)
+
+    def resolve(self, entities: Iterable[str]) -> Dict[str, str]:
+        """
+        Map every entity to its canonical form.
+
+        Args:
+            entities (Iterable[str]): Entity strings as returned by the model
+
+        Returns:
+            Dict[str, str]: Entity to canonical entity (identity for unmerged entities)
+        """
+        entities = sorted(set(entities))
+        if not entities:
+            return {}
+
+        docs = list(self.nlp.pipe(entities))
+        lemma_keys = [self._lemma_key(doc) for doc in docs]
+        groups = _UnionFind(len(entities))
+
+        self._block_by_key(groups, lemma_keys)
+        self._block_by_acronym(groups, entities, docs, lemma_keys)
+        self._block_by_vector(groups, docs)
+
+        members = defaultdict(list)
+        for i in range(len(entities)):
+            members[groups.find(i)].append(i)
+
+        mapping = {}
+        for indices in members.values():
+            canonical = min(indices, key=lambda i: (
+                self._is_acronym(entities[i]),
+                entities[i].lower() != lemma_keys[i],
+                len(entities[i]),
+                entities[i]
+            ))
+            for i in indices:
+                mapping[entities[i]] = entities[canonical]
+        return mapping
+
+    @staticmethod
+    def _lemma_key(doc) -> str:
+        return ' '.join(
+            (token.lemma_ or token.lower_).lower()
+            for token in doc if not token.is_punct and not token.is_space
+        )
+
+    @staticmethod
+    def _is_acronym(entity: str) -> bool:
+        return entity.isalpha() and entity.isupper() and 2 <= len(entity) <= 6
+
+    @staticmethod
+    def _block_by_key(groups: _UnionFind, keys: List[str]):
+        first = {}
+        for i, key in enumerate(keys):
+            if key:
+                groups.union(first.setdefault(key, i), i)
+
+    def _block_by_acronym(self, groups: _UnionFind, entities: List[str], docs, lemma_keys: List[str]):
+        # Initials of multi-word entities, e.g. "neural network" -> "nn"
+        expansions = defaultdict(set)
+        for i, doc in enumerate(docs):
+            words = [token for token in doc if token.is_alpha]
+            if len(words) >= 2:
+                expansions[''.join(token.lower_[0] for token in words)].add(groups.find(i))
+
+        for i, entity in enumerate(entities):
+            if self._is_acronym(entity):
+                candidates = expansions.get(entity.lower(), set())
+                # Only merge unambiguous acronyms
+                if len({groups.find(j) for j in candidates}) == 1:
+                    groups.union(i, next(iter(candidates)))
+
+    def _block_by_vector(self, groups: _UnionFind, docs):
+        rows = [i for i, doc in enumerate(docs) if doc.has_vector and doc.vector_norm > 0]
+        if len(rows) < 2:
+            return
+
+        vectors = np.stack([docs[i].vector for i in rows]).astype(np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+
+        rng = np.random.default_rng(self.seed)
+        planes = rng.standard_normal((self.hash_tables, vectors.shape[1], self.hash_bits)).astype(np.float32)
+        weights = 1 << np.arange(self.hash_bits)
+
+        for table in range(self.hash_tables):
+            signatures = ((vectors @ planes[table]) > 0).astype(np.int64) @ weights
+            order = np.argsort(signatures, kind='stable')
+            boundaries = np.flatnonzero(np.diff(signatures[order])) + 1
+
+            for bucket in np.split(order, boundaries):
+                if len(bucket) < 2:
+                    continue
+                similarities = vectors[bucket] @ vectors[bucket].T
+                left, right = np.nonzero(np.triu(similarities >= self.similarity_threshold, k=1))
+                for a, b in zip(left.tolist(), right.tolist()):
+                    groups.union(rows[bucket[a]], rows[bucket[b]])
+
+
+def rewrite_graph(kg_result: Graph, mapping: Dict[str, str]) -> Graph:
+    """
+    Rewrite a KG-Gen result onto canonical entities.
+
+    Relations are rewritten to the canonical ids and deduplicated; relations
+    that collapse onto a single entity are dropped.
+
+    Args:
+        kg_result (Graph): KG-Gen result
+        mapping (Dict[str, str]): Entity to canonical entity
+
+    Returns:
+        Graph: Result with merged entities
+    """
+    def canonical(entity: str) -> str:
+        return mapping.get(entity, entity)
+
+    relations = set()
+    for source, relation_type, target in kg_result.relations:
+        source, target = canonical(source), canonical(target)
+        if source != target:
+            relations.add((source, relation_type, target))
+
+    return Graph(
+        entities={canonical(entity) for entity in kg_result.entities},
+        edges={relation_type for _, relation_type, _ in relations},
+        relations=relations
+    )
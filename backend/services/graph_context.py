@@ -0,0 +1,136 @@
+import json
+import networkx as nx
+from typing import Dict, Iterable, List, Optional
+
+
+def estimate_tokens(data) -> int:
+    """Rough LLM token estimate for a JSON payload (about four characters per token)."""
+    return len(json.dumps(data, separators=(',', ':'))) // 4 + 1
+
+
+def graph_from_data(graph_data: Dict) -> nx.Graph:
+    """
+    Build a networkx graph from frontend graph data.
+
+    Args:
+        graph_data (Dict): Dictionary with 'nodes' and 'edges' lists
+
+    Returns:
+        nx.Graph: Graph with node labels and edge weights/labels
+    """
+    graph = nx.Graph()
+    for node in graph_data.get('nodes', []):
+        if isinstance(node, dict) and 'id' in node:
+            graph.add_node(node['id'], label=node.get('label', node['id']))
+
+    for edge in graph_data.get('edges', []):
+        if not isinstance(edge, dict):
+            continue
+        # Frontend edges may carry resolved node objects instead of ids
+        source, target = edge.get('source'), edge.get('target')
+        source = source.get('id') if isinstance(source, dict) else source
+        target = target.get('id') if isinstance(target, dict) else target
+        if source is None or target is None:
+            continue
+        attributes = {'weight': edge.get('weight') or 1.0}
+        if edge.get('id'):
+            attributes['id'] = edge['id']
+        if edge.get('label'):
+            attributes['label'] = edge['label']
+        graph.add_edge(source, target, **attributes)
+
+    return graph
+
+
+def extract_neighbourhood(graph: nx.Graph, seeds: Iterable, hops: int = 2, token_budget: int = 1500,
+                          max_neighbors: int = 25, centrality: Optional[Dict] = None) -> Dict:
+    """
+    Extract a bounded k-hop neighbourhood around seed nodes.
+
+    Nodes are explored breadth-first from the seeds, following at most
+    max_neighbors of the heaviest edges per node, so the work depends on the
+    neighbourhood and not on the size of the graph. Candidates are ranked by
+    hop distance, then by the weight of the edge that reached them scaled by
+    their centrality, and added until the token budget is used up. Seeds
+    count against the budget too; only the first is always kept.
+
+    Args:
+        graph (nx.Graph): Graph to extract from
+        seeds (Iterable): Node ids of the cluster
+        hops (int): Maximum distance from a seed
+        token_budget (int): Approximate token budget for the returned context
+        max_neighbors (int): Heaviest edges followed per node
+        centrality (Optional[Dict]): Node centrality scores; degree centrality if omitted
+
+    Returns:
+        Dict: {'nodes', 'edges', 'truncated'} in a compact prompt-ready form
+    """
+    seeds = [seed for seed in dict.fromkeys(seeds) if seed in graph]
+    node_count = max(graph.number_of_nodes() - 1, 1)
+
+    def node_centrality(node) -> float:
+        if centrality is not None:
+            return centrality.get(node, 0.0)
+        return graph.degree(node) / node_count
+
+    def heaviest_edges(node) -> List:
+        neighbours = graph.adj[node]
+        if len(neighbours) <= max_neighbors:
+            return list(neighbours.items())
+        return sorted(neighbours.items(), key=lambda item: item[1].get('weight', 1.0), reverse=True)[:max_neighbors]
+
+    # Breadth-first exploration; score = best reaching edge weight * (1 + centrality)
+    hop_of = {seed: 0 for seed in seeds}
+    score_of = {seed: float('inf') for seed in seeds}
+    frontier = seeds
+    for hop in range(1, hops + 1):
+        next_frontier = []
+        for node in frontier:
+            for neighbour, data in heaviest_edges(node):
+                if hop_of.get(neighbour, hop) < hop:
+                    continue
+                score = data.get('weight', 1.0) * (1 + node_centrality(neighbour))
+                if neighbour not in hop_of:
+                    hop_of[neighbour] = hop
+                    next_frontier.append(neighbour)
+                score_of[neighbour] = max(score_of.get(neighbour, 0.0), score)
+        frontier = next_frontier
+
+    ranked = sorted(hop_of, key=lambda node: (hop_of[node], -score_of[node], str(node)))
+
+    nodes = []
+    selected = set()
+    used = 0
+    truncated = False
+    for node in ranked:
+        entry = {'id': node, 'label': graph.nodes[node].get('label', node)}
+        cost = estimate_tokens(entry)
+        if used + cost > token_budget and nodes:
+            truncated = True
+            break
+        nodes.append(entry)
+        selected.add(node)
+        used += cost
+
+    # Edges inside the selection, heaviest first, while the budget lasts
+    candidate_edges = sorted(
+        (
+            (u, v, data) for u in selected for v, data in graph.adj[u].items()
+            if v in selected and str(u) < str(v)
+        ),
+        key=lambda edge: edge[2].get('weight', 1.0),
+        reverse=True
+    )
+    edges = []
+    for u, v, data in candidate_edges:
+        entry = {'source': u, 'target': v, 'weight': round(float(data.get('weight', 1.0)), 3)}
+        if data.get('label'):
+            entry['label'] = data['label']
+        cost = estimate_tokens(entry)
+        if used + cost > token_budget:
+            truncated = True
+            break
+        edges.append(entry)
+        used += cost
+
+    return {'nodes': nodes, 'edges': edges, 'truncated': truncated}
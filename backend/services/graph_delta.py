@@ -0,0 +1,51 @@
+from typing import Dict, Hashable, Tuple
+
+
+def edge_key(edge: Dict) -> Tuple[Hashable, Hashable]:
+    """Direction-independent key of an undirected edge."""
+    source, target = edge['source'], edge['target']
+    return (source, target) if str(source) <= str(target) else (target, source)
+
+
+def diff_graph_data(old: Dict, new: Dict) -> Dict:
+    """
+    Compute the changes between two graph data dictionaries.
+
+    Nodes are matched by id and edges by their unordered endpoints; a node
+    or edge whose attributes (metrics, weights) differ is reported in full
+    as changed.
+
+    Args:
+        old (Dict): Graph data the client has
+        new (Dict): Current graph data
+
+    Returns:
+        Dict: Added, removed and changed nodes and edges, and the graph
+            metrics if they changed
+    """
+    old_nodes = {node['id']: node for node in old.get('nodes', [])}
+    new_nodes = {node['id']: node for node in new.get('nodes', [])}
+    old_edges = {edge_key(edge): edge for edge in old.get('edges', [])}
+    new_edges = {edge_key(edge): edge for edge in new.get('edges', [])}
+
+    delta = {
+        'nodes_added': [node for node_id, node in new_nodes.items() if node_id not in old_nodes],
+        'nodes_removed': [node_id for node_id in old_nodes if node_id not in new_nodes],
+        'nodes_changed': [
+            node for node_id, node in new_nodes.items()
+            if node_id in old_nodes and node != old_nodes[node_id]
+        ],
+        'edges_added': [edge for key, edge in new_edges.items() if key not in old_edges],
+        'edges_removed': [{'source': key[0], 'target': key[1]} for key in old_edges if key not in new_edges],
+        'edges_changed': [
+            edge for key, edge in new_edges.items()
+            if key in old_edges and _edge_attributes(edge) != _edge_attributes(old_edges[key])
+        ]
+    }
+    if new.get('metrics') != old.get('metrics'):
+        delta['metrics'] = new.get('metrics')
+    return delta
+
+
+def _edge_attributes(edge: Dict) -> Dict:
+    return {name: value for name, value in edge.items() if name not in ('source', 'target')}
@@ -0,0 +1,314 @@
+import numpy as np
+import networkx as nx
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import dijkstra
+from typing import Dict, Iterable, List, Optional
+from services.graph_snapshot import GraphSnapshot, graph_to_csr
+
+
+class GraphIndex:
+    """
+    Read-only query indexes over one generation of a graph.
+
+    Adjacency is a symmetric CSR (see graph_to_csr), so the neighbours of a
+    set of nodes are gathered with a few array operations instead of a scan
+    over every edge. Per-node metrics are arrays aligned with the vocabulary;
+    the descending order of each metric is computed on its first top-k query
+    and kept. The adjacency of an index is never updated: GraphService builds
+    a new one when its generation changes, and only attaches node metrics
+    computed later.
+    """
+
+    def __init__(self, vocabulary: List[str], indptr: np.ndarray, indices: np.ndarray,
+                 edge_arrays: Dict[str, np.ndarray], node_metrics: Optional[Dict[str, np.ndarray]] = None,
+                 generation: int = 0):
+        """
+        Initialize the index.
+
+        Args:
+            vocabulary (List[str]): Node ids by index
+            indptr (np.ndarray): CSR row pointers
+            indices (np.ndarray): CSR column indices, both directions of every edge
+            edge_arrays (Dict[str, np.ndarray]): Edge attributes aligned with indices
+            node_metrics (Optional[Dict[str, np.ndarray]]): Per-node metrics aligned with vocabulary
+            generation (int): Generation of the graph the index was built from
+        """
+        self.vocabulary = vocabulary
+        self.node_index = {node: i for i, node in enumerate(vocabulary)}
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.edge_arrays = {name: np.asarray(values) for name, values in edge_arrays.items()}
+        self.generation = generation
+
+        self.degree = np.diff(self.indptr)
+        weights = self.edge_arrays.get('weight', np.ones(len(self.indices)))
+        self.weights = np.asarray(weights, dtype=np.float64)
+        # Same path length as betweenness: stronger connections are shorter
+        with np.errstate(divide='ignore'):
+            self.distances = np.where(self.weights > 0, 1.0 / self.weights, np.inf)
+
+        rows = np.repeat(np.arange(len(vocabulary)), self.degree)
+        self.metrics: Dict[str, np.ndarray] = {
+            'degree': self.degree.astype(np.float64),
+            'weighted_degree': np.bincount(rows, weights=self.weights, minlength=len(vocabulary))
+        }
+        for name, values in (node_metrics or {}).items():
+            self.metrics[name] = np.asarray(values, dtype=np.float64)
+        self._orders: Dict[str, np.ndarray] = {}
+        self._distance_csr: Optional[csr_matrix] = None
+
+    @classmethod
+    def from_graph(cls, graph: nx.Graph, node_metrics: Optional[Dict[str, Dict[str, float]]] = None,
+                   generation: int = 0) -> 'GraphIndex':
+        """
+        Build the index from a networkx graph.
+
+        Args:
+            graph (nx.Graph): Graph to index
+            node_metrics (Optional[Dict[str, Dict[str, float]]]): Per-node metrics by name
+            generation (int): Generation of the graph
+
+        Returns:
+            GraphIndex: The index
+        """
+        vocabulary, indptr, indices, edge_arrays = graph_to_csr(graph)
+        arrays = {
+            name: np.array([values.get(node, 0.0) for node in vocabulary], dtype=np.float64)
+            for name, values in (node_metrics or {}).items()
+        }
+        return cls(vocabulary, indptr, indices, edge_arrays, arrays, generation)
+
+    @classmethod
+    def from_snapshot(cls, snapshot: GraphSnapshot, generation: int = 0) -> 'GraphIndex':
+        """Index a restored snapshot directly from its mapped CSR arrays."""
+        return cls(
+            snapshot.vocabulary, snapshot.indptr, snapshot.indices,
+            snapshot.edge_attributes, snapshot.node_metrics, generation
+        )
+
+    def filtered(self, min_weight: float, generation: int) -> 'GraphIndex':
+        """
+        Index of the graph without edges lighter than min_weight and without
+        the nodes that leaves isolated, derived by masking the arrays.
+
+        Node and neighbour order are kept, so the result equals indexing the
+        filtered graph. Node metrics other than degrees are not carried over.
+
+        Args:
+            min_weight (float): Minimum edge weight kept
+            generation (int): Generation of the filtered graph
+
+        Returns:
+            GraphIndex: The filtered index
+        """
+        keep = self.weights >= min_weight
+        rows = np.repeat(np.arange(len(self.vocabulary)), self.degree)[keep]
+        degree = np.bincount(rows, minlength=len(self.vocabulary))
+        present = degree > 0
+        new_ids = np.cumsum(present) - 1
+
+        indptr = np.zeros(int(present.sum()) + 1, dtype=np.int64)
+        np.cumsum(degree[present], out=indptr[1:])
+        return GraphIndex(
+            [node for node, kept in zip(self.vocabulary, present.tolist()) if kept],
+            indptr,
+            new_ids[self.indices[keep]],
+            {name: values[keep] for name, values in self.edge_arrays.items()},
+            generation=generation
+        )
+
+    def attach_metric(self, name: str, values: np.ndarray):
+        """Add a per-node metric, aligned with the vocabulary, computed after the index was built."""
+        self.metrics[name] = np.asarray(values, dtype=np.float64)
+        self._orders.pop(name, None)
+
+    def _indices_of(self, nodes: Iterable[str]) -> np.ndarray:
+        found = [self.node_index[node] for node in dict.fromkeys(nodes) if node in self.node_index]
+        return np.array(found, dtype=np.int64)
+
+    def _gather(self, rows: np.ndarray):
+        """All CSR entries of the given rows: (row, column, position in indices)."""
+        starts = self.indptr[rows]
+        counts = self.indptr[rows + 1] - starts
+        positions = np.repeat(starts - (np.cumsum(counts) - counts), counts) + np.arange(counts.sum())
+        return np.repeat(rows, counts), self.indices[positions], positions
+
+    def _node(self, i: int) -> Dict:
+        node = {'id': self.vocabulary[i], 'label': self.vocabulary[i], 'degree': int(self.degree[i])}
+        for name, values in self.metrics.items():
+            if name != 'degree':
+                node[name] = float(values[i])
+        return node
+
+    def _edges(self, rows: np.ndarray, cols: np.ndarray, positions: np.ndarray) -> List[Dict]:
+        # Every edge is stored twice; report the row < column copy
+        upper = rows < cols
+        rows, cols, positions = rows[upper].tolist(), cols[upper].tolist(), positions[upper]
+        attributes = {name: values[positions].tolist() for name, values in self.edge_arrays.items()}
+        return [
+            {
+                'source': self.vocabulary[u],
+                'target': self.vocabulary[v],
+                **{name: values[k] for name, values in attributes.items()}
+            }
+            for k, (u, v) in enumerate(zip(rows, cols))
+        ]
+
+    def _induced(self, members: np.ndarray) -> List[Dict]:
+        in_set = np.zeros(len(self.vocabulary), dtype=bool)
+        in_set[members] = True
+        rows, cols, positions = self._gather(members)
+        keep = in_set[cols]
+        return self._edges(rows[keep], cols[keep], positions[keep])
+
+    def subgraph(self, nodes: Iterable[str]) -> Dict:
+        """
+        Induced subgraph on a set of nodes.
+
+        Args:
+            nodes (Iterable[str]): Node ids
+
+        Returns:
+            Dict: 'nodes' and 'edges' in the shape of GraphService graph data,
+                and the requested ids that are not in the graph as 'missing'
+        """
+        nodes = list(dict.fromkeys(nodes))
+        members = self._indices_of(nodes)
+        return {
+            'nodes': [self._node(i) for i in members.tolist()],
+            'edges': self._induced(members),
+            'missing': [node for node in nodes if node not in self.node_index]
+        }
+
+    def neighbours(self, seeds: Iterable[str], hops: int = 1, limit: int = 500) -> Dict:
+        """
+        Nodes within a number of hops of the seeds, with the edges between them.
+
+        Each hop expands the whole frontier at once. When the next hop would
+        go over limit nodes, the nodes reached through the heaviest edges are
+        kept and the result is marked truncated.
+
+        Args:
+            seeds (Iterable[str]): Node ids to start from
+            hops (int): Maximum distance from a seed
+            limit (int): Maximum number of nodes returned
+
+        Returns:
+            Dict: 'nodes' (each with its 'hops' distance), 'edges' and 'truncated'
+        """
+        frontier = self._indices_of(seeds)[:limit]
+        distance = np.full(len(self.vocabulary), -1, dtype=np.int32)
+        distance[frontier] = 0
+        reached = [frontier]
+        count = len(frontier)
+        truncated = False
+
+        for hop in range(1, hops + 1):
+            if not len(frontier):
+                break
+            _, cols, positions = self._gather(frontier)
+            new = distance[cols] < 0
+            cols, strength = cols[new], self.weights[positions[new]]
+            if not len(cols):
+                break
+
+            # Strongest edge from the frontier to each newly reached node
+            best = np.zeros(len(self.vocabulary))
+            np.maximum.at(best, cols, strength)
+            candidates = np.unique(cols)
+            if count + len(candidates) > limit:
+                truncated = True
+                order = np.argsort(-best[candidates], kind='stable')
+                candidates = np.sort(candidates[order[:limit - count]])
+                if not len(candidates):
+                    break
+
+            distance[candidates] = hop
+            reached.append(candidates)
+            count += len(candidates)
+            frontier = candidates
+
+        members = np.concatenate(reached) if reached else np.zeros(0, dtype=np.int64)
+        nodes = []
+        for i in members.tolist():
+            node = self._node(i)
+            node['hops'] = int(distance[i])
+            nodes.append(node)
+        return {'nodes': nodes, 'edges': self._induced(members), 'truncated': truncated}
+
+    def shortest_path(self, source: str, target: str, weighted: bool = True) -> Optional[Dict]:
+        """
+        Shortest path between two nodes.
+
+        Weighted paths use the inverse edge weight as length, like betweenness
+        centrality; unweighted paths count hops. Runs scipy's Dijkstra over the
+        CSR adjacency from the source only.
+
+        Args:
+            source (str): Start node id
+            target (str): End node id
+            weighted (bool): Use edge weights
+
+        Returns:
+            Optional[Dict]: 'nodes' along the path, its 'edges' and total
+                'distance'; None if either node is missing or no path exists
+        """
+        s, t = self.node_index.get(source), self.node_index.get(target)
+        if s is None or t is None:
+            return None
+
+        lengths, previous = dijkstra(
+            self._distance_matrix(), directed=False, indices=s,
+            unweighted=not weighted, return_predecessors=True
+        )
+        if not np.isfinite(lengths[t]):
+            return None
+
+        path = [t]
+        while path[-1] != s:
+            path.append(int(previous[path[-1]]))
+        path.reverse()
+
+        rows = np.array([min(u, v) for u, v in zip(path, path[1:])], dtype=np.int64)
+        cols = np.array([max(u, v) for u, v in zip(path, path[1:])], dtype=np.int64)
+        positions = np.array([
+            self.indptr[u] + np.searchsorted(self.indices[self.indptr[u]:self.indptr[u + 1]], v)
+            for u, v in zip(rows.tolist(), cols.tolist())
+        ], dtype=np.int64)
+
+        return {
+            'nodes': [self._node(i) for i in path],
+            'edges': self._edges(rows, cols, positions),
+            'distance': float(lengths[t])
+        }
+
+    def _distance_matrix(self) -> csr_matrix:
+        if self._distance_csr is None:
+            n = len(self.vocabulary)
+            self._distance_csr = csr_matrix((self.distances, self.indices, self.indptr), shape=(n, n))
+        return self._distance_csr
+
+    def top_k(self, metric: str, k: int = 10, ascending: bool = False) -> List[Dict]:
+        """
+        Nodes with the highest (or lowest) value of a metric.
+
+        Args:
+            metric (str): One of metric_names()
+            k (int): Number of nodes
+            ascending (bool): Return the lowest values instead
+
+        Returns:
+            List[Dict]: Nodes with their metric 'value', best first
+
+        Raises:
+            KeyError: If the metric is not available
+        """
+        values = self.metrics[metric]
+        order = self._orders.get(metric)
+        if order is None:
+            order = self._orders[metric] = np.argsort(-values, kind='stable')
+        selected = order[::-1][:k] if ascending else order[:k]
+        return [{**self._node(i), 'value': float(values[i])} for i in selected.tolist()]
+
+    def metric_names(self) -> List[str]:
+        return sorted(self.metrics)
@@ -1,75 +1,142 @@
 import networkx as nx
-from typing import Dict, List, Tuple, Set, Optional
-import math
+import numpy as np
+from typing import Dict, List, Tuple, Set, Optional, Sequence
 import logging
-from functools import lru_cache
+import threading
+import uuid
+from collections import OrderedDict
+from services.graph_snapshot import GraphSnapshot, save_snapshot
+from services.graph_context import extract_neighbourhood
+from services.provenance import ProvenanceIndex
+from services.graph_index import GraphIndex
+from services.graph_delta import diff_graph_data
+from services.centrality import SPECTRAL_CENTRALITIES, carry_over
+from services.instrumentation import instrumentation
+
+# Metrics left out of progressive graph data and computed afterwards
+DEFERRED_METRICS = ('betweenness', 'average_clustering')
 
 class GraphService:
-    def __init__(self):
-        """Initialize the graph service with an empty graph."""
-        self.graph = nx.Graph()
+    def __init__(self, history_size: int = 8):
+        """
+        Initialize the graph service with an empty graph.
+        
+        Args:
+            history_size (int): Graph versions kept for delta responses
+        """
+        self._graph = nx.Graph()
+        self._snapshot: Optional[GraphSnapshot] = None
         self.logger = logging.getLogger(__name__)
         self._metrics_cache = {}
+        # ProvenanceIndex of the documents the current graph was built from, if any
+        self.provenance: Optional[ProvenanceIndex] = None
+        # Incremented on every change of the graph; query indexes of older generations are stale
+        self.generation = 0
+        self._query_index: Optional[GraphIndex] = None
+        # Last PageRank / eigenvector vector by measure, the warm start for the next generation
+        self._centrality_vectors: Dict[str, Tuple[List[str], np.ndarray]] = {}
+        # Graph data of recent versions, oldest first, for delta responses
+        self._history: OrderedDict = OrderedDict()
+        self._history_size = history_size
+        self._history_lock = threading.Lock()
+        # Held while the graph is replaced and while deferred metrics are stored
+        self._lock = threading.RLock()
+        self._version_prefix = uuid.uuid4().hex[:8]
+        self._version_count = 0
+        self._versioned_generation: Optional[int] = None
+        self.version: Optional[str] = None
 
-    def build_graph(self, tokens: List[str], cooccurrences: Dict[Tuple[str, str], int]) -> Dict:
+    @property
+    def graph(self) -> nx.Graph:
+        """The current graph, materialized from a restored snapshot on first access."""
+        if self._snapshot is not None:
+            self._materialize_snapshot()
+        return self._graph
+
+    @graph.setter
+    def graph(self, graph: nx.Graph):
+        with self._lock:
+            self._snapshot = None
+            self._graph = graph
+            self._metrics_cache = {}
+            self.generation += 1
+
+    def build_graph(self, tokens: List[str], cooccurrences: Dict[Tuple[str, str], int],
+                    provenance: Optional[ProvenanceIndex] = None,
+                    weights: Optional[Sequence[float]] = None, progressive: bool = False) -> Dict:
         """
         Build a weighted graph from tokens and their co-occurrences.
         
         Args:
             tokens (List[str]): List of processed tokens
             cooccurrences (Dict[Tuple[str, str], int]): Dictionary of token pairs and their counts
+            provenance (Optional[ProvenanceIndex]): Where the tokens and pairs occur in the source documents
+            weights (Optional[Sequence[float]]): Edge weights in (0, 1] in the order of
+                cooccurrences, e.g. from services.association; defaults to counts
+                normalized by the largest count
+            progressive (bool): Leave out DEFERRED_METRICS (see _prepare_graph_data)
             
         Returns:
             Dict: Graph data structure with normalized weights
         """
         try:
             # Clear existing graph and cache
-            self.graph.clear()
+            self.graph = nx.Graph()
             self._metrics_cache.clear()
+            self.provenance = provenance
             
-            # Add nodes
-            unique_tokens = set(tokens)
-            self.graph.add_nodes_from(unique_tokens)
-            
-            # Add edges with weights
-            max_weight = max(cooccurrences.values()) if cooccurrences else 1
-            
-            for (token1, token2), count in cooccurrences.items():
-                # Normalize weight between 0 and 1
-                normalized_weight = count / max_weight
+            with instrumentation.stage('build_graph'):
+                # Add nodes
+                unique_tokens = set(tokens)
+                self.graph.add_nodes_from(unique_tokens)
                 
+                # Weights for all edges at once
+                counts = np.fromiter(cooccurrences.values(), dtype=np.float64, count=len(cooccurrences))
+                if weights is None:
+                    # Normalize weight between 0 and 1
+                    weights = counts / counts.max() if len(counts) else counts
+                weights = np.asarray(weights, dtype=np.float64)
                 # Apply logarithmic scaling to prevent extreme differences
-                log_weight = math.log1p(normalized_weight)
+                log_weights = np.log1p(weights)
                 
-                self.graph.add_edge(token1, token2, 
-                                  weight=normalized_weight,
-                                  raw_count=count,
-                                  log_weight=log_weight)
+                self.graph.add_edges_from(
+                    (token1, token2, {'weight': weight, 'raw_count': count, 'log_weight': log_weight})
+                    for (token1, token2), count, weight, log_weight in zip(
+                        cooccurrences, cooccurrences.values(), weights.tolist(), log_weights.tolist()
+                    )
+                )
+            
+            # Indexes built while the edges were being added are stale
+            self.generation += 1
             
             # Calculate graph metrics
-            return self._prepare_graph_data()
+            return self._prepare_graph_data(progressive)
             
         except Exception as e:
             self.logger.error(f"Error building graph: {str(e)}")
             raise
 
-    @lru_cache(maxsize=1)
-    def calculate_betweenness_centrality(self) -> Dict[str, float]:
+    @instrumentation.timed('betweenness')
+    def calculate_betweenness_centrality(self, graph: Optional[nx.Graph] = None) -> Dict[str, float]:
         """
         Calculate betweenness centrality for all nodes.
         Uses edge weights for path calculations.
         
+        Args:
+            graph (Optional[nx.Graph]): Graph to use instead of the current one
+            
         Returns:
             Dict[str, float]: Dictionary of node IDs to centrality scores
         """
+        graph = graph if graph is not None else self.graph
         try:
             # Use inverse of weight for shortest path calculation
             # (higher weight = stronger connection = shorter path)
-            weight_dict = {(u, v): 1/d['weight'] for u, v, d in self.graph.edges(data=True)}
-            nx.set_edge_attributes(self.graph, weight_dict, 'distance')
+            weight_dict = {(u, v): 1/d['weight'] for u, v, d in graph.edges(data=True)}
+            nx.set_edge_attributes(graph, weight_dict, 'distance')
             
             return nx.betweenness_centrality(
-                self.graph,
+                graph,
                 weight='distance',
                 normalized=True
             )
@@ -77,32 +144,78 @@ class GraphService:
             self.logger.error(f"Error calculating betweenness centrality: {str(e)}")
             return {}
 
-    @lru_cache(maxsize=1)
-    def calculate_graph_metrics(self) -> Dict:
+    def calculate_spectral_centrality(self, measure: str) -> Dict[str, float]:
+        """
+        Calculate weighted PageRank or eigenvector centrality for all nodes.
+
+        Runs sparse power iteration over the CSR adjacency of the query
+        index, starting from the vector of the previous graph generation
+        (after filtering or rebuilding with another window), so that a small
+        change converges in a few iterations.
+
+        Args:
+            measure (str): 'pagerank' or 'eigenvector'
+
+        Returns:
+            Dict[str, float]: Dictionary of node IDs to scores
+        """
+        cached = self._metrics_cache.get(measure)
+        if cached is not None:
+            return cached
+
+        try:
+            index = self.query_index()
+            previous = self._centrality_vectors.get(measure)
+            start = carry_over(previous[0], previous[1], index.vocabulary) if previous else None
+
+            with instrumentation.stage(measure):
+                vector, _ = SPECTRAL_CENTRALITIES[measure](
+                    index.indptr, index.indices, index.weights, start=start
+                )
+
+            self._centrality_vectors[measure] = (index.vocabulary, vector)
+            index.attach_metric(measure, vector)
+            scores = dict(zip(index.vocabulary, vector.tolist()))
+            self._metrics_cache[measure] = scores
+            return scores
+        except Exception as e:
+            self.logger.error(f"Error calculating {measure} centrality: {str(e)}")
+            raise
+
+    @instrumentation.timed('graph_metrics')
+    def calculate_graph_metrics(self, graph: Optional[nx.Graph] = None,
+                                include_clustering: bool = True) -> Dict:
         """
         Calculate various graph metrics.
         
+        Args:
+            graph (Optional[nx.Graph]): Graph to use instead of the current one
+            include_clustering (bool): Include average clustering, which
+                costs far more than the other metrics
+            
         Returns:
             Dict: Dictionary containing graph metrics
         """
+        graph = graph if graph is not None else self.graph
         try:
             metrics = {
-                'node_count': self.graph.number_of_nodes(),
-                'edge_count': self.graph.number_of_edges(),
-                'density': nx.density(self.graph),
-                'average_clustering': nx.average_clustering(self.graph, weight='weight'),
-                'average_degree': sum(dict(self.graph.degree()).values()) / self.graph.number_of_nodes()
+                'node_count': graph.number_of_nodes(),
+                'edge_count': graph.number_of_edges(),
+                'density': nx.density(graph),
+                'average_degree': sum(dict(graph.degree()).values()) / graph.number_of_nodes()
             }
+            if include_clustering:
+                metrics['average_clustering'] = nx.average_clustering(graph, weight='weight')
             
             # Calculate connected components
-            components = list(nx.connected_components(self.graph))
+            components = list(nx.connected_components(graph))
             metrics['connected_components'] = len(components)
             
             # Calculate largest component size
             if components:
                 largest_component = max(components, key=len)
                 metrics['largest_component_size'] = len(largest_component)
-                metrics['largest_component_ratio'] = len(largest_component) / self.graph.number_of_nodes()
+                metrics['largest_component_ratio'] = len(largest_component) / graph.number_of_nodes()
             
             return metrics
             
@@ -110,32 +223,59 @@ class GraphService:
             self.logger.error(f"Error calculating graph metrics: {str(e)}")
             return {}
 
-    def _prepare_graph_data(self) -> Dict:
+    def _prepare_graph_data(self, progressive: bool = False) -> Dict:
         """
         Prepare graph data for frontend visualization.
         Includes node metrics and graph statistics.
         
+        In progressive mode, DEFERRED_METRICS that are not cached yet are
+        left out (nodes have no 'betweenness', metrics no
+        'average_clustering') and listed under 'pending_metrics';
+        complete_deferred_metrics computes them later.
+        
+        Args:
+            progressive (bool): Skip the expensive metrics that are not cached
+            
         Returns:
             Dict: Graph data with nodes, edges, and metrics
         """
         try:
+            # A restored snapshot brings its own metrics into the cache
+            self._materialize_snapshot()
+
             # Calculate metrics if not in cache
-            if not self._metrics_cache.get('betweenness'):
-                self._metrics_cache['betweenness'] = self.calculate_betweenness_centrality()
-            if not self._metrics_cache.get('metrics'):
-                self._metrics_cache['metrics'] = self.calculate_graph_metrics()
+            pending = []
+            betweenness = self._metrics_cache.get('betweenness')
+            if not betweenness:
+                if progressive:
+                    pending.append('betweenness')
+                else:
+                    betweenness = self._metrics_cache['betweenness'] = self.calculate_betweenness_centrality()
+            metrics = self._metrics_cache.get('metrics')
+            if not metrics:
+                if progressive:
+                    pending.append('average_clustering')
+                    metrics = self.calculate_graph_metrics(include_clustering=False)
+                else:
+                    metrics = self._metrics_cache['metrics'] = self.calculate_graph_metrics()
+            pagerank = self.calculate_spectral_centrality('pagerank')
+            eigenvector = self.calculate_spectral_centrality('eigenvector')
             
             nodes = []
             edges = []
             
             # Prepare nodes with metrics
             for node in self.graph.nodes():
-                nodes.append({
+                node_data = {
                     'id': node,
                     'label': node,
                     'degree': self.graph.degree(node),
-                    'betweenness': self._metrics_cache['betweenness'].get(node, 0)
-                })
+                    'pagerank': pagerank.get(node, 0),
+                    'eigenvector': eigenvector.get(node, 0)
+                }
+                if betweenness:
+                    node_data['betweenness'] = betweenness.get(node, 0)
+                nodes.append(node_data)
             
             # Prepare edges with weights
             for (source, target, data) in self.graph.edges(data=True):
@@ -147,27 +287,198 @@ class GraphService:
                     'raw_count': data['raw_count']
                 })
             
-            return {
+            graph_data = {
                 'nodes': nodes,
                 'edges': edges,
-                'metrics': self._metrics_cache['metrics']
+                'metrics': metrics
             }
+            if pending:
+                graph_data['pending_metrics'] = pending
+            return self.record_version(graph_data)
             
         except Exception as e:
             self.logger.error(f"Error preparing graph data: {str(e)}")
             raise
 
-    def filter_edges_by_weight(self, min_weight: float = 0.0) -> Dict:
+    def record_version(self, graph_data: Dict) -> Dict:
+        """
+        Stamp graph data of the current graph with its version id and keep it in the history.
+        
+        Version ids are unique per service instance. Graph data prepared
+        again for an unchanged graph gets the same version, unless it now
+        has the deferred metrics the earlier data was missing, or vice versa.
+        
+        Args:
+            graph_data (Dict): Graph data of the current graph
+            
+        Returns:
+            Dict: The same graph data with a 'version' key
+        """
+        with self._history_lock:
+            current = self._history.get(self.version)
+            if (self._versioned_generation != self.generation or current is None
+                    or ('pending_metrics' in current) != ('pending_metrics' in graph_data)):
+                self._version_count += 1
+                self.version = f"{self._version_prefix}-{self._version_count}"
+                self._versioned_generation = self.generation
+                self._history[self.version] = graph_data
+                while len(self._history) > self._history_size:
+                    self._history.popitem(last=False)
+            graph_data['version'] = self.version
+        return graph_data
+
+    def versioned_response(self, graph_data: Dict, since_version: Optional[str] = None) -> Dict:
+        """
+        Return graph data, or only its changes if the client already has a recent version.
+        
+        Args:
+            graph_data (Dict): Current graph data from record_version
+            since_version (Optional[str]): Version the client has
+            
+        Returns:
+            Dict: graph_data itself, or {'version', 'base_version', 'delta'}
+                when since_version is still in the history
+        """
+        if not since_version:
+            return graph_data
+        with self._history_lock:
+            base = self._history.get(since_version)
+        if base is None:
+            return graph_data
+        return {
+            'version': graph_data['version'],
+            'base_version': since_version,
+            'delta': diff_graph_data(base, graph_data)
+        }
+
+    def get_graph_data(self, progressive: bool = False) -> Dict:
+        """
+        Return the current graph with node metrics and graph statistics.
+        
+        Args:
+            progressive (bool): Leave out DEFERRED_METRICS that are not cached yet
+            
+        Returns:
+            Dict: Graph data with nodes, edges, and metrics
+        """
+        return self._prepare_graph_data(progressive)
+
+    def complete_deferred_metrics(self, generation: int) -> Optional[Dict]:
+        """
+        Compute the metrics left out of progressive graph data.
+        
+        Meant to run in a background worker. The metrics are computed on the
+        graph object of the given generation without holding the lock; they
+        are stored, and the graph data prepared, under the lock that graph
+        replacement takes, and only if the generation is still current.
+        
+        Args:
+            generation (int): Generation the progressive graph data belongs to
+            
+        Returns:
+            Optional[Dict]: Complete graph data under a new version, or None
+                if the graph changed before the metrics were ready
+        """
+        with self._lock:
+            if self.generation != generation:
+                return None
+            graph = self.graph
+            cache = self._metrics_cache
+
+        betweenness = cache.get('betweenness') or self.calculate_betweenness_centrality(graph)
+        metrics = cache.get('metrics') or self.calculate_graph_metrics(graph)
+
+        with self._lock:
+            if self.generation != generation:
+                return None
+            self._metrics_cache['betweenness'] = betweenness
+            self._metrics_cache['metrics'] = metrics
+            return self._prepare_graph_data()
+
+    def cached_betweenness(self) -> Optional[Dict[str, float]]:
+        """
+        Return betweenness centrality if it has already been computed.
+        
+        Returns:
+            Optional[Dict[str, float]]: Cached scores, or None
+        """
+        self._materialize_snapshot()
+        return self._metrics_cache.get('betweenness') or None
+
+    def query_index(self) -> GraphIndex:
+        """
+        Return the query index of the current graph, building it if the graph changed.
+        
+        A restored snapshot is indexed straight from its mapped arrays without
+        building the networkx graph. Betweenness is included once it has been
+        computed, as are PageRank and eigenvector centrality.
+        
+        Returns:
+            GraphIndex: Index of the current generation
+        """
+        index = self._query_index
+        node_metrics = {
+            name: self._metrics_cache[name]
+            for name in ('betweenness', *SPECTRAL_CENTRALITIES)
+            if self._metrics_cache.get(name)
+        }
+        if index is not None and index.generation == self.generation:
+            missing = [name for name in node_metrics if name not in index.metrics]
+            if not missing:
+                return index
+            if 'betweenness' not in missing:
+                # Only scores computed on this index are missing; attach them
+                for name in missing:
+                    values = node_metrics[name]
+                    index.attach_metric(name, [values.get(node, 0.0) for node in index.vocabulary])
+                return index
+        
+        generation = self.generation
+        if self._snapshot is not None:
+            index = GraphIndex.from_snapshot(self._snapshot, generation)
+        else:
+            index = GraphIndex.from_graph(self._graph, node_metrics or None, generation)
+        self._query_index = index
+        return index
+
+    def neighbourhood_context(self, seeds: List[str], hops: int = 2, token_budget: int = 1500) -> Dict:
+        """
+        Extract a bounded neighbourhood of the current graph for an LLM prompt.
+        
+        Uses cached betweenness for ranking when available and falls back to
+        degree centrality rather than computing betweenness on demand.
+        
+        Args:
+            seeds (List[str]): Node ids to start from
+            hops (int): Maximum distance from a seed
+            token_budget (int): Approximate token budget for the context
+            
+        Returns:
+            Dict: Compact nodes and edges plus a truncated flag
+        """
+        return extract_neighbourhood(
+            self.graph,
+            seeds,
+            hops=hops,
+            token_budget=token_budget,
+            centrality=self.cached_betweenness()
+        )
+
+    def filter_edges_by_weight(self, min_weight: float = 0.0, progressive: bool = False) -> Dict:
         """
         Filter edges based on minimum weight threshold.
         
         Args:
             min_weight (float): Minimum weight threshold (0 to 1)
+            progressive (bool): Leave out DEFERRED_METRICS (see _prepare_graph_data)
             
         Returns:
             Dict: Filtered graph data
         """
         try:
+            index = self._query_index
+            if index is not None and index.generation != self.generation:
+                index = None
             filtered_graph = self.graph.copy()
             
             # Remove edges below threshold
@@ -183,13 +494,118 @@ class GraphService:
             # Update graph and clear cache
             self.graph = filtered_graph
             self._metrics_cache.clear()
+            if index is not None:
+                # Same arrays minus the removed edges, without another pass over the graph
+                self._query_index = index.filtered(min_weight, self.generation)
             
-            return self._prepare_graph_data()
+            return self._prepare_graph_data(progressive)
             
         except Exception as e:
             self.logger.error(f"Error filtering edges: {str(e)}")
             raise
 
+    def save_snapshot(self, path: str) -> Dict:
+        """
+        Save the current graph and its cached metrics as a memory-mappable snapshot.
+        
+        Args:
+            path (str): Snapshot directory to write
+            
+        Returns:
+            Dict: Snapshot manifest
+        """
+        try:
+            self._materialize_snapshot()
+            if not self._metrics_cache.get('betweenness'):
+                self._metrics_cache['betweenness'] = self.calculate_betweenness_centrality()
+            if not self._metrics_cache.get('metrics'):
+                self._metrics_cache['metrics'] = self.calculate_graph_metrics()
+            node_metrics = {'betweenness': self._metrics_cache['betweenness']}
+            for measure in SPECTRAL_CENTRALITIES:
+                node_metrics[measure] = self.calculate_spectral_centrality(measure)
+            
+            return save_snapshot(
+                path,
+                self.graph,
+                metrics=self._metrics_cache['metrics'],
+                node_metrics=node_metrics
+            )
+            
+        except Exception as e:
+            self.logger.error(f"Error saving snapshot: {str(e)}")
+            raise
+
+    def restore_snapshot(self, snapshot: GraphSnapshot) -> Dict:
+        """
+        Make a snapshot the current graph.
+        
+        Only the mapped arrays are touched here; the networkx graph is built
+        the first time something needs it.
+        
+        Args:
+            snapshot (GraphSnapshot): Snapshot to restore
+            
+        Returns:
+            Dict: Snapshot summary with node/edge counts and cached metrics
+        """
+        with self._lock:
+            self._graph = nx.Graph()
+            self._snapshot = snapshot
+            self._metrics_cache = {'metrics': snapshot.metrics}
+            self.provenance = None
+            self.generation += 1
+        
+        return {
+            'node_count': snapshot.node_count,
+            'edge_count': snapshot.edge_count,
+            'metrics': snapshot.metrics
+        }
+
+    def load_graph_data(self, graph_data: Dict):
+        """
+        Make a graph built elsewhere (e.g. in a worker process) the current graph.
+
+        The metrics computed alongside it are reused rather than recalculated,
+        and graph_data is stamped with the version of this service.
+
+        Args:
+            graph_data (Dict): Output of build_graph
+        """
+        graph = nx.Graph()
+        graph.add_nodes_from(node['id'] for node in graph_data.get('nodes', []))
+        for edge in graph_data.get('edges', []):
+            graph.add_edge(edge['source'], edge['target'],
+                           weight=edge['weight'],
+                           raw_count=edge['raw_count'],
+                           log_weight=edge['log_weight'])
+
+        self.graph = graph
+        self.provenance = None
+        nodes = graph_data.get('nodes', [])
+        self._metrics_cache = {}
+        # Progressive graph data lacks some metrics; those are computed when needed
+        pending = graph_data.get('pending_metrics', [])
+        if 'betweenness' not in pending:
+            self._metrics_cache['betweenness'] = {node['id']: node.get('betweenness', 0) for node in nodes}
+        if 'average_clustering' not in pending:
+            self._metrics_cache['metrics'] = graph_data.get('metrics', {})
+        for measure in SPECTRAL_CENTRALITIES:
+            if nodes and all(measure in node for node in nodes):
+                self._metrics_cache[measure] = {node['id']: node[measure] for node in nodes}
+        self.record_version(graph_data)
+
+    def _materialize_snapshot(self):
+        """Build the networkx graph and node metrics from a pending snapshot."""
+        snapshot = self._snapshot
+        if snapshot is None:
+            return
+        
+        self._snapshot = None
+        self._graph = snapshot.to_networkx()
+        for name in ('betweenness', *SPECTRAL_CENTRALITIES):
+            if name in snapshot.node_metrics:
+                self._metrics_cache[name] = snapshot.node_metric_dict(name)
+
     def validate_graph(self) -> Tuple[bool, List[str]]:
         """
         Validate graph data structure.
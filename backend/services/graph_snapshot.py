@@ -0,0 +1,287 @@
+import json
+import os
+import re
+import shutil
+import tempfile
+import time
+import numpy as np
+import networkx as nx
+from typing import Dict, List, Optional, Tuple
+
+SNAPSHOT_FORMAT_VERSION = 1
+
+# Edge attributes written by GraphService.build_graph, with their on-disk dtype
+EDGE_ATTRIBUTES = {
+    'weight': np.float64,
+    'raw_count': np.int64,
+    'log_weight': np.float64
+}
+
+# Snapshot names end up as directory names, so keep them to a safe alphabet
+SNAPSHOT_NAME_PATTERN = re.compile(r'^[A-Za-z0-9_.-]{1,128}$')
+
+
+def graph_to_csr(graph: nx.Graph) -> Tuple[List[str], np.ndarray, np.ndarray, Dict[str, np.ndarray]]:
+    """
+    Convert an undirected graph into a symmetric CSR adjacency.
+
+    Every undirected edge is stored in both directions, so the neighbours of
+    node i are indices[indptr[i]:indptr[i + 1]].
+
+    Args:
+        graph (nx.Graph): Graph to convert
+
+    Returns:
+        Tuple: (vocabulary, indptr, indices, edge attribute arrays aligned with indices)
+    """
+    vocabulary = list(graph.nodes())
+    node_index = {node: i for i, node in enumerate(vocabulary)}
+    edge_count = graph.number_of_edges()
+
+    sources = np.empty(edge_count, dtype=np.int64)
+    targets = np.empty(edge_count, dtype=np.int64)
+    attributes = {name: np.zeros(edge_count, dtype=dtype) for name, dtype in EDGE_ATTRIBUTES.items()}
+
+    for i, (u, v, data) in enumerate(graph.edges(data=True)):
+        sources[i] = node_index[u]
+        targets[i] = node_index[v]
+        for name in EDGE_ATTRIBUTES:
+            attributes[name][i] = data.get(name, 0)
+
+    # Store both directions and sort by (row, column)
+    rows = np.concatenate([sources, targets])
+    cols = np.concatenate([targets, sources])
+    order = np.lexsort((cols, rows))
+
+    indptr = np.zeros(len(vocabulary) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=len(vocabulary)), out=indptr[1:])
+    indices = cols[order].astype(np.int32)
+    edge_arrays = {
+        name: np.concatenate([values, values])[order]
+        for name, values in attributes.items()
+    }
+
+    return vocabulary, indptr, indices, edge_arrays
+
+
+class GraphSnapshot:
+    """
+    Read-only view over a snapshot directory.
+
+    All arrays are opened with np.load(mmap_mode='r'), so opening a snapshot
+    only maps the files; pages are read on first access and are shared through
+    the OS page cache by every process that opens the same snapshot.
+    """
+
+    def __init__(self, path: str):
+        """
+        Open a snapshot directory.
+
+        Args:
+            path (str): Directory written by save_snapshot
+        """
+        self.path = path
+        with open(os.path.join(path, 'manifest.json'), 'r', encoding='utf-8') as f:
+            self.manifest = json.load(f)
+
+        if self.manifest.get('format_version') != SNAPSHOT_FORMAT_VERSION:
+            raise ValueError(f"Unsupported snapshot format: {self.manifest.get('format_version')}")
+
+        self.indptr = self._load('indptr.npy')
+        self.indices = self._load('indices.npy')
+        self.edge_attributes = {
+            name: self._load(f'edge_{name}.npy') for name in self.manifest['edge_attributes']
+        }
+        self.node_metrics = {
+            name: self._load(f'node_{name}.npy') for name in self.manifest['node_metrics']
+        }
+        self._vocab_blob = self._load('vocab_bytes.npy')
+        self._vocab_offsets = self._load('vocab_offsets.npy')
+        self._vocabulary: Optional[List[str]] = None
+        self._node_index: Optional[Dict[str, int]] = None
+
+    def _load(self, filename: str) -> np.ndarray:
+        return np.load(os.path.join(self.path, filename), mmap_mode='r')
+
+    @property
+    def node_count(self) -> int:
+        return self.manifest['node_count']
+
+    @property
+    def edge_count(self) -> int:
+        return self.manifest['edge_count']
+
+    @property
+    def metrics(self) -> Dict:
+        return self.manifest.get('metrics', {})
+
+    def term(self, i: int) -> str:
+        """Decode the vocabulary entry for node index i."""
+        start, end = self._vocab_offsets[i], self._vocab_offsets[i + 1]
+        return bytes(self._vocab_blob[start:end]).decode('utf-8')
+
+    @property
+    def vocabulary(self) -> List[str]:
+        """Decoded vocabulary, built on first access."""
+        if self._vocabulary is None:
+            blob = bytes(self._vocab_blob)
+            offsets = self._vocab_offsets.tolist()
+            self._vocabulary = [
+                blob[offsets[i]:offsets[i + 1]].decode('utf-8') for i in range(self.node_count)
+            ]
+        return self._vocabulary
+
+    def index_of(self, term: str) -> Optional[int]:
+        """Return the node index for a term, or None if it is not in the graph."""
+        if self._node_index is None:
+            self._node_index = {node: i for i, node in enumerate(self.vocabulary)}
+        return self._node_index.get(term)
+
+    def neighbors(self, i: int) -> np.ndarray:
+        """Node indices adjacent to node i (a view into the mapped file)."""
+        return self.indices[self.indptr[i]:self.indptr[i + 1]]
+
+    def to_networkx(self) -> nx.Graph:
+        """
+        Materialize the snapshot as a networkx graph.
+
+        Returns:
+            nx.Graph: Graph with the stored edge attributes
+        """
+        vocabulary = self.vocabulary
+        graph = nx.Graph()
+        graph.add_nodes_from(vocabulary)
+
+        rows = np.repeat(np.arange(self.node_count, dtype=np.int64), np.diff(self.indptr))
+        # Each edge is stored twice; keep the row < column copy
+        upper = rows < self.indices
+        sources = rows[upper].tolist()
+        targets = self.indices[upper].tolist()
+        attributes = {name: values[upper].tolist() for name, values in self.edge_attributes.items()}
+        names = list(attributes)
+
+        graph.add_edges_from(
+            (vocabulary[u], vocabulary[v], {name: attributes[name][i] for name in names})
+            for i, (u, v) in enumerate(zip(sources, targets))
+        )
+        return graph
+
+    def node_metric_dict(self, name: str) -> Dict[str, float]:
+        """Return a stored per-node metric as a node -> value dictionary."""
+        return dict(zip(self.vocabulary, self.node_metrics[name].tolist()))
+
+
+def save_snapshot(path: str, graph: nx.Graph, metrics: Optional[Dict] = None,
+                  node_metrics: Optional[Dict[str, Dict[str, float]]] = None) -> Dict:
+    """
+    Write a graph and its cached metrics to a snapshot directory.
+
+    The snapshot is written to a temporary directory next to path and moved
+    into place, so readers never observe a partially written snapshot.
+
+    Args:
+        path (str): Target snapshot directory
+        graph (nx.Graph): Graph to store
+        metrics (Optional[Dict]): Graph-level metrics (JSON serializable)
+        node_metrics (Optional[Dict[str, Dict[str, float]]]): Per-node metrics by name
+
+    Returns:
+        Dict: The snapshot manifest
+    """
+    vocabulary, indptr, indices, edge_arrays = graph_to_csr(graph)
+    node_metrics = node_metrics or {}
+
+    encoded = [node.encode('utf-8') for node in map(str, vocabulary)]
+    vocab_offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(term) for term in encoded], out=vocab_offsets[1:])
+
+    manifest = {
+        'format_version': SNAPSHOT_FORMAT_VERSION,
+        'created_at': time.time(),
+        'node_count': len(vocabulary),
+        'edge_count': graph.number_of_edges(),
+        'edge_attributes': list(edge_arrays),
+        'node_metrics': list(node_metrics),
+        'metrics': metrics or {}
+    }
+
+    parent = os.path.dirname(os.path.abspath(path))
+    os.makedirs(parent, exist_ok=True)
+    tmp_path = tempfile.mkdtemp(prefix='.snapshot-', dir=parent)
+
+    try:
+        np.save(os.path.join(tmp_path, 'indptr.npy'), indptr)
+        np.save(os.path.join(tmp_path, 'indices.npy'), indices)
+        for name, values in edge_arrays.items():
+            np.save(os.path.join(tmp_path, f'edge_{name}.npy'), values)
+        for name, values in node_metrics.items():
+            array = np.array([values.get(node, 0.0) for node in vocabulary], dtype=np.float64)
+            np.save(os.path.join(tmp_path, f'node_{name}.npy'), array)
+        np.save(os.path.join(tmp_path, 'vocab_bytes.npy'), np.frombuffer(b''.join(encoded), dtype=np.uint8))
+        np.save(os.path.join(tmp_path, 'vocab_offsets.npy'), vocab_offsets)
+
+        # The manifest is written last; a directory without one is not a snapshot
+        with open(os.path.join(tmp_path, 'manifest.json'), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f)
+
+        # Swap the new snapshot in; readers holding maps of the old files keep them
+        if os.path.exists(path):
+            old_path = tempfile.mkdtemp(prefix='.snapshot-old-', dir=parent)
+            os.rmdir(old_path)
+            os.replace(path, old_path)
+            os.replace(tmp_path, path)
+            shutil.rmtree(old_path, ignore_errors=True)
+        else:
+            os.replace(tmp_path, path)
+    except Exception:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        raise
+
+    return manifest
+
+
+class SnapshotStore:
+    """Named graph snapshots stored under a single root directory."""
+
+    def __init__(self, root: str):
+        """
+        Initialize the store.
+
+        Args:
+            root (str): Directory holding one subdirectory per snapshot
+        """
+        self.root = root
+
+    def path_for(self, name: str) -> str:
+        """
+        Resolve a snapshot name to its directory.
+
+        Raises:
+            ValueError: If the name contains characters outside [A-Za-z0-9_.-]
+        """
+        if not SNAPSHOT_NAME_PATTERN.match(name) or name.startswith('.'):
+            raise ValueError(f"Invalid snapshot name: {name!r}")
+        return os.path.join(self.root, name)
+
+    def exists(self, name: str) -> bool:
+        return os.path.isfile(os.path.join(self.path_for(name), 'manifest.json'))
+
+    def list(self) -> List[str]:
+        """Return the names of all complete snapshots."""
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(
+            name for name in os.listdir(self.root)
+            if not name.startswith('.') and os.path.isfile(os.path.join(self.root, name, 'manifest.json'))
+        )
+
+    def open(self, name: str) -> GraphSnapshot:
+        """
+        Open a snapshot by name.
+
+        Raises:
+            KeyError: If no snapshot with that name exists
+        """
+        if not self.exists(name):
+            raise KeyError(name)
+        return GraphSnapshot(self.path_for(name))
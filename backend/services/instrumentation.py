@@ -0,0 +1,233 @@
+import bisect
+import contextvars
+import functools
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Latency buckets in seconds, from single milliseconds up to slow LLM calls
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class _RequestState:
+    """Stage timings and endpoint name of the request being timed."""
+
+    def __init__(self):
+        self.stages: List[Tuple[str, float]] = []
+        self.endpoint: Optional[str] = None
+
+
+# State of the request being handled in the current context
+_current_request: contextvars.ContextVar = contextvars.ContextVar('current_request', default=None)
+
+_NO_OP = nullcontext()
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple, extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+class Histogram:
+    """Latency histogram with fixed buckets, one series per label combination."""
+
+    def __init__(self, name: str, help_text: str, label_names: Tuple[str, ...],
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = buckets
+        self._series: Dict[Tuple, List] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                # Per-bucket counts (last one is +Inf), sum, count
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> List[str]:
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            series = {labels: (list(counts), total, count) for labels, (counts, total, count) in self._series.items()}
+
+        for labels, (counts, total, count) in sorted(series.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                bucket_labels = _format_labels(self.label_names, labels, f'le="{le}"')
+                lines.append(f'{self.name}_bucket{bucket_labels} {cumulative}')
+            lines.append(f'{self.name}_sum{_format_labels(self.label_names, labels)} {total}')
+            lines.append(f'{self.name}_count{_format_labels(self.label_names, labels)} {count}')
+        return lines
+
+
+class Counter:
+    """Monotonic counter, one value per label combination."""
+
+    def __init__(self, name: str, help_text: str, label_names: Tuple[str, ...]):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self._values: Dict[Tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} counter']
+        with self._lock:
+            values = dict(self._values)
+        for labels, value in sorted(values.items()):
+            lines.append(f'{self.name}{_format_labels(self.label_names, labels)} {value}')
+        return lines
+
+
+class Instrumentation:
+    """
+    Per-stage timers, request timing and Prometheus-format metrics.
+
+    Stages are timed with stage() or @timed(). Every stage feeds a latency
+    histogram; stages that run inside a request started with start_request()
+    are also reported in that request's Server-Timing header. When disabled,
+    stage() returns a shared no-op context manager and nothing is recorded.
+    Metrics are kept per process.
+    """
+
+    def __init__(self, enabled: bool = True):
+        """
+        Initialize the metrics.
+
+        Args:
+            enabled (bool): Whether anything is recorded
+        """
+        self.enabled = enabled
+        self.stage_seconds = Histogram(
+            'kg_stage_duration_seconds', 'Time spent in a processing stage.', ('stage',)
+        )
+        self.request_seconds = Histogram(
+            'kg_http_request_duration_seconds', 'HTTP request latency.', ('endpoint', 'method')
+        )
+        self.requests = Counter(
+            'kg_http_requests_total', 'HTTP requests handled.', ('endpoint', 'method', 'status')
+        )
+
+    def stage(self, name: str):
+        """
+        Time a block of code as a named stage.
+
+        Args:
+            name (str): Stage name, e.g. 'spacy_parse'
+
+        Returns:
+            A context manager
+        """
+        if not self.enabled:
+            return _NO_OP
+        return self._timed_stage(name)
+
+    @contextmanager
+    def _timed_stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.stage_seconds.observe(elapsed, name)
+            state = _current_request.get()
+            if state is not None:
+                state.stages.append((name, elapsed))
+
+    def timed(self, name: str) -> Callable:
+        """Decorator timing every call of a function as a named stage."""
+        def decorator(f):
+            @functools.wraps(f)
+            def wrapper(*args, **kwargs):
+                with self.stage(name):
+                    return f(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def start_request(self) -> Optional[float]:
+        """
+        Start collecting stage timings for the current request.
+
+        Returns:
+            Optional[float]: Start time to pass to finish_request, or None if
+                disabled or a request is already being timed in this context
+        """
+        if not self.enabled or _current_request.get() is not None:
+            return None
+        _current_request.set(_RequestState())
+        return time.perf_counter()
+
+    def name_request(self, endpoint: str):
+        """
+        Name the request being timed, for inner layers that know the route
+        better than the layer that started timing it.
+        """
+        state = _current_request.get()
+        if state is not None:
+            state.endpoint = endpoint
+
+    def finish_request(self, started: Optional[float], endpoint: str, method: str,
+                       status: int) -> Optional[str]:
+        """
+        Record a finished request and build its Server-Timing header.
+
+        Args:
+            started (Optional[float]): Value returned by start_request
+            endpoint (str): Route or endpoint name, unless set by name_request
+            method (str): HTTP method
+            status (int): Response status code
+
+        Returns:
+            Optional[str]: Server-Timing header value, or None if not timed
+        """
+        if started is None:
+            return None
+
+        elapsed = time.perf_counter() - started
+        state = _current_request.get() or _RequestState()
+        _current_request.set(None)
+
+        endpoint = state.endpoint or endpoint
+        self.request_seconds.observe(elapsed, endpoint, method)
+        self.requests.inc(endpoint, method, str(status))
+
+        totals: Dict[str, float] = {}
+        for name, seconds in state.stages:
+            totals[name] = totals.get(name, 0.0) + seconds
+        entries = [f'{name};dur={seconds * 1000:.1f}' for name, seconds in totals.items()]
+        entries.append(f'total;dur={elapsed * 1000:.1f}')
+        return ', '.join(entries)
+
+    def abandon_request(self):
+        """Stop collecting stage timings without recording the request."""
+        _current_request.set(None)
+
+    def render(self) -> str:
+        """Return all metrics in the Prometheus text exposition format."""
+        lines = []
+        for metric in (self.stage_seconds, self.request_seconds, self.requests):
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+# Shared by the services and the web layer; app.py applies METRICS_ENABLED
+instrumentation = Instrumentation()
@@ -0,0 +1,274 @@
+import heapq
+import itertools
+import os
+import threading
+import time
+import uuid
+import logging
+from typing import Any, Callable, Dict, List, Optional
+
+
+class JobStatus:
+    PENDING = 'pending'
+    RUNNING = 'running'
+    SUCCEEDED = 'succeeded'
+    FAILED = 'failed'
+    CANCELLED = 'cancelled'
+
+    FINISHED = {SUCCEEDED, FAILED, CANCELLED}
+
+
+class QueueFullError(Exception):
+    """Raised when a job is submitted while the pending queue is full."""
+
+
+class Job:
+    """A unit of work tracked by JobQueue."""
+
+    def __init__(self, fn: Callable, args: tuple, kwargs: Dict, kind: str, priority: int):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.priority = priority
+        self.status = JobStatus.PENDING
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._fn = fn
+        self._args = args
+        self._kwargs = kwargs
+        self._cancel_requested = threading.Event()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in JobStatus.FINISHED
+
+    @property
+    def cancel_requested(self) -> bool:
+        """True once cancellation was requested; long-running work should check this."""
+        return self._cancel_requested.is_set()
+
+    def to_dict(self) -> Dict:
+        """
+        Serialize the job for API responses.
+
+        Returns:
+            Dict: Job status, timestamps and, once finished, result or error
+        """
+        data = {
+            'job_id': self.id,
+            'kind': self.kind,
+            'status': self.status,
+            'priority': self.priority,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at
+        }
+        if self.status == JobStatus.SUCCEEDED:
+            data['result'] = self.result
+        elif self.status == JobStatus.FAILED:
+            data['error'] = self.error
+        return data
+
+
+class JobQueue:
+    """
+    Bounded worker pool for long-running work.
+
+    Jobs run in priority order (higher first, FIFO within a priority).
+    Pending jobs can be cancelled outright; running jobs are flagged and their
+    result is discarded when they return. Finished jobs are kept for
+    result_ttl seconds so clients can poll for them.
+    """
+
+    def __init__(self, max_workers: int = 2, result_ttl: float = 600, max_pending: int = 100):
+        """
+        Initialize the queue.
+
+        Worker threads are started on first use, in the process that uses
+        them, so the queue can be created before a pre-fork server forks.
+
+        Args:
+            max_workers (int): Number of worker threads
+            result_ttl (float): Seconds a finished job stays retrievable
+            max_pending (int): Maximum number of queued jobs
+        """
+        self.result_ttl = result_ttl
+        self.max_pending = max_pending
+        self.logger = logging.getLogger(__name__)
+
+        self._jobs: Dict[str, Job] = {}
+        self._heap: List = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._local = threading.local()
+        self._shutdown = False
+
+        self.max_workers = max_workers
+        self._workers: List[threading.Thread] = []
+        self._workers_pid: Optional[int] = None
+
+    def submit(self, fn: Callable, *args, kind: str = '', priority: int = 0, **kwargs) -> Job:
+        """
+        Queue fn(*args, **kwargs) and return immediately.
+
+        Args:
+            fn (Callable): Work to run
+            kind (str): Label reported with the job
+            priority (int): Higher values run first
+
+        Returns:
+            Job: The queued job
+
+        Raises:
+            QueueFullError: If max_pending jobs are already waiting
+        """
+        job = Job(fn, args, kwargs, kind, priority)
+        with self._condition:
+            self._ensure_workers()
+            self._purge_expired()
+            pending = sum(1 for j in self._jobs.values() if j.status == JobStatus.PENDING)
+            if pending >= self.max_pending:
+                raise QueueFullError("Job queue is full")
+
+            self._jobs[job.id] = job
+            heapq.heappush(self._heap, (-priority, next(self._sequence), job))
+            self._condition.notify_all()
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Return a job by id, or None if unknown or expired."""
+        with self._condition:
+            self._purge_expired()
+            return self._jobs.get(job_id)
+
+    def wait(self, job_id: str, timeout: float) -> Optional[Job]:
+        """
+        Block until a job finishes or the timeout elapses.
+
+        Args:
+            job_id (str): Job to wait for
+            timeout (float): Maximum seconds to wait
+
+        Returns:
+            Optional[Job]: The job in its current state, or None if unknown
+        """
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            job = self._jobs.get(job_id)
+            while job is not None and not job.finished:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+            return job
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """
+        Cancel a job.
+
+        A pending job is cancelled immediately. A running job is flagged and
+        marked cancelled; whatever it returns is discarded.
+
+        Args:
+            job_id (str): Job to cancel
+
+        Returns:
+            Optional[Job]: The job, or None if unknown
+        """
+        with self._condition:
+            job = self._jobs.get(job_id)
+            if job is None or job.finished:
+                return job
+
+            job._cancel_requested.set()
+            job.status = JobStatus.CANCELLED
+            job.finished_at = time.time()
+            self._condition.notify_all()
+            return job
+
+    def current_job(self) -> Optional[Job]:
+        """Return the job being run by the calling worker thread, if any."""
+        return getattr(self._local, 'job', None)
+
+    def stats(self) -> Dict:
+        """
+        Return job counts by status.
+
+        Returns:
+            Dict: Status name to number of tracked jobs
+        """
+        with self._condition:
+            counts = {}
+            for job in self._jobs.values():
+                counts[job.status] = counts.get(job.status, 0) + 1
+            return counts
+
+    def shutdown(self):
+        """Stop the workers after their current jobs."""
+        with self._condition:
+            self._shutdown = True
+            self._condition.notify_all()
+        for worker in self._workers:
+            worker.join()
+
+    def _ensure_workers(self):
+        """Start worker threads in this process if needed. Caller holds the lock."""
+        if self._workers_pid == os.getpid():
+            return
+        self._workers_pid = os.getpid()
+        self._workers = [
+            threading.Thread(target=self._worker, name=f'job-worker-{i}', daemon=True)
+            for i in range(self.max_workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def _purge_expired(self):
+        """Forget finished jobs older than result_ttl. Caller holds the lock."""
+        cutoff = time.time() - self.result_ttl
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished and job.finished_at is not None and job.finished_at < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def _next_job(self) -> Optional[Job]:
+        """Pop the next pending job, blocking while the queue is empty."""
+        with self._condition:
+            while True:
+                if self._shutdown:
+                    return None
+                while self._heap:
+                    _, _, job = heapq.heappop(self._heap)
+                    # Cancelled jobs stay in the heap until they come up
+                    if job.status == JobStatus.PENDING:
+                        job.status = JobStatus.RUNNING
+                        job.started_at = time.time()
+                        return job
+                self._condition.wait()
+
+    def _worker(self):
+        while True:
+            job = self._next_job()
+            if job is None:
+                return
+
+            self._local.job = job
+            try:
+                result, error = job._fn(*job._args, **job._kwargs), None
+            except Exception as e:
+                self.logger.error(f"Job {job.id} ({job.kind}) failed: {str(e)}")
+                result, error = None, str(e)
+            finally:
+                self._local.job = None
+
+            with self._condition:
+                if job.status == JobStatus.RUNNING:
+                    job.result = result
+                    job.error = error
+                    job.status = JobStatus.FAILED if error is not None else JobStatus.SUCCEEDED
+                    job.finished_at = time.time()
+                self._condition.notify_all()
@@ -0,0 +1,183 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Iterator, List, Tuple
+from kg_gen.models import Graph
+
+
+def normalize_entity(entity: str) -> str:
+    """Case- and whitespace-insensitive key used to deduplicate entities."""
+    return ' '.join(str(entity).lower().split())
+
+
+class ChunkedExtractor:
+    """
+    Knowledge-graph extraction over overlapping chunks of a token stream.
+
+    Each chunk is sent to the model separately and the chunk calls run on a
+    bounded thread pool shared by all requests, so a long document costs
+    roughly the latency of its slowest chunk rather than one oversized call.
+    """
+
+    def __init__(self, generate_fn: Callable[[str, str], Graph], chunk_size: int = 400,
+                 overlap: int = 50, max_workers: int = 4):
+        """
+        Initialize the extractor.
+
+        Args:
+            generate_fn (Callable[[str, str], Graph]): Called as generate_fn(input_data, context)
+            chunk_size (int): Tokens per chunk
+            overlap (int): Tokens shared by consecutive chunks
+            max_workers (int): Maximum number of concurrent model calls
+        """
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+        if not 0 <= overlap < chunk_size:
+            raise ValueError("overlap must be between 0 and chunk_size - 1")
+
+        self.generate_fn = generate_fn
+        self.chunk_size = chunk_size
+        self.overlap = overlap
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='kg-extract')
+        self.logger = logging.getLogger(__name__)
+
+    def split(self, tokens: List[str]) -> List[str]:
+        """
+        Split tokens into overlapping chunks.
+
+        Args:
+            tokens (List[str]): Processed tokens
+
+        Returns:
+            List[str]: Chunk texts, at least one
+        """
+        if len(tokens) <= self.chunk_size:
+            return [' '.join(tokens)]
+
+        step = self.chunk_size - self.overlap
+        chunks = []
+        for start in range(0, len(tokens), step):
+            chunks.append(' '.join(tokens[start:start + self.chunk_size]))
+            if start + self.chunk_size >= len(tokens):
+                break
+        return chunks
+
+    def iter_extract(self, tokens: List[str], context: str) -> Iterator[Tuple[int, Graph]]:
+        """
+        Run the chunk extractions and yield results as they complete.
+
+        Args:
+            tokens (List[str]): Processed tokens
+            context (str): Instruction passed to the model
+
+        Yields:
+            Tuple[int, Graph]: (chunk index, chunk result) in completion order
+        """
+        chunks = self.split(tokens)
+        futures = {
+            self.executor.submit(self.generate_fn, chunk, context): i
+            for i, chunk in enumerate(chunks)
+        }
+
+        try:
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+        finally:
+            # Don't leave queued chunks running after a failure or an abandoned stream
+            for future in futures:
+                future.cancel()
+
+    def extract(self, tokens: List[str], context: str) -> Graph:
+        """
+        Extract and merge a knowledge graph from all chunks.
+
+        Args:
+            tokens (List[str]): Processed tokens
+            context (str): Instruction passed to the model
+
+        Returns:
+            Graph: Deduplicated union of the chunk results
+        """
+        results = dict(self.iter_extract(tokens, context))
+        return merge_graphs([results[i] for i in sorted(results)])
+
+
+def merge_graphs(results: List[Graph]) -> Graph:
+    """
+    Merge chunk results, deduplicating entities and relations.
+
+    Entities that only differ in case or whitespace are merged; the first
+    spelling seen (in chunk order) is kept and relations are rewritten to it.
+
+    Args:
+        results (List[Graph]): Chunk results in document order
+
+    Returns:
+        Graph: Merged result
+    """
+    canonical: Dict[str, str] = {}
+
+    def resolve(entity: str) -> str:
+        return canonical.setdefault(normalize_entity(entity), entity)
+
+    for result in results:
+        for entity in sorted(result.entities):
+            resolve(entity)
+
+    relations = {}
+    for result in results:
+        for source, relation_type, target in sorted(result.relations):
+            relation = (resolve(source), relation_type, resolve(target))
+            key = (normalize_entity(relation[0]), normalize_entity(relation_type), normalize_entity(relation[2]))
+            relations.setdefault(key, relation)
+
+    return Graph(
+        entities=set(canonical.values()),
+        edges={relation_type for _, relation_type, _ in relations.values()},
+        relations=set(relations.values())
+    )
+
+
+class IncrementalMerge:
+    """
+    Deduplicates chunk results as they arrive, for streaming progress.
+
+    Each chunk is only compared with what was seen before, so the work per
+    chunk does not grow with the number of chunks. Spellings follow arrival
+    order; merge_graphs over all results gives the final, chunk-ordered graph.
+    """
+
+    def __init__(self):
+        self._canonical: Dict[str, str] = {}
+        self._relations: set = set()
+
+    def add(self, result: Graph) -> Graph:
+        """
+        Add a chunk result.
+
+        Args:
+            result (Graph): Result of one chunk
+
+        Returns:
+            Graph: Entities and relations not seen in earlier chunks
+        """
+        entities = set()
+        for entity in sorted(result.entities):
+            key = normalize_entity(entity)
+            if key not in self._canonical:
+                self._canonical[key] = entity
+                entities.add(entity)
+
+        relations = set()
+        for source, relation_type, target in sorted(result.relations):
+            source = self._canonical.setdefault(normalize_entity(source), source)
+            target = self._canonical.setdefault(normalize_entity(target), target)
+            key = (normalize_entity(source), normalize_entity(relation_type), normalize_entity(target))
+            if key not in self._relations:
+                self._relations.add(key)
+                relations.add((source, relation_type, target))
+
+        return Graph(
+            entities=entities,
+            edges={relation_type for _, relation_type, _ in relations},
+            relations=relations
+        )
@@ -0,0 +1,41 @@
+import logging
+from typing import Mapping, Optional
+
+
+class LookupLemmatizer:
+    """
+    Context-free lemmatizer backed by a form -> lemma table.
+
+    The English table ships with spacy-lookups-data. Without it every form is
+    its own lemma, so the fast tokenization mode still works, only without
+    merging inflections.
+    """
+
+    def __init__(self, table: Optional[Mapping[str, str]] = None, lang: str = 'en'):
+        """
+        Initialize the lemmatizer.
+
+        Args:
+            table (Optional[Mapping[str, str]]): Lemma table; loaded from
+                spacy-lookups-data for lang when omitted
+            lang (str): Language of the table to load
+        """
+        self.logger = logging.getLogger(__name__)
+        if table is None:
+            table = self._load_table(lang)
+        self.table = table
+
+    def _load_table(self, lang: str) -> Mapping[str, str]:
+        try:
+            from spacy.lookups import load_lookups
+            return load_lookups(lang, ['lemma_lookup']).get_table('lemma_lookup')
+        except (ImportError, ValueError) as e:
+            self.logger.warning(f"No lemma lookup table for '{lang}', forms are not lemmatized: {str(e)}")
+            return {}
+
+    def __call__(self, text: str) -> str:
+        """Lowercase lemma of a surface form; the lowercased form if it is not in the table."""
+        lemma = self.table.get(text)
+        if lemma is None:
+            lemma = self.table.get(text.lower(), text)
+        return lemma.lower()
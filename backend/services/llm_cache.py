@@ -0,0 +1,204 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import logging
+from typing import Any, Dict, Optional
+
+
+class LLMResultCache:
+    """
+    Persistent cache for LLM results, stored in SQLite.
+
+    Entries are keyed by model, temperature, context and a hash of the input,
+    expire after a TTL and are evicted least-recently-used first once the
+    cache grows past max_entries or max_bytes. SQLite runs in WAL mode so
+    several worker processes can share one cache file.
+    """
+
+    def __init__(self, path: str, ttl_seconds: float = 7 * 24 * 3600,
+                 max_entries: int = 10000, max_bytes: int = 256 * 1024 * 1024):
+        """
+        Initialize the cache.
+
+        Args:
+            path (str): SQLite database file
+            ttl_seconds (float): Lifetime of an entry
+            max_entries (int): Maximum number of stored entries
+            max_bytes (int): Maximum total size of stored values
+        """
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.logger = logging.getLogger(__name__)
+
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'expired': 0, 'evictions': 0}
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connection() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS llm_cache (
+                    key TEXT PRIMARY KEY,
+                    model TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    expires_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS llm_cache_accessed ON llm_cache (accessed_at)")
+
+    def _connection(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use in each process."""
+        conn = getattr(self._local, 'conn', None)
+        # Connections must not cross a fork, so a forked worker opens its own
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _count(self, name: str, amount: int = 1):
+        with self._stats_lock:
+            self._stats[name] += amount
+
+    @staticmethod
+    def make_key(model: str, temperature: float, context: str, input_data: str) -> str:
+        """
+        Build a cache key for an LLM call.
+
+        Args:
+            model (str): Model identifier
+            temperature (float): Sampling temperature
+            context (str): Context or instruction string
+            input_data (str): Processed input sent to the model
+
+        Returns:
+            str: Hex digest identifying the call
+        """
+        input_hash = hashlib.sha256(input_data.encode('utf-8')).hexdigest()
+        material = json.dumps([model, float(temperature), context, input_hash])
+        return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Look up a cached value.
+
+        Args:
+            key (str): Key from make_key
+
+        Returns:
+            Optional[Any]: The cached value, or None on a miss or expired entry
+        """
+        try:
+            now = time.time()
+            conn = self._connection()
+            with conn:
+                row = conn.execute(
+                    "SELECT value, expires_at FROM llm_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    self._count('misses')
+                    return None
+
+                value, expires_at = row
+                if expires_at <= now:
+                    conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                    self._count('expired')
+                    self._count('misses')
+                    return None
+
+                conn.execute("UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key))
+
+            self._count('hits')
+            return json.loads(value)
+
+        except sqlite3.Error as e:
+            # A broken cache must never break the request; treat it as a miss
+            self.logger.error(f"Error reading LLM cache: {str(e)}")
+            self._count('misses')
+            return None
+
+    def set(self, key: str, value: Any, model: str = ''):
+        """
+        Store a value and evict old entries if the cache is over its limits.
+
+        Args:
+            key (str): Key from make_key
+            value (Any): JSON-serializable result
+            model (str): Model identifier, kept for inspection
+        """
+        try:
+            now = time.time()
+            encoded = json.dumps(value)
+            conn = self._connection()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO llm_cache "
+                    "(key, model, value, size, created_at, expires_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (key, model, encoded, len(encoded), now, now + self.ttl_seconds, now)
+                )
+                self._evict(conn, now)
+
+        except sqlite3.Error as e:
+            self.logger.error(f"Error writing LLM cache: {str(e)}")
+
+    def _evict(self, conn: sqlite3.Connection, now: float):
+        """Drop expired entries, then least recently used ones until within limits."""
+        expired = conn.execute("DELETE FROM llm_cache WHERE expires_at <= ?", (now,)).rowcount
+        if expired:
+            self._count('expired', expired)
+
+        count, total_bytes = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache"
+        ).fetchone()
+        if count <= self.max_entries and total_bytes <= self.max_bytes:
+            return
+
+        evicted = 0
+        for key, size in conn.execute(
+            "SELECT key, size FROM llm_cache ORDER BY accessed_at ASC"
+        ).fetchall():
+            if count <= self.max_entries and total_bytes <= self.max_bytes:
+                break
+            conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+            count -= 1
+            total_bytes -= size
+            evicted += 1
+
+        self._count('evictions', evicted)
+
+    def clear(self):
+        """Remove every entry."""
+        with self._connection() as conn:
+            conn.execute("DELETE FROM llm_cache")
+
+    def stats(self) -> Dict:
+        """
+        Return hit/miss counters for this process and the size of the shared cache.
+
+        Returns:
+            Dict: Cache statistics
+        """
+        with self._stats_lock:
+            stats = dict(self._stats)
+
+        try:
+            count, total_bytes = self._connection().execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache"
+            ).fetchone()
+            stats.update({'entries': count, 'bytes': total_bytes})
+        except sqlite3.Error as e:
+            self.logger.error(f"Error reading LLM cache stats: {str(e)}")
+
+        return stats
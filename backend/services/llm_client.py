@@ -0,0 +1,186 @@
+import threading
+import logging
+from typing import Dict, Iterator, Optional
+from kg_gen.models import Graph
+from services.llm_cache import LLMResultCache
+from services.single_flight import SingleFlight
+from services.instrumentation import instrumentation
+
+
+class LLMClient:
+    """
+    Wrapper around the KG-Gen client used by the API endpoints.
+
+    Results of deterministic (temperature 0) calls are served from an
+    optional LLMResultCache; sampled calls always go to the model, so a
+    cached sample is not repeated forever. Cache hits and live model calls
+    are counted separately. Identical calls that are in flight at
+    the same time share one upstream request, and upstream requests are
+    capped at max_concurrent per process.
+    """
+
+    def __init__(self, kg, model: str, temperature: float, cache: Optional[LLMResultCache] = None,
+                 max_concurrent: int = 4, queue_timeout: Optional[float] = None):
+        """
+        Initialize the client.
+
+        Args:
+            kg: KGGen instance (or any object with the same interface)
+            model (str): Model identifier used by kg
+            temperature (float): Temperature kg was configured with
+            cache (Optional[LLMResultCache]): Result cache, or None to disable caching
+            max_concurrent (int): Maximum upstream calls running at once
+            queue_timeout (Optional[float]): Seconds to wait for a free slot; None waits indefinitely
+        """
+        self.kg = kg
+        self.model = model
+        self.temperature = temperature
+        self.cache = cache
+        self.flight = SingleFlight(max_concurrent=max_concurrent, queue_timeout=queue_timeout)
+        self.logger = logging.getLogger(__name__)
+
+        self._stats_lock = threading.Lock()
+        self._stats = {'live_calls': 0, 'cache_hits': 0, 'errors': 0}
+
+    def _cache_for(self, temperature: float) -> Optional[LLMResultCache]:
+        """The result cache if calls at this temperature may be cached, else None."""
+        return self.cache if temperature == 0 else None
+
+    def _count(self, name: str):
+        with self._stats_lock:
+            self._stats[name] += 1
+
+    def generate(self, input_data: str, context: str) -> Graph:
+        """
+        Extract entities and relations with KG-Gen.
+
+        Args:
+            input_data (str): Processed text to analyze
+            context (str): Instruction passed to KG-Gen
+
+        Returns:
+            Graph: KG-Gen result with entities, edges and relations
+        """
+        key = LLMResultCache.make_key(self.model, self.temperature, context, input_data)
+        cache = self._cache_for(self.temperature)
+        if cache is not None:
+            cached = cache.get(key)
+            if cached is not None:
+                self._count('cache_hits')
+                return Graph(
+                    entities=set(cached['entities']),
+                    edges=set(cached['edges']),
+                    relations={tuple(relation) for relation in cached['relations']}
+                )
+
+        def call() -> Graph:
+            try:
+                self._count('live_calls')
+                with instrumentation.stage('llm_generate'):
+                    result = self.kg.generate(input_data=input_data, context=context)
+            except Exception:
+                self._count('errors')
+                raise
+
+            # Cache before the in-flight entry is released so later callers hit it
+            if cache is not None:
+                cache.set(key, {
+                    'entities': sorted(result.entities),
+                    'edges': sorted(result.edges),
+                    'relations': sorted(list(relation) for relation in result.relations)
+                }, model=self.model)
+            return result
+
+        return self.flight.do(key, call)
+
+    def generate_text(self, prompt: str, generation_config: Dict) -> str:
+        """
+        Run a raw prompt through the underlying model.
+
+        Args:
+            prompt (str): Prompt text
+            generation_config (Dict): Generation settings such as temperature
+
+        Returns:
+            str: The model's response text
+        """
+        temperature = generation_config.get('temperature', self.temperature)
+        context = f"generate_content:{generation_config.get('max_output_tokens', '')}"
+        key = LLMResultCache.make_key(self.model, temperature, context, prompt)
+        cache = self._cache_for(temperature)
+        if cache is not None:
+            cached = cache.get(key)
+            if cached is not None:
+                self._count('cache_hits')
+                return cached['text']
+
+        def call() -> str:
+            try:
+                self._count('live_calls')
+                with instrumentation.stage('llm_generate_text'):
+                    response = self.kg.model.generate_content(prompt, generation_config=generation_config)
+                    text = response.text
+            except Exception:
+                self._count('errors')
+                raise
+
+            if cache is not None:
+                cache.set(key, {'text': text}, model=self.model)
+            return text
+
+        return self.flight.do(key, call)
+
+    def stream_text(self, prompt: str, generation_config: Dict) -> Iterator[str]:
+        """
+        Run a raw prompt and yield the response text as it arrives.
+
+        A cached response is yielded as a single piece. Streamed calls are not
+        coalesced, but they count against the concurrency limit while open.
+
+        Args:
+            prompt (str): Prompt text
+            generation_config (Dict): Generation settings such as temperature
+
+        Yields:
+            str: Successive pieces of the response text
+        """
+        temperature = generation_config.get('temperature', self.temperature)
+        context = f"generate_content:{generation_config.get('max_output_tokens', '')}"
+        key = LLMResultCache.make_key(self.model, temperature, context, prompt)
+        cache = self._cache_for(temperature)
+        if cache is not None:
+            cached = cache.get(key)
+            if cached is not None:
+                self._count('cache_hits')
+                yield cached['text']
+                return
+
+        pieces = []
+        with self.flight.slot():
+            try:
+                self._count('live_calls')
+                for chunk in self.kg.model.generate_content(
+                    prompt, generation_config=generation_config, stream=True
+                ):
+                    pieces.append(chunk.text)
+                    yield chunk.text
+            except Exception:
+                self._count('errors')
+                raise
+
+        if cache is not None:
+            cache.set(key, {'text': ''.join(pieces)}, model=self.model)
+
+    def stats(self) -> Dict:
+        """
+        Return call counters and, if enabled, cache statistics.
+
+        Returns:
+            Dict: Client statistics
+        """
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats['single_flight'] = self.flight.stats()
+        if self.cache is not None:
+            stats['cache'] = self.cache.stats()
+        return stats
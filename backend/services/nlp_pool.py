@@ -0,0 +1,135 @@
+import asyncio
+import multiprocessing
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+# Per-process state of pool workers, set up by _init_worker
+_processor = None
+
+
+def default_processor(window_size: int = 4, vector_store_path: Optional[str] = None,
+                      vector_dtype: str = 'float32'):
+    """Create the TextProcessor used by pool workers."""
+    from text_processor import TextProcessor
+    return TextProcessor(
+        window_size=window_size,
+        vector_store_path=vector_store_path,
+        vector_dtype=vector_dtype
+    )
+
+
+def _init_worker(factory: Callable, kwargs: Dict):
+    global _processor
+    _processor = factory(**kwargs)
+
+
+def _call(method: str, *args, **kwargs) -> Any:
+    """Run a TextProcessor method in a pool worker."""
+    return getattr(_processor, method)(*args, **kwargs)
+
+
+def _process_text(text: str, window_size: int, tokenization: Optional[str] = None,
+                  weighting: Optional[str] = None, progressive: bool = False,
+                  window_sizes: Optional[List[int]] = None) -> Dict:
+    """
+    Tokenize text and build its co-occurrence graph in a pool worker.
+
+    In progressive mode the graph leaves out DEFERRED_METRICS; with
+    window_sizes the counts for each window size are returned as well.
+    """
+    from services.graph_service import GraphService
+    from services.token_store import join_pair_keys
+
+    by_window = None
+    if window_sizes:
+        by_window = _processor.process_windows(
+            text, list(window_sizes) + [window_size], tokenization
+        )['cooccurrences_by_window']
+    result = _processor.process(text, window_size, tokenization, weighting)
+    graph_data = GraphService().build_graph(
+        tokens=result['tokens'],
+        cooccurrences=result['cooccurrences'],
+        weights=result.get('weights'),
+        progressive=progressive
+    )
+    response = {
+        'tokens': result['tokens'],
+        'cooccurrences': join_pair_keys(result['cooccurrences']),
+        'graph': graph_data
+    }
+    if by_window is not None:
+        response['cooccurrences_by_window'] = {
+            str(size): join_pair_keys(counts) for size, counts in by_window.items()
+        }
+    return response
+
+
+class NLPProcessPool:
+    """
+    Process pool that runs spaCy and graph work off the event loop.
+
+    Every worker loads its own TextProcessor once at startup. Workers are
+    spawned rather than forked, so the pool can be started from a process
+    that already runs threads; with a vector store configured they share
+    the word vectors through the page cache.
+    """
+
+    def __init__(self, max_workers: int = 2, factory: Callable = default_processor,
+                 factory_kwargs: Optional[Dict] = None):
+        """
+        Initialize the pool. Workers start on the first call.
+
+        Args:
+            max_workers (int): Number of worker processes
+            factory (Callable): Picklable callable returning the worker's processor
+            factory_kwargs (Optional[Dict]): Keyword arguments for the factory
+        """
+        self.max_workers = max_workers
+        self.factory = factory
+        self.factory_kwargs = factory_kwargs or {}
+        self.logger = logging.getLogger(__name__)
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker,
+                initargs=(self.factory, self.factory_kwargs)
+            )
+        return self._executor
+
+    async def run(self, fn: Callable, *args) -> Any:
+        """
+        Run a module-level function in a worker and await its result.
+
+        Args:
+            fn (Callable): Picklable function
+            *args: Picklable arguments
+
+        Returns:
+            Any: The function's return value
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, fn, *args)
+
+    async def call(self, method: str, *args) -> Any:
+        """Run a TextProcessor method in a worker and await its result."""
+        return await self.run(_call, method, *args)
+
+    async def process_text(self, text: str, window_size: int, tokenization: Optional[str] = None,
+                           weighting: Optional[str] = None, progressive: bool = False,
+                           window_sizes: Optional[List[int]] = None) -> Dict:
+        """Tokenize text and build its graph in a worker (see _process_text)."""
+        return await self.run(
+            _process_text, text, window_size, tokenization, weighting, progressive, window_sizes
+        )
+
+    def shutdown(self):
+        """Stop the workers."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,121 @@
+import gc
+import os
+import resource
+from typing import Dict, List, Optional
+
+
+def freeze_shared_state(nlp=None):
+    """
+    Prepare a preloaded master process for forking workers.
+
+    Marks the spaCy vector table read-only, so an accidental write fails
+    loudly instead of silently copying the pages into one worker, and moves
+    every object allocated so far into the GC's permanent generation. Without
+    gc.freeze() the first collection in each worker touches the reference
+    headers of the whole model and defeats copy-on-write sharing.
+
+    Args:
+        nlp: Loaded spaCy pipeline, if any
+    """
+    if nlp is not None:
+        data = getattr(nlp.vocab.vectors, 'data', None)
+        if hasattr(data, 'setflags'):
+            data.setflags(write=False)
+
+    gc.collect()
+    gc.freeze()
+
+
+def memory_usage(pid: Optional[int] = None) -> Dict[str, int]:
+    """
+    Return memory usage of a process in bytes.
+
+    On Linux this reads /proc/<pid>/smaps_rollup, which also reports how much
+    of the resident memory is shared with other processes (pss is the
+    process's proportional share). Elsewhere only the current process's peak
+    RSS is available.
+
+    Args:
+        pid (Optional[int]): Process id, the current process if omitted
+
+    Returns:
+        Dict[str, int]: rss, and where available pss, shared and private bytes
+    """
+    pid = pid or os.getpid()
+    fields = {
+        'Rss': 'rss',
+        'Pss': 'pss',
+        'Shared_Clean': 'shared',
+        'Shared_Dirty': 'shared',
+        'Private_Clean': 'private',
+        'Private_Dirty': 'private'
+    }
+
+    try:
+        usage = {}
+        with open(f'/proc/{pid}/smaps_rollup', 'r') as f:
+            for line in f:
+                name, _, value = line.partition(':')
+                if name in fields:
+                    key = fields[name]
+                    usage[key] = usage.get(key, 0) + int(value.split()[0]) * 1024
+        return usage
+    except OSError:
+        pass
+
+    if pid == os.getpid():
+        # ru_maxrss is in kilobytes on Linux and bytes on macOS
+        scale = 1 if os.uname().sysname == 'Darwin' else 1024
+        return {'rss': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale}
+    return {}
+
+
+def child_pids(pid: int) -> List[int]:
+    """
+    Return the child process ids of a process (Linux only).
+
+    Args:
+        pid (int): Parent process id
+
+    Returns:
+        List[int]: Child pids, empty if they cannot be determined
+    """
+    children = []
+    try:
+        for task in os.listdir(f'/proc/{pid}/task'):
+            with open(f'/proc/{pid}/task/{task}/children', 'r') as f:
+                children.extend(int(child) for child in f.read().split())
+    except OSError:
+        pass
+    return sorted(set(children))
+
+
+def worker_stats() -> Dict:
+    """
+    Collect memory usage for the master process and all of its workers.
+
+    Uses PREFORK_MASTER_PID, set by the pre-fork launcher; without it only
+    the current process is reported.
+
+    Returns:
+        Dict: current pid, master entry and one entry per worker
+    """
+    current = os.getpid()
+    master = os.getenv('PREFORK_MASTER_PID')
+
+    if not master:
+        return {
+            'pid': current,
+            'master': None,
+            'workers': [{'pid': current, **memory_usage(current)}]
+        }
+
+    master_pid = int(master)
+    workers = [{'pid': pid, **memory_usage(pid)} for pid in child_pids(master_pid)]
+    return {
+        'pid': current,
+        'master': {'pid': master_pid, **memory_usage(master_pid)},
+        'workers': workers,
+        'total_rss': sum(worker.get('rss', 0) for worker in workers),
+        'total_pss': sum(worker.get('pss', 0) for worker in workers)
+    }
@@ -0,0 +1,269 @@
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+
+SNIPPET_CHARS = 240
+
+
+class ProvenanceBuilder:
+    """
+    Collects the kept tokens of each document while it is processed.
+
+    Tokens are recorded with their character offsets and sentence, in
+    document order; build() turns them into a ProvenanceIndex.
+    """
+
+    def __init__(self):
+        self.document_ids: List[str] = []
+        self.documents: List[str] = []
+        self.lemma_ids: Dict[str, int] = {}
+        self._token_lemma: List[int] = []
+        self._token_doc: List[int] = []
+        self._token_start: List[int] = []
+        self._token_end: List[int] = []
+        self._token_sentence: List[int] = []
+        self._sentence_start: List[int] = []
+        self._sentence_end: List[int] = []
+        self._document_sentences: List[int] = [0]
+
+    def add_document(self, document_id: str, text: str, sentences: List[Tuple[int, int]],
+                     tokens: List[Tuple[str, int, int, int]]):
+        """
+        Record one document.
+
+        Args:
+            document_id (str): Identifier returned with its snippets
+            text (str): Document text
+            sentences (List[Tuple[int, int]]): Character span of every sentence
+            tokens (List[Tuple[str, int, int, int]]): Kept tokens as (lemma,
+                start char, end char, sentence number within the document)
+        """
+        doc = len(self.documents)
+        first_sentence = self._document_sentences[-1]
+        self.document_ids.append(document_id)
+        self.documents.append(text)
+
+        for start, end in sentences:
+            self._sentence_start.append(start)
+            self._sentence_end.append(end)
+        self._document_sentences.append(first_sentence + len(sentences))
+
+        for lemma, start, end, sentence in tokens:
+            lemma_id = self.lemma_ids.setdefault(lemma, len(self.lemma_ids))
+            self._token_lemma.append(lemma_id)
+            self._token_doc.append(doc)
+            self._token_start.append(start)
+            self._token_end.append(end)
+            self._token_sentence.append(first_sentence + sentence)
+
+    def build(self, window_size: int) -> 'ProvenanceIndex':
+        """
+        Build the index.
+
+        Args:
+            window_size (int): Co-occurrence window, in kept tokens, used for the pair postings
+
+        Returns:
+            ProvenanceIndex: The index
+        """
+        return ProvenanceIndex(
+            documents=self.documents,
+            document_ids=self.document_ids,
+            lemmas=list(self.lemma_ids),
+            token_lemma=np.array(self._token_lemma, dtype=np.int32),
+            token_doc=np.array(self._token_doc, dtype=np.int32),
+            token_start=np.array(self._token_start, dtype=np.int32),
+            token_end=np.array(self._token_end, dtype=np.int32),
+            token_sentence=np.array(self._token_sentence, dtype=np.int32),
+            sentence_start=np.array(self._sentence_start, dtype=np.int32),
+            sentence_end=np.array(self._sentence_end, dtype=np.int32),
+            document_sentences=np.array(self._document_sentences, dtype=np.int32),
+            window_size=window_size
+        )
+
+
+class ProvenanceIndex:
+    """
+    Inverted index from lemmas and co-occurring lemma pairs to the places
+    they occur.
+
+    Every kept token has a global position (documents are concatenated), so a
+    sorted array of positions is also sorted by document. Postings are stored
+    CSR-style: one sorted int32 position array with an offsets array per key.
+    Lemma postings are keyed by lemma id, pair postings by the sorted int64
+    key low_id * n_lemmas + high_id and found by binary search. A pair
+    posting holds the position of the earlier token and of its partner.
+    """
+
+    def __init__(self, documents: List[str], document_ids: List[str], lemmas: List[str],
+                 token_lemma: np.ndarray, token_doc: np.ndarray, token_start: np.ndarray,
+                 token_end: np.ndarray, token_sentence: np.ndarray, sentence_start: np.ndarray,
+                 sentence_end: np.ndarray, document_sentences: np.ndarray, window_size: int):
+        self.documents = documents
+        self.document_ids = document_ids
+        self.lemmas = lemmas
+        self.lemma_ids = {lemma: i for i, lemma in enumerate(lemmas)}
+        self.token_lemma = token_lemma
+        self.token_doc = token_doc
+        self.token_start = token_start
+        self.token_end = token_end
+        self.token_sentence = token_sentence
+        self.sentence_start = sentence_start
+        self.sentence_end = sentence_end
+        self.document_sentences = document_sentences
+        self.window_size = window_size
+
+        counts = np.bincount(token_lemma, minlength=len(lemmas))
+        self.lemma_offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+        self.lemma_positions = np.argsort(token_lemma, kind='stable').astype(np.int32)
+
+        self._build_pairs()
+
+    def _build_pairs(self):
+        n = len(self.token_lemma)
+        n_lemmas = max(len(self.lemmas), 1)
+        firsts, partners, keys = [], [], []
+        for distance in range(1, self.window_size + 1):
+            first = np.arange(max(n - distance, 0), dtype=np.int32)
+            partner = first + distance
+            low = self.token_lemma[first]
+            high = self.token_lemma[partner]
+            # Windows do not cross documents, and a lemma does not pair with itself
+            keep = (self.token_doc[first] == self.token_doc[partner]) & (low != high)
+            first, partner, low, high = first[keep], partner[keep], low[keep], high[keep]
+            firsts.append(first)
+            partners.append(partner)
+            keys.append(np.minimum(low, high).astype(np.int64) * n_lemmas + np.maximum(low, high))
+
+        first = np.concatenate(firsts) if firsts else np.zeros(0, dtype=np.int32)
+        partner = np.concatenate(partners) if partners else np.zeros(0, dtype=np.int32)
+        key = np.concatenate(keys) if keys else np.zeros(0, dtype=np.int64)
+
+        order = np.lexsort((first, key))
+        key = key[order]
+        self.pair_positions = first[order]
+        self.pair_partners = partner[order]
+        self.pair_keys, starts = np.unique(key, return_index=True)
+        self.pair_offsets = np.append(starts, len(key)).astype(np.int64)
+
+    def lemma_occurrences(self, lemma: str) -> np.ndarray:
+        """Sorted global positions of a lemma; empty if unknown."""
+        lemma_id = self.lemma_ids.get(lemma)
+        if lemma_id is None:
+            return self.lemma_positions[:0]
+        return self.lemma_positions[self.lemma_offsets[lemma_id]:self.lemma_offsets[lemma_id + 1]]
+
+    def pair_occurrences(self, a: str, b: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Occurrences of two lemmas within the window of each other.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Positions of the earlier token and
+                of its partner, sorted by position
+        """
+        a_id, b_id = self.lemma_ids.get(a), self.lemma_ids.get(b)
+        if a_id is None or b_id is None or a_id == b_id:
+            return self.pair_positions[:0], self.pair_partners[:0]
+
+        key = min(a_id, b_id) * len(self.lemmas) + max(a_id, b_id)
+        i = np.searchsorted(self.pair_keys, key)
+        if i == len(self.pair_keys) or self.pair_keys[i] != key:
+            return self.pair_positions[:0], self.pair_partners[:0]
+        start, end = self.pair_offsets[i], self.pair_offsets[i + 1]
+        return self.pair_positions[start:end], self.pair_partners[start:end]
+
+    def cooccurrences(self) -> Dict[Tuple[str, str], int]:
+        """Count of every co-occurring pair, in the shape GraphService.build_graph expects."""
+        n_lemmas = len(self.lemmas)
+        counts = np.diff(self.pair_offsets)
+        cooccurrences = {}
+        for key, count in zip(self.pair_keys.tolist(), counts.tolist()):
+            a, b = self.lemmas[key // n_lemmas], self.lemmas[key % n_lemmas]
+            cooccurrences[(a, b) if a < b else (b, a)] = count
+        return cooccurrences
+
+    def tokens(self) -> List[str]:
+        """All kept tokens in document order."""
+        return [self.lemmas[i] for i in self.token_lemma.tolist()]
+
+    def node_provenance(self, lemma: str, limit: int = 10) -> Dict:
+        """
+        Supporting snippets for a node.
+
+        Args:
+            lemma (str): Node id
+            limit (int): Maximum snippets returned
+
+        Returns:
+            Dict: Occurrence and document counts and up to limit snippets
+        """
+        positions = self.lemma_occurrences(lemma)
+        return self._provenance(positions, positions, limit)
+
+    def edge_provenance(self, a: str, b: str, limit: int = 10) -> Dict:
+        """
+        Supporting snippets for an edge.
+
+        Args:
+            a (str): Source node id
+            b (str): Target node id
+            limit (int): Maximum snippets returned
+
+        Returns:
+            Dict: Occurrence and document counts and up to limit snippets
+        """
+        positions, partners = self.pair_occurrences(a, b)
+        return self._provenance(positions, partners, limit)
+
+    def _provenance(self, positions: np.ndarray, partners: np.ndarray, limit: int) -> Dict:
+        snippets = []
+        last_span: Optional[Tuple[int, int]] = None
+        for position, partner in zip(positions.tolist(), partners.tolist()):
+            if len(snippets) >= limit:
+                break
+            span = (int(self.token_sentence[position]), int(self.token_sentence[partner]))
+            if span == last_span:
+                # Several matches in one sentence: highlight them in the same snippet
+                highlights = snippets[-1]['highlights']
+                highlights.extend(h for h in self._highlights(snippets[-1], position, partner) if h not in highlights)
+                highlights.sort()
+                continue
+            last_span = span
+            snippets.append(self._snippet(position, partner))
+
+        return {
+            'occurrences': len(positions),
+            'documents': len(np.unique(self.token_doc[positions])),
+            'snippets': snippets
+        }
+
+    def _snippet(self, position: int, partner: int) -> Dict:
+        doc = int(self.token_doc[position])
+        text = self.documents[doc]
+        start = int(self.sentence_start[self.token_sentence[position]])
+        end = int(self.sentence_end[self.token_sentence[partner]])
+
+        # Trim long sentences to a window around the match
+        match_start, match_end = int(self.token_start[position]), int(self.token_end[partner])
+        if end - start > SNIPPET_CHARS:
+            margin = max((SNIPPET_CHARS - (match_end - match_start)) // 2, 0)
+            start = max(start, match_start - margin)
+            end = min(end, match_end + margin)
+
+        snippet = {
+            'document': self.document_ids[doc],
+            'sentence': int(self.token_sentence[position] - self.document_sentences[doc]),
+            'start': start,
+            'end': end,
+            'text': text[start:end],
+            'highlights': []
+        }
+        snippet['highlights'] = self._highlights(snippet, position, partner)
+        return snippet
+
+    def _highlights(self, snippet: Dict, position: int, partner: int) -> List[List[int]]:
+        highlights = []
+        for i in sorted({position, partner}):
+            start, end = int(self.token_start[i]), int(self.token_end[i])
+            if snippet['start'] <= start and end <= snippet['end']:
+                highlights.append([start - snippet['start'], end - snippet['start']])
+        return highlights
@@ -0,0 +1,193 @@
+import os
+import sqlite3
+import threading
+import time
+import logging
+from typing import Dict, NamedTuple, Optional, Tuple
+
+
+class RateLimitResult(NamedTuple):
+    allowed: bool
+    retry_after: float
+    remaining: int
+
+
+class MemoryBackend:
+    """
+    In-process store for GCRA state, one timestamp per client key.
+
+    Limits hold per process only; use SQLiteBackend to share them between
+    worker processes.
+    """
+
+    def __init__(self, max_keys: int = 100000):
+        """
+        Initialize the store.
+
+        Args:
+            max_keys (int): Number of keys kept before idle ones are swept
+        """
+        self.max_keys = max_keys
+        self._tats: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, key: str, now: float, increment: float, tolerance: float) -> Tuple[bool, float]:
+        """
+        Atomically apply one GCRA step for a key.
+
+        Args:
+            key (str): Client key
+            now (float): Current time
+            increment (float): Emission interval times request cost
+            tolerance (float): Burst tolerance in seconds
+
+        Returns:
+            Tuple[bool, float]: Whether the request is allowed, and the key's
+                theoretical arrival time after the step
+        """
+        with self._lock:
+            tat = max(self._tats.get(key, now), now)
+            new_tat = tat + increment
+            if new_tat - tolerance > now:
+                return False, tat
+
+            if len(self._tats) >= self.max_keys and key not in self._tats:
+                self._sweep(now)
+            self._tats[key] = new_tat
+            return True, new_tat
+
+    def _sweep(self, now: float):
+        """Forget keys whose budget is fully replenished. Caller holds the lock."""
+        idle = [key for key, tat in self._tats.items() if tat <= now]
+        for key in idle:
+            del self._tats[key]
+
+    def reset(self):
+        with self._lock:
+            self._tats.clear()
+
+
+class SQLiteBackend:
+    """
+    GCRA state shared by every process that opens the same SQLite file.
+
+    Each step is one short IMMEDIATE transaction on a single row, so the
+    check-and-update is atomic across processes.
+    """
+
+    def __init__(self, path: str, sweep_every: int = 1000):
+        """
+        Initialize the store and create its table.
+
+        Args:
+            path (str): SQLite database file
+            sweep_every (int): Delete idle keys once per this many requests
+        """
+        self.path = path
+        self.sweep_every = sweep_every
+        self._local = threading.local()
+        self._calls = 0
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connection() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS rate_limit (key TEXT PRIMARY KEY, tat REAL NOT NULL)"
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use in each process."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def acquire(self, key: str, now: float, increment: float, tolerance: float) -> Tuple[bool, float]:
+        """Atomically apply one GCRA step for a key; see MemoryBackend.acquire."""
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT tat FROM rate_limit WHERE key = ?", (key,)).fetchone()
+            tat = max(row[0] if row else now, now)
+            new_tat = tat + increment
+            if new_tat - tolerance > now:
+                conn.execute("COMMIT")
+                return False, tat
+
+            conn.execute(
+                "INSERT OR REPLACE INTO rate_limit (key, tat) VALUES (?, ?)", (key, new_tat)
+            )
+            self._calls += 1
+            if self._calls % self.sweep_every == 0:
+                conn.execute("DELETE FROM rate_limit WHERE tat <= ?", (now,))
+            conn.execute("COMMIT")
+            return True, new_tat
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def reset(self):
+        self._connection().execute("DELETE FROM rate_limit")
+
+
+class GCRARateLimiter:
+    """
+    Per-client rate limiter using the generic cell rate algorithm.
+
+    GCRA is a token bucket that stores a single timestamp per client: the
+    time at which the client's bucket would be full again. A request of a
+    given cost advances that time by cost * period / limit and is refused if
+    it would move more than one period into the future. Each check is O(1).
+    """
+
+    def __init__(self, limit: int, period: float = 60.0, backend=None):
+        """
+        Initialize the limiter.
+
+        Args:
+            limit (int): Budget units per period, also the maximum burst
+            period (float): Period in seconds
+            backend: MemoryBackend or SQLiteBackend; in-memory if omitted
+        """
+        self.limit = limit
+        self.period = period
+        self.backend = backend or MemoryBackend()
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def emission_interval(self) -> float:
+        return self.period / self.limit
+
+    def hit(self, key: str, cost: float = 1, now: Optional[float] = None) -> RateLimitResult:
+        """
+        Charge a request against a client's budget.
+
+        Args:
+            key (str): Client identity
+            cost (float): Budget units the request uses
+            now (Optional[float]): Current time, for tests
+
+        Returns:
+            RateLimitResult: Whether the request is allowed, seconds until it
+                would be, and the remaining budget
+        """
+        now = time.time() if now is None else now
+        interval = self.emission_interval
+        # A little slack so float rounding never refuses the last request of a burst
+        tolerance = self.period + 1e-6
+        try:
+            allowed, tat = self.backend.acquire(key, now, interval * cost, tolerance)
+        except sqlite3.Error as e:
+            # A broken shared store must not take the API down; fail open
+            self.logger.error(f"Error checking rate limit: {str(e)}")
+            return RateLimitResult(True, 0.0, 0)
+        remaining = max(0, int((now + tolerance - tat) // interval))
+
+        if not allowed:
+            retry_after = tat + interval * cost - tolerance - now
+            return RateLimitResult(False, max(retry_after, 0.0), remaining)
+
+        return RateLimitResult(True, 0.0, remaining)
@@ -0,0 +1,108 @@
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls that share a key.
+
+    The first caller for a key runs the function; callers arriving while it is
+    in flight wait and receive the same result (or exception). Execution is
+    additionally capped at max_concurrent running functions per process;
+    further callers queue until a slot frees up.
+    """
+
+    def __init__(self, max_concurrent: int = 4, queue_timeout: Optional[float] = None):
+        """
+        Initialize the single-flight group.
+
+        Args:
+            max_concurrent (int): Maximum number of functions running at once
+            queue_timeout (Optional[float]): Seconds to wait for a slot; None waits indefinitely
+        """
+        self.queue_timeout = queue_timeout
+        self._semaphore = threading.BoundedSemaphore(max_concurrent)
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        self._stats = {'executed': 0, 'coalesced': 0, 'queue_timeouts': 0}
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """
+        Run fn once per key among concurrent callers.
+
+        Args:
+            key (str): Identity of the call
+            fn (Callable[[], Any]): Function to run if no identical call is in flight
+
+        Returns:
+            Any: The result of fn
+
+        Raises:
+            TimeoutError: If no execution slot became free within queue_timeout
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self._stats['coalesced'] += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            with self.slot():
+                with self._lock:
+                    self._stats['executed'] += 1
+                call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+        return call.result
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        """
+        Hold one of the max_concurrent execution slots.
+
+        Used directly for calls that cannot be shared, such as streamed responses.
+
+        Raises:
+            TimeoutError: If no slot became free within queue_timeout
+        """
+        if not self._semaphore.acquire(timeout=self.queue_timeout):
+            with self._lock:
+                self._stats['queue_timeouts'] += 1
+            raise TimeoutError("Too many concurrent LLM calls; try again later")
+        try:
+            yield
+        finally:
+            self._semaphore.release()
+
+    def stats(self) -> Dict:
+        """
+        Return execution counters.
+
+        Returns:
+            Dict: Executed calls, coalesced waiters, queue timeouts and calls in flight
+        """
+        with self._lock:
+            return {**self._stats, 'in_flight': len(self._calls)}
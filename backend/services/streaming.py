@@ -0,0 +1,86 @@
+import json
+import re
+from typing import Any, Dict, Iterable, List, Tuple
+
+
+def format_sse(event: str, data: Any) -> str:
+    """
+    Format one Server-Sent Events message.
+
+    Args:
+        event (str): Event name
+        data (Any): JSON-serializable payload
+
+    Returns:
+        str: The encoded message, terminated by a blank line
+    """
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+class JsonArrayStreamParser:
+    """
+    Pull complete items out of JSON arrays while the document is still arriving.
+
+    Given text such as '{"nodes": [{"id": "a"}, {"id": "b' the parser yields
+    ('nodes', {"id": "a"}) as soon as that item is complete, without waiting
+    for the rest of the document. Code fences and surrounding prose are
+    ignored because only the named arrays are scanned.
+    """
+
+    def __init__(self, keys: Iterable[str]):
+        """
+        Initialize the parser.
+
+        Args:
+            keys (Iterable[str]): Names of the arrays to extract items from
+        """
+        self._buffer = ''
+        self._decoder = json.JSONDecoder()
+        self._patterns = {key: re.compile(r'"%s"\s*:\s*\[' % re.escape(key)) for key in keys}
+        # Scan position inside each array, None until the array has been found
+        self._positions: Dict[str, int] = {}
+        self._finished = set()
+
+    def feed(self, text: str) -> List[Tuple[str, Any]]:
+        """
+        Add text and return the items completed by it.
+
+        Args:
+            text (str): Next piece of the streamed document
+
+        Returns:
+            List[Tuple[str, Any]]: (array name, item) pairs, in order within each array
+        """
+        self._buffer += text
+        items = []
+
+        for key, pattern in self._patterns.items():
+            if key in self._finished:
+                continue
+
+            if key not in self._positions:
+                match = pattern.search(self._buffer)
+                if match is None:
+                    continue
+                self._positions[key] = match.end()
+
+            position = self._positions[key]
+            while True:
+                while position < len(self._buffer) and self._buffer[position] in ' \t\r\n,':
+                    position += 1
+                if position >= len(self._buffer):
+                    break
+                if self._buffer[position] == ']':
+                    self._finished.add(key)
+                    break
+                try:
+                    item, end = self._decoder.raw_decode(self._buffer, position)
+                except json.JSONDecodeError:
+                    # The item is still incomplete; wait for more text
+                    break
+                items.append((key, item))
+                position = end
+
+            self._positions[key] = position
+
+        return items
@@ -0,0 +1,126 @@
+import json
+import random
+import threading
+import time
+from typing import Dict, Iterator, List, Optional
+from kg_gen.models import Graph
+
+
+class StubResponse:
+    """Minimal stand-in for a model response object."""
+
+    def __init__(self, text: str):
+        self.text = text
+
+
+class StubModel:
+    """
+    Stand-in for kg.model: answers raw prompts with canned JSON.
+
+    The same reply serves both prompt types the app sends: it has the
+    label/summary of a cluster summary and the nodes/edges of an expansion.
+    """
+
+    def __init__(self, stub: 'StubKGGen'):
+        self.stub = stub
+
+    def generate_content(self, prompt: str, generation_config: Optional[Dict] = None, stream: bool = False):
+        text = json.dumps(self.stub.text_output(prompt))
+        if not stream:
+            self.stub.wait()
+            return StubResponse(text)
+        return self._stream(text)
+
+    def _stream(self, text: str) -> Iterator[StubResponse]:
+        pieces = max(1, self.stub.stream_pieces)
+        size = max(1, len(text) // pieces + 1)
+        for start in range(0, len(text), size):
+            self.stub.wait(1.0 / pieces)
+            yield StubResponse(text[start:start + size])
+
+
+class StubKGGen:
+    """
+    Local replacement for KGGen for load tests and development without an API key.
+
+    generate() returns entities taken from the input (or canned ones) after a
+    configurable latency, so the rest of the pipeline does real work while
+    no external API is called. Calls can be made to fail at a given rate.
+    """
+
+    def __init__(self, latency: float = 0.5, jitter: float = 0.0, error_rate: float = 0.0,
+                 entities_per_call: int = 8, output: Optional[Dict] = None,
+                 stream_pieces: int = 5, seed: int = 0):
+        """
+        Initialize the stub.
+
+        Args:
+            latency (float): Seconds each call takes
+            jitter (float): Extra uniformly random seconds, from 0 to jitter
+            error_rate (float): Fraction of calls that raise
+            entities_per_call (int): Entities taken from the input when there is no canned output
+            output (Optional[Dict]): Canned 'entities', 'edges' and 'relations' for every call
+            stream_pieces (int): Pieces a streamed response is split into
+            seed (int): Random seed for jitter and errors
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.entities_per_call = entities_per_call
+        self.output = output
+        self.stream_pieces = stream_pieces
+        self.model = StubModel(self)
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def wait(self, fraction: float = 1.0):
+        """Sleep for the configured latency and raise for injected errors."""
+        with self._lock:
+            extra = self._random.uniform(0, self.jitter) if self.jitter else 0.0
+            fail = self._random.random() < self.error_rate
+        time.sleep((self.latency + extra) * fraction)
+        if fail:
+            raise RuntimeError("Stub LLM error (injected)")
+
+    def generate(self, input_data: str, context: str = '', **kwargs) -> Graph:
+        """
+        Return a knowledge graph for the input like KGGen.generate.
+
+        Args:
+            input_data (str): Text or tokens to extract from
+            context (str): Ignored
+
+        Returns:
+            Graph: Canned entities and relations, or a chain over the input's first words
+        """
+        self.wait()
+        if self.output is not None:
+            return Graph(
+                entities=set(self.output.get('entities', [])),
+                edges=set(self.output.get('edges', [])),
+                relations={tuple(relation) for relation in self.output.get('relations', [])}
+            )
+
+        entities = list(dict.fromkeys(word for word in input_data.split() if len(word) > 3))
+        entities = entities[:self.entities_per_call]
+        relations = {(a, 'related to', b) for a, b in zip(entities, entities[1:])}
+        return Graph(
+            entities=set(entities),
+            edges={'related to'} if relations else set(),
+            relations=relations
+        )
+
+    def text_output(self, prompt: str) -> Dict:
+        """Canned JSON reply for a raw prompt."""
+        words: List[str] = [word.strip('",.:[]{}') for word in prompt.split()[-40:]]
+        words = [word for word in dict.fromkeys(words) if word.isalpha()][:3] or ['concept']
+        nodes = [{'id': f'detail{i + 1}', 'label': f'Detail of {word}'} for i, word in enumerate(words)]
+        return {
+            'label': ' '.join(words).title(),
+            'summary': f"Stub summary about {', '.join(words)}.",
+            'nodes': nodes,
+            'edges': [
+                {'source': a['id'], 'target': b['id'], 'label': 'refines'}
+                for a, b in zip(nodes, nodes[1:])
+            ]
+        }
@@ -0,0 +1,238 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from services.association import association_weights
+
+
+def join_pair_keys(cooccurrences: Dict[Tuple[str, str], int]) -> Dict[str, int]:
+    """Co-occurrence counts keyed by 'a_b' strings, as the JSON API returns them."""
+    return {f"{a}_{b}": count for (a, b), count in cooccurrences.items()}
+
+
+class PositionalTokens:
+    """
+    Kept tokens of one document as vocabulary ids in document order.
+
+    The vocabulary is sorted, so comparing ids compares the tokens. Pairs are
+    encoded as the int64 key low_id * n_vocabulary + high_id; the counts for
+    a window are computed with one array pass per distance and kept for the
+    last few windows asked for, as are their association weights.
+    """
+
+    def __init__(self, tokens: List[str], cached_windows: int = 8):
+        """
+        Initialize the store.
+
+        Args:
+            tokens (List[str]): Kept tokens in document order
+            cached_windows (int): Number of window sizes whose counts are kept
+        """
+        self.tokens = list(tokens)
+        vocabulary, ids = np.unique(np.array(self.tokens, dtype=str), return_inverse=True)
+        self.vocabulary: List[str] = vocabulary.tolist()
+        self.ids = ids.astype(np.int32).reshape(-1)
+        self.cached_windows = cached_windows
+        self._counts: 'OrderedDict[int, Tuple[np.ndarray, np.ndarray]]' = OrderedDict()
+        self._weights: 'OrderedDict[Tuple[int, str], np.ndarray]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _pair_keys(self, max_distance: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Key and distance of every token pair up to max_distance apart, self pairs excluded."""
+        n_vocabulary = max(len(self.vocabulary), 1)
+        keys, distances = [], []
+        for distance in range(1, min(max_distance, len(self.ids) - 1) + 1):
+            first, second = self.ids[:-distance], self.ids[distance:]
+            keep = first != second
+            first, second = first[keep], second[keep]
+            keys.append(np.minimum(first, second).astype(np.int64) * n_vocabulary + np.maximum(first, second))
+            distances.append(np.full(len(first), distance, dtype=np.int32))
+        if not keys:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int32)
+        return np.concatenate(keys), np.concatenate(distances)
+
+    def _window_counts(self, window_size: int) -> Tuple[np.ndarray, np.ndarray]:
+        with self._lock:
+            counts = self._counts.get(window_size)
+            if counts is not None:
+                self._counts.move_to_end(window_size)
+                return counts
+
+        keys, _ = self._pair_keys(window_size)
+        counts = np.unique(keys, return_counts=True)
+        self._remember(window_size, counts)
+        return counts
+
+    def _remember(self, window_size: int, counts: Tuple[np.ndarray, np.ndarray]):
+        with self._lock:
+            self._counts[window_size] = counts
+            self._counts.move_to_end(window_size)
+            while len(self._counts) > self.cached_windows:
+                self._counts.popitem(last=False)
+
+    def weights(self, window_size: int, weighting: str) -> np.ndarray:
+        """
+        Edge weights of the co-occurring pairs of a window.
+
+        Args:
+            window_size (int): Co-occurrence window in kept tokens
+            weighting (str): One of services.association.WEIGHTINGS
+
+        Returns:
+            np.ndarray: Weights aligned with the pairs of cooccurrences(window_size)
+        """
+        with self._lock:
+            weights = self._weights.get((window_size, weighting))
+        if weights is not None:
+            return weights
+
+        keys, counts = self._window_counts(window_size)
+        n_vocabulary = max(len(self.vocabulary), 1)
+        weights = association_weights(
+            keys // n_vocabulary, keys % n_vocabulary, counts, n_vocabulary, weighting
+        )
+        with self._lock:
+            self._weights[(window_size, weighting)] = weights
+            while len(self._weights) > self.cached_windows:
+                self._weights.popitem(last=False)
+        return weights
+
+    def _to_dict(self, keys: np.ndarray, counts: np.ndarray) -> Dict[Tuple[str, str], int]:
+        n_vocabulary = max(len(self.vocabulary), 1)
+        vocabulary = self.vocabulary
+        return {
+            (vocabulary[key // n_vocabulary], vocabulary[key % n_vocabulary]): count
+            for key, count in zip(keys.tolist(), counts.tolist())
+        }
+
+    def cooccurrences(self, window_size: int) -> Dict[Tuple[str, str], int]:
+        """
+        Count co-occurring token pairs.
+
+        Every token is paired with the window_size tokens after it, so each
+        occurrence of an unordered pair is counted once.
+
+        Args:
+            window_size (int): Co-occurrence window in kept tokens
+
+        Returns:
+            Dict[Tuple[str, str], int]: Counts keyed by sorted token pairs
+        """
+        return self._to_dict(*self._window_counts(window_size))
+
+    def cooccurrences_by_window(self, window_sizes: Iterable[int]) -> Dict[int, Dict[Tuple[str, str], int]]:
+        """
+        Count co-occurring token pairs for several window sizes in one pass.
+
+        The pairs of the largest window are counted per distance into a
+        (pairs x distances) matrix; its running sum along the distances gives
+        the counts of every smaller window. No pair is further apart than the
+        document is long, so windows beyond that share its counts.
+
+        Args:
+            window_sizes (Iterable[int]): Window sizes
+
+        Returns:
+            Dict[int, Dict[Tuple[str, str], int]]: Counts per window size
+        """
+        window_sizes = sorted(set(window_sizes))
+        if not window_sizes:
+            return {}
+
+        largest = max(1, min(window_sizes[-1], len(self.ids) - 1))
+        keys, distances = self._pair_keys(largest)
+        unique_keys, inverse = np.unique(keys, return_inverse=True)
+        by_distance = np.bincount(
+            inverse.reshape(-1) * largest + (distances - 1),
+            minlength=len(unique_keys) * largest
+        ).reshape(len(unique_keys), largest)
+        cumulative = np.cumsum(by_distance, axis=1)
+
+        result = {}
+        for window_size in window_sizes:
+            counts = cumulative[:, min(window_size, largest) - 1]
+            present = counts > 0
+            window_counts = (unique_keys[present], counts[present])
+            self._remember(window_size, window_counts)
+            result[window_size] = self._to_dict(*window_counts)
+        return result
+
+
+class TokenStore:
+    """
+    Bounded LRU store of PositionalTokens keyed by a hash of the text.
+
+    Lets a document be re-windowed without running it through spaCy again.
+    Tokens of the same text produced differently (e.g. by another
+    tokenization mode) are stored under their own variant. The store lives
+    in one process; every worker process has its own.
+    """
+
+    def __init__(self, max_documents: int = 32):
+        """
+        Initialize the store.
+
+        Args:
+            max_documents (int): Number of documents kept; 0 disables the store
+        """
+        self.max_documents = max_documents
+        self._documents: 'OrderedDict[str, PositionalTokens]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def key(text: str, variant: str = '') -> str:
+        return hashlib.sha256(f'{variant}\0{text}'.encode('utf-8')).hexdigest()
+
+    def __contains__(self, text: str) -> bool:
+        return self.contains(text)
+
+    def contains(self, text: str, variant: str = '') -> bool:
+        with self._lock:
+            return self.key(text, variant) in self._documents
+
+    def get(self, text: str, variant: str = '') -> Optional[PositionalTokens]:
+        """Stored tokens of a text, or None."""
+        key = self.key(text, variant)
+        with self._lock:
+            tokens = self._documents.get(key)
+            if tokens is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+            self._documents.move_to_end(key)
+            return tokens
+
+    def put(self, text: str, tokens: List[str], variant: str = '') -> PositionalTokens:
+        """
+        Store the kept tokens of a text.
+
+        Args:
+            text (str): Document text
+            tokens (List[str]): Its kept tokens in order
+            variant (str): How the tokens were produced
+
+        Returns:
+            PositionalTokens: The stored tokens
+        """
+        positional = PositionalTokens(tokens)
+        if self.max_documents <= 0:
+            return positional
+        key = self.key(text, variant)
+        with self._lock:
+            self._documents[key] = positional
+            self._documents.move_to_end(key)
+            while len(self._documents) > self.max_documents:
+                self._documents.popitem(last=False)
+        return positional
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'documents': len(self._documents),
+                'max_documents': self.max_documents,
+                'hits': self._hits,
+                'misses': self._misses
+            }
@@ -0,0 +1,218 @@
+import json
+import os
+import shutil
+import tempfile
+import logging
+import numpy as np
+from typing import Iterable, List, Optional, Tuple
+from spacy.strings import hash_string
+
+MATRIX_FILE = 'vectors.npy'
+KEYS_FILE = 'keys.npy'
+ROWS_FILE = 'rows.npy'
+MANIFEST_FILE = 'manifest.json'
+
+SUPPORTED_DTYPES = ('float32', 'float16')
+
+
+def build_vector_store(nlp, path: str, dtype: str = 'float32') -> str:
+    """
+    Export a spaCy pipeline's word vectors to a memory-mappable store.
+
+    The vector matrix is written in spaCy's own row order, next to a sorted
+    array of string hashes and the row each hash maps to. The files are
+    written to a temporary directory and moved into place, so concurrent
+    workers never see a partial store.
+
+    Args:
+        nlp: Loaded spaCy pipeline with vectors
+        path (str): Directory to write the store to
+        dtype (str): 'float32', or 'float16' to halve the size
+
+    Returns:
+        str: The store directory
+
+    Raises:
+        ValueError: If the dtype is unsupported or the pipeline has no vectors
+    """
+    if dtype not in SUPPORTED_DTYPES:
+        raise ValueError(f"Unsupported vector dtype: {dtype}")
+
+    vectors = nlp.vocab.vectors
+    if not vectors.key2row:
+        raise ValueError("Pipeline has no word vectors")
+
+    keys = np.fromiter(vectors.key2row.keys(), dtype=np.uint64, count=len(vectors.key2row))
+    rows = np.fromiter(vectors.key2row.values(), dtype=np.int32, count=len(vectors.key2row))
+    order = np.argsort(keys)
+    matrix = np.asarray(vectors.data, dtype=dtype)
+
+    parent = os.path.dirname(os.path.abspath(path))
+    os.makedirs(parent, exist_ok=True)
+    temp_dir = tempfile.mkdtemp(dir=parent, prefix='.vectors-')
+    try:
+        np.save(os.path.join(temp_dir, MATRIX_FILE), matrix)
+        np.save(os.path.join(temp_dir, KEYS_FILE), keys[order])
+        np.save(os.path.join(temp_dir, ROWS_FILE), rows[order])
+        with open(os.path.join(temp_dir, MANIFEST_FILE), 'w') as f:
+            json.dump({
+                'model': nlp.meta.get('name', ''),
+                'version': nlp.meta.get('version', ''),
+                'dtype': dtype,
+                'shape': list(matrix.shape),
+                'keys': int(len(keys))
+            }, f)
+
+        # Swap the new store in; readers holding maps of the old files keep them
+        if os.path.exists(path):
+            old_dir = tempfile.mkdtemp(dir=parent, prefix='.vectors-old-')
+            os.rmdir(old_dir)
+            os.replace(path, old_dir)
+            os.replace(temp_dir, path)
+            shutil.rmtree(old_dir, ignore_errors=True)
+        else:
+            os.replace(temp_dir, path)
+    except Exception:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        raise
+
+    return path
+
+
+class VectorStore:
+    """
+    Read-only word-vector table backed by memory-mapped .npy files.
+
+    The matrix is mapped, not loaded, so every process that opens the same
+    store shares one copy of it through the OS page cache. Words are looked
+    up by their spaCy string hash with a binary search over the sorted key
+    array; single lookups return a view into the mapped matrix.
+    """
+
+    def __init__(self, path: str):
+        """
+        Open a store written by build_vector_store.
+
+        Args:
+            path (str): Store directory
+        """
+        self.path = path
+        self.logger = logging.getLogger(__name__)
+
+        with open(os.path.join(path, MANIFEST_FILE), 'r') as f:
+            self.manifest = json.load(f)
+
+        self.matrix = np.load(os.path.join(path, MATRIX_FILE), mmap_mode='r')
+        self.keys = np.load(os.path.join(path, KEYS_FILE), mmap_mode='r')
+        self.rows = np.load(os.path.join(path, ROWS_FILE), mmap_mode='r')
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return tuple(self.matrix.shape)
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self.matrix.dtype
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __contains__(self, word: str) -> bool:
+        return self.row_of(word) is not None
+
+    def row_of(self, word: str) -> Optional[int]:
+        """Return the matrix row of a word, or None if it has no vector."""
+        rows = self.rows_of([word])
+        return int(rows[0]) if rows[0] >= 0 else None
+
+    def rows_of(self, words: Iterable[str]) -> np.ndarray:
+        """
+        Look up the matrix rows of several words.
+
+        Args:
+            words (Iterable[str]): Words, matched case-sensitively like spaCy
+
+        Returns:
+            np.ndarray: Row index per word, -1 where the word has no vector
+        """
+        hashes = np.fromiter((hash_string(word) for word in words), dtype=np.uint64)
+        if not len(hashes) or not len(self.keys):
+            return np.full(len(hashes), -1, dtype=np.int64)
+
+        positions = np.searchsorted(self.keys, hashes)
+        positions = np.minimum(positions, len(self.keys) - 1)
+        found = self.keys[positions] == hashes
+        return np.where(found, self.rows[positions], -1).astype(np.int64)
+
+    def vector(self, word: str) -> Optional[np.ndarray]:
+        """
+        Return a word's vector as a read-only view into the mapped matrix.
+
+        Args:
+            word (str): Word to look up
+
+        Returns:
+            Optional[np.ndarray]: The vector, or None if the word has no vector
+        """
+        row = self.row_of(word)
+        return None if row is None else self.matrix[row]
+
+    def gather(self, words: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Gather the vectors of several words in one batch.
+
+        Args:
+            words (List[str]): Words to look up
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: float32 matrix with one row per word
+                (zeros where missing) and a boolean mask of the words found
+        """
+        rows = self.rows_of(words)
+        found = rows >= 0
+        vectors = np.zeros((len(rows), self.matrix.shape[1]), dtype=np.float32)
+        if found.any():
+            vectors[found] = self.matrix[rows[found]]
+        return vectors, found
+
+    def attach(self, nlp) -> bool:
+        """
+        Point a spaCy pipeline's vector table at the mapped matrix.
+
+        This releases the pipeline's heap copy of the vectors; token.vector
+        and doc.vector keep working and read from the shared mapping. Only a
+        float32 store built from the same pipeline can be attached.
+
+        Args:
+            nlp: Loaded spaCy pipeline
+
+        Returns:
+            bool: True if the store was attached
+        """
+        vectors = nlp.vocab.vectors
+        if self.matrix.dtype != np.float32 or tuple(vectors.shape) != self.shape:
+            self.logger.warning(
+                f"Vector store {self.path} ({self.matrix.dtype}, {self.shape}) "
+                f"does not match the pipeline vectors {tuple(vectors.shape)}; not attaching"
+            )
+            return False
+
+        vectors.data = self.matrix
+        return True
+
+
+def open_vector_store(nlp, path: str, dtype: str = 'float32') -> VectorStore:
+    """
+    Open the store at path, building it from the pipeline first if missing.
+
+    Args:
+        nlp: Loaded spaCy pipeline with vectors
+        path (str): Store directory
+        dtype (str): dtype used if the store has to be built
+
+    Returns:
+        VectorStore: The opened store
+    """
+    if not os.path.exists(os.path.join(path, MANIFEST_FILE)):
+        build_vector_store(nlp, path, dtype=dtype)
+    return VectorStore(path)
@@ -0,0 +1,43 @@
+import os
+import pytest
+import spacy
+from services.graph_service import GraphService
+from text_processor import TextProcessor
+
+# Tests that import the app must not read or write a persistent LLM cache
+os.environ['LLM_CACHE_ENABLED'] = 'false'
+
+@pytest.fixture
+def make_processor():
+    """TextProcessor on a blank English pipeline, with only the given stop words."""
+    def make(stop_words=(), **kwargs):
+        processor = TextProcessor(nlp=spacy.blank('en'), **kwargs)
+        processor.stop_words = set(stop_words)
+        return processor
+    return make
+
+@pytest.fixture
+def sample_graph():
+    """Tokens and co-occurrence counts of a small graph: a path and a separate edge."""
+    tokens = ["quick", "brown", "fox", "jump", "lazy", "dog"]
+    cooccurrences = {
+        ("brown", "quick"): 3,
+        ("brown", "fox"): 2,
+        ("fox", "jump"): 1,
+        ("dog", "lazy"): 4,
+        ("jump", "lazy"): 1
+    }
+    return tokens, cooccurrences
+
+@pytest.fixture
+def make_graph_service(sample_graph):
+    """GraphService holding sample_graph; keyword arguments go to GraphService."""
+    def make(progressive=False, **kwargs):
+        service = GraphService(**kwargs)
+        service.build_graph(*sample_graph, progressive=progressive)
+        return service
+    return make
+
+@pytest.fixture
+def graph_service(make_graph_service):
+    return make_graph_service()
@@ -0,0 +1,100 @@
+import threading
+import time
+import pytest
+from services.admission import (
+    AdmissionController, OverloadedError, RequestTooLargeError,
+    estimate_graph_cost, estimate_text_cost, PARSE_COST
+)
+
+def test_text_cost_grows_with_window_size():
+    text = ' '.join(f'word{i % 200}' for i in range(2000))
+    assert estimate_text_cost(text, 8) > estimate_text_cost(text, 2)
+    assert estimate_text_cost('', 4) == 0
+
+def test_text_cost_includes_parse_and_betweenness():
+    # 3 tokens, 3 distinct words, 12 pairs capped at the 3 possible edges
+    assert estimate_text_cost('a b c', 2) == 3 * PARSE_COST + 12 + 3 * (3 + 3)
+
+def test_graph_cost():
+    assert estimate_graph_cost(10, 20) == 300
+    assert estimate_graph_cost(10, 20, with_betweenness=False) == 30
+
+def test_rejects_requests_above_the_limit():
+    controller = AdmissionController(capacity=100, max_request_cost=150)
+    with pytest.raises(RequestTooLargeError) as error:
+        controller.acquire(151)
+
+    assert error.value.limit == 150
+    assert controller.stats()['rejected_too_large'] == 1
+
+def test_request_larger_than_capacity_runs_alone():
+    controller = AdmissionController(capacity=100, max_request_cost=500, queue_timeout=0.05)
+    with controller.admit(400):
+        assert controller.stats()['in_use'] == 100
+        with pytest.raises(OverloadedError):
+            controller.acquire(1)
+
+def test_concurrent_cost_is_capped():
+    controller = AdmissionController(capacity=100, queue_timeout=0.05)
+    first = controller.acquire(60)
+    second = controller.acquire(40)
+
+    with pytest.raises(OverloadedError) as error:
+        controller.acquire(10)
+    assert error.value.retry_after >= 1
+
+    controller.release(first)
+    controller.release(second)
+    assert controller.stats()['in_use'] == 0
+
+def test_waiters_are_admitted_when_capacity_frees():
+    controller = AdmissionController(capacity=100, queue_timeout=5)
+    units = controller.acquire(100)
+    admitted = threading.Event()
+
+    def wait():
+        with controller.admit(50):
+            admitted.set()
+
+    thread = threading.Thread(target=wait)
+    thread.start()
+    time.sleep(0.05)
+    assert not admitted.is_set()
+    assert controller.stats()['waiting'] == 1
+
+    controller.release(units)
+    thread.join(timeout=2)
+    assert admitted.is_set()
+    assert controller.stats()['queued'] == 1
+
+def test_waiters_keep_fifo_order():
+    controller = AdmissionController(capacity=100, queue_timeout=5)
+    units = controller.acquire(100)
+    order = []
+
+    def wait(name, cost):
+        with controller.admit(cost):
+            order.append(name)
+
+    large = threading.Thread(target=wait, args=('large', 100))
+    large.start()
+    time.sleep(0.05)
+    small = threading.Thread(target=wait, args=('small', 1))
+    small.start()
+    time.sleep(0.05)
+
+    # The small request would fit next to nothing else but must not overtake
+    assert order == []
+    controller.release(units)
+    large.join(timeout=2)
+    small.join(timeout=2)
+    assert order == ['large', 'small']
+
+def test_full_wait_queue_rejects_immediately():
+    controller = AdmissionController(capacity=10, queue_timeout=5, max_waiting=0)
+    controller.acquire(10)
+
+    start = time.monotonic()
+    with pytest.raises(OverloadedError):
+        controller.acquire(1)
+    assert time.monotonic() - start < 1
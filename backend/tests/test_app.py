@@ -9,7 +9,11 @@ from dotenv import load_dotenv
 load_dotenv()
 
 @pytest.fixture
-def client():
+def client(monkeypatch):
+    import app as app_module
+    from services.rate_limiter import MemoryBackend
+    # Each test starts with a fresh rate limit allowance
+    monkeypatch.setattr(app_module.rate_limiter, 'backend', MemoryBackend())
     app.config['TESTING'] = True
     with app.test_client() as client:
         yield client
@@ -142,4 +146,42 @@ def test_generate_graph_endpoint_technical_text_integration(client):
     # Check relationships
     assert len(data['edges']) >= 2
     assert all('source' in edge and 'target' in edge and 'label' in edge 
-              for edge in data['edges']) 
\ No newline at end of file
+              for edge in data['edges']) 
+
+@pytest.mark.parametrize('priority', ['high', None, [1], 1000])
+def test_submit_job_rejects_invalid_priority(client, priority):
+    response = client.post('/api/jobs', json={'type': 'expand-cluster', 'payload': {}, 'priority': priority})
+
+    assert response.status_code == 400
+    assert 'priority' in json.loads(response.data)['error']
+
+def test_expand_prompt_stays_bounded_for_oversized_seed_lists():
+    from app import EXPAND_CONTEXT_TOKENS, _expand_cluster_prompt
+    node_ids = [f'concept-{i}' for i in range(20000)]
+    graph_data = {
+        'nodes': [{'id': node_id, 'label': node_id} for node_id in node_ids],
+        'edges': [{'source': a, 'target': b, 'weight': 1.0} for a, b in zip(node_ids, node_ids[1:])]
+    }
+
+    prompt, error, status = _expand_cluster_prompt({
+        'clusterId': 'huge', 'nodeIds': node_ids, 'graphData': graph_data
+    })
+
+    assert status == 200 and error is None
+    # Template plus the seeds and context, both within the context budget
+    assert len(prompt) // 4 < 3 * EXPAND_CONTEXT_TOKENS
+
+@pytest.mark.parametrize('path, body', [
+    ('/api/expand-cluster', {'clusterId': 'c', 'graphData': {'nodes': [{'id': str(i)} for i in range(50)]}}),
+    ('/api/expand-cluster/stream', {'clusterId': 'c', 'graphData': {'nodes': [{'id': str(i)} for i in range(50)]}}),
+    ('/api/generate-graph/stream', {'text': 'word ' * 50}),
+    ('/api/jobs', {'type': 'generate-graph', 'payload': {'text': 'word ' * 50}})
+])
+def test_heavy_routes_are_admission_controlled(client, monkeypatch, path, body):
+    import app as app_module
+    monkeypatch.setattr(app_module.admission, 'max_request_cost', 10)
+
+    response = client.post(path, json=body)
+
+    assert response.status_code == 413
+    assert json.loads(response.data)['max_cost'] == 10
@@ -0,0 +1,53 @@
+import asyncio
+
+import httpx
+import pytest
+
+import app as flask_app
+import asgi
+from asgi import app
+from services.graph_service import DEFERRED_METRICS
+from services.nlp_pool import NLPProcessPool
+from test_nlp_pool import blank_processor
+
+def post(path, body):
+    async def send():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+            return await client.post(path, json=body)
+    return asyncio.run(send())
+
+@pytest.mark.parametrize('path, body', [
+    ('/api/generate-graph', {'text': 'word ' * 50}),
+    ('/api/analyze-clusters', {'nodes': [{'id': str(i)} for i in range(50)], 'edges': []}),
+    ('/api/expand-cluster', {'clusterId': 'c', 'graphData': {'nodes': [{'id': str(i)} for i in range(50)]}})
+])
+def test_llm_routes_are_admission_controlled(monkeypatch, path, body):
+    monkeypatch.setattr(flask_app.admission, 'max_request_cost', 10)
+
+    response = post(path, body)
+
+    assert response.status_code == 413
+    assert response.json()['max_cost'] == 10
+    assert flask_app.admission.stats()['in_use'] == 0
+
+def test_progressive_process_text_defers_metrics_to_a_job(monkeypatch):
+    pool = NLPProcessPool(max_workers=1, factory=blank_processor)
+    monkeypatch.setattr(asgi, 'nlp_pool', pool)
+    try:
+        response = post('/api/process-text', {
+            'text': 'Knowledge graph from text', 'window_size': 2,
+            'window_sizes': [3], 'progressive': True
+        })
+    finally:
+        pool.shutdown()
+
+    assert response.status_code == 200
+    result = response.json()
+    assert result['graph']['pending_metrics'] == list(DEFERRED_METRICS)
+    assert all('betweenness' not in node for node in result['graph']['nodes'])
+    assert set(result['cooccurrences_by_window']) == {'2', '3'}
+
+    job = flask_app.metrics_queue.wait(result['metrics_job']['job_id'], timeout=30)
+    assert job.result['base_version'] == result['graph']['version']
+    assert 'pending_metrics' not in flask_app.graph_service.get_graph_data(progressive=True)
@@ -0,0 +1,59 @@
+import math
+import numpy as np
+import pytest
+from scipy.stats import chi2_contingency
+from benchmarks.corpus import generate_tokens
+from services.association import WEIGHT_FLOOR, association_scores, association_weights
+from services.graph_service import GraphService
+from services.token_store import PositionalTokens
+
+# Pairs (0, 1): 4, (0, 2): 1, (1, 2): 1, (2, 3): 2 over four tokens
+ROWS = np.array([0, 0, 1, 2])
+COLS = np.array([1, 2, 2, 3])
+COUNTS = np.array([4, 1, 1, 2])
+
+def test_pmi_matches_the_definition():
+    scores = association_scores(ROWS, COLS, COUNTS, 4, 'pmi')
+
+    # Marginals are row sums of the symmetric matrix: 5, 5, 4, 2 of 16
+    assert scores[0] == pytest.approx(math.log((4 / 16) / ((5 / 16) * (5 / 16))))
+    assert scores[3] == pytest.approx(math.log((2 / 16) / ((4 / 16) * (2 / 16))))
+
+def test_npmi_is_bounded_and_one_for_exclusive_pairs():
+    scores = association_scores(ROWS, COLS, COUNTS, 4, 'npmi')
+    assert np.all((scores >= -1) & (scores <= 1))
+
+    exclusive = association_scores(np.array([0, 2]), np.array([1, 3]), np.array([3, 5]), 4, 'npmi')
+    assert exclusive == pytest.approx([1.0, 1.0])
+
+def test_llr_matches_a_g_test():
+    scores = association_scores(ROWS, COLS, COUNTS, 4, 'llr')
+    table = [[4, 5 - 4], [5 - 4, 16 - 5 - 5 + 4]]
+    g2, *_ = chi2_contingency(table, correction=False, lambda_='log-likelihood')
+
+    assert scores[0] == pytest.approx(g2)
+    # (0, 2) occurs less often than chance, so it gets no attraction score
+    assert scores[1] == 0
+
+def test_weights_are_valid_edge_weights():
+    for method in ('pmi', 'npmi', 'llr'):
+        weights = association_weights(ROWS, COLS, COUNTS, 4, method)
+        assert np.all((weights >= WEIGHT_FLOOR) & (weights <= 1))
+    assert association_weights(ROWS, COLS, COUNTS, 4, 'count').tolist() == [1.0, 0.25, 0.25, 0.5]
+    with pytest.raises(ValueError):
+        association_weights(ROWS, COLS, COUNTS, 4, 'tfidf')
+
+def test_weights_are_cached_per_document_and_used_by_build_graph():
+    positional = PositionalTokens(generate_tokens(3000, seed=11))
+    weights = positional.weights(4, 'npmi')
+    assert positional.weights(4, 'npmi') is weights
+
+    cooccurrences = positional.cooccurrences(4)
+    service = GraphService()
+    service.build_graph(positional.tokens, cooccurrences, weights=weights)
+
+    (a, b), count = next(iter(cooccurrences.items()))
+    edge = service.graph.edges[a, b]
+    assert edge['raw_count'] == count
+    assert edge['weight'] == pytest.approx(weights[0])
+    assert all(0 < w <= 1 for *_, w in service.graph.edges(data='weight'))
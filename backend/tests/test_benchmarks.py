@@ -0,0 +1,43 @@
+from benchmarks.corpus import count_cooccurrences, generate_text, generate_tokens
+from benchmarks.run import BENCHMARKS, EdgesOnlyGraphService, compare, measure
+
+def test_corpus_is_deterministic():
+    assert generate_tokens(500, seed=1) == generate_tokens(500, seed=1)
+    assert generate_tokens(500, seed=1) != generate_tokens(500, seed=2)
+    assert len(generate_text(1000).split()) == 1000
+
+def test_cooccurrence_keys_are_ordered_pairs():
+    counts = count_cooccurrences(['b', 'a', 'b', 'c'], window_size=1)
+    assert counts == {('a', 'b'): 2, ('b', 'c'): 1}
+
+def test_measure_reports_throughput_and_memory():
+    benchmark = next(b for b in BENCHMARKS if b.name == 'build_graph')
+    result = measure(benchmark, 1000, repeat=1)
+
+    assert result['tokens'] == 1000
+    assert result['seconds'] > 0
+    assert result['tokens_per_second'] > 0
+    assert result['peak_bytes'] > 0
+
+def test_edges_only_service_skips_every_metric(sample_graph):
+    service = EdgesOnlyGraphService()
+    for progressive in (False, True):
+        graph_data = service.build_graph(*sample_graph, progressive=progressive)
+        assert len(graph_data['edges']) == len(sample_graph[1])
+        assert all(node['pagerank'] == 0 for node in graph_data['nodes'])
+    assert service._query_index is None
+
+def test_compare_flags_regressions_over_threshold():
+    baseline = {
+        'build_graph@1000': {'seconds': 1.0, 'peak_bytes': 1000},
+        'serialize@1000': {'seconds': 1.0, 'peak_bytes': 1000}
+    }
+    results = {
+        'build_graph@1000': {'seconds': 1.2, 'peak_bytes': 1100},
+        'serialize@1000': {'seconds': 1.3, 'peak_bytes': 2000},
+        'betweenness@1000': {'seconds': 9.0, 'peak_bytes': 1}
+    }
+
+    regressions = compare(results, baseline, threshold=0.25, memory_threshold=0.25)
+    assert len(regressions) == 2
+    assert all(message.startswith('serialize@1000') for message in regressions)
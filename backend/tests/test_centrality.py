@@ -0,0 +1,86 @@
+import networkx as nx
+import numpy as np
+import pytest
+from benchmarks.corpus import count_cooccurrences, generate_tokens
+from services.centrality import carry_over, eigenvector_centrality, pagerank
+from services.graph_index import GraphIndex
+from services.graph_service import GraphService
+from services.graph_snapshot import graph_to_csr
+
+def cooccurrence_graph(size=4000, seed=2):
+    graph = nx.Graph()
+    counts = count_cooccurrences(generate_tokens(size, seed=seed), 3)
+    largest = max(counts.values())
+    for (a, b), count in counts.items():
+        graph.add_edge(a, b, weight=count / largest, raw_count=count, log_weight=np.log1p(count / largest))
+    return graph
+
+def test_pagerank_matches_networkx():
+    graph = cooccurrence_graph()
+    graph.add_node('isolated')
+    vocabulary, indptr, indices, edges = graph_to_csr(graph)
+
+    scores, _ = pagerank(indptr, indices, edges['weight'])
+    expected = nx.pagerank(graph, weight='weight', tol=1e-10)
+
+    assert scores.sum() == pytest.approx(1.0)
+    assert scores == pytest.approx([expected[node] for node in vocabulary], abs=1e-6)
+
+def test_eigenvector_matches_networkx():
+    graph = cooccurrence_graph()
+    vocabulary, indptr, indices, edges = graph_to_csr(graph)
+
+    scores, _ = eigenvector_centrality(indptr, indices, edges['weight'])
+    expected = nx.eigenvector_centrality(graph, weight='weight', tol=1e-9, max_iter=1000)
+
+    assert scores == pytest.approx([expected[node] for node in vocabulary], abs=1e-5)
+
+def test_warm_start_needs_fewer_iterations():
+    graph = cooccurrence_graph()
+    vocabulary, indptr, indices, edges = graph_to_csr(graph)
+    previous, _ = pagerank(indptr, indices, edges['weight'])
+
+    graph.remove_edges_from(list(graph.edges)[:20])
+    changed_vocabulary, indptr, indices, edges = graph_to_csr(graph)
+    _, cold = pagerank(indptr, indices, edges['weight'])
+    warm_scores, warm = pagerank(
+        indptr, indices, edges['weight'], start=carry_over(vocabulary, previous, changed_vocabulary)
+    )
+
+    assert warm < cold
+    expected = nx.pagerank(graph, weight='weight', tol=1e-10)
+    assert warm_scores == pytest.approx([expected[node] for node in changed_vocabulary], abs=1e-6)
+
+def test_filtered_index_equals_index_of_filtered_graph():
+    graph = cooccurrence_graph(1500)
+    index = GraphIndex.from_graph(graph)
+
+    filtered = graph.copy()
+    filtered.remove_edges_from([(u, v) for u, v, w in graph.edges(data='weight') if w < 0.1])
+    filtered.remove_nodes_from(list(nx.isolates(filtered)))
+    expected = GraphIndex.from_graph(filtered)
+    derived = index.filtered(0.1, generation=7)
+
+    assert derived.vocabulary == expected.vocabulary
+    assert derived.indptr.tolist() == expected.indptr.tolist()
+    assert derived.indices.tolist() == expected.indices.tolist()
+    assert derived.weights.tolist() == expected.weights.tolist()
+    assert derived.generation == 7
+
+def test_service_reports_and_warm_starts_rankings():
+    tokens = generate_tokens(1500, seed=4)
+    service = GraphService()
+    data = service.build_graph(tokens, count_cooccurrences(tokens, 3))
+    assert all('pagerank' in node and 'eigenvector' in node for node in data['nodes'])
+
+    before = service._centrality_vectors['pagerank']
+    filtered = service.filter_edges_by_weight(0.05)
+    after = service._centrality_vectors['pagerank']
+    assert after is not before
+    assert service.query_index().generation == service.generation
+
+    expected = nx.pagerank(service.graph, weight='weight', tol=1e-10)
+    for node in filtered['nodes']:
+        assert node['pagerank'] == pytest.approx(expected[node['id']], abs=1e-6)
+    top = service.query_index().top_k('pagerank', 1)[0]
+    assert top['id'] == max(expected, key=expected.get)
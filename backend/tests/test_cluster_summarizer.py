@@ -0,0 +1,94 @@
+import json
+import threading
+import time
+import networkx as nx
+from services.cluster_summarizer import ClusterSummarizer
+
+def clique_graph(cliques, size=5):
+    graph = nx.Graph()
+    for c in range(cliques):
+        members = [f"c{c}n{i}" for i in range(size)]
+        for i, u in enumerate(members):
+            for v in members[i + 1:]:
+                graph.add_edge(u, v, weight=1.0)
+        if c:
+            graph.add_edge(f"c{c - 1}n0", f"c{c}n0", weight=0.1)
+    return graph
+
+class StubLLM:
+    def __init__(self, latency=0.0):
+        self.prompts = []
+        self.latency = latency
+        self.lock = threading.Lock()
+
+    def __call__(self, prompt):
+        with self.lock:
+            self.prompts.append(prompt)
+            n = len(self.prompts)
+        time.sleep(self.latency)
+        return '```json\n' + json.dumps({"label": f"Topic {n}", "summary": "A topic."}) + '\n```'
+
+def test_every_node_is_covered():
+    graph = clique_graph(3)
+    graph.add_node("isolated")
+
+    clusters = ClusterSummarizer(StubLLM()).analyze(graph)
+
+    covered = set().union(*(set(c['nodes']) for c in clusters if c['level'] == 0))
+    assert covered == set(graph.nodes())
+    assert len([c for c in clusters if c['level'] == 0]) == 4
+
+def test_clusters_follow_communities():
+    clusters = ClusterSummarizer(StubLLM()).analyze(clique_graph(2))
+
+    assert sorted(len(c['nodes']) for c in clusters) == [5, 5]
+    for cluster in clusters:
+        assert len({node[:2] for node in cluster['nodes']}) == 1
+        assert cluster['label'].startswith("Topic")
+        assert cluster['density'] == 1.0
+        assert len(cluster['edges']) == 10
+
+def test_prompt_size_is_bounded():
+    small, large = StubLLM(), StubLLM()
+    ClusterSummarizer(small, max_terms=5).analyze(clique_graph(2, size=5))
+    ClusterSummarizer(large, max_terms=5).analyze(clique_graph(2, size=200))
+
+    assert max(map(len, large.prompts)) < max(map(len, small.prompts)) * 2
+
+def test_llm_calls_run_in_parallel():
+    llm = StubLLM(latency=0.2)
+    start = time.perf_counter()
+    ClusterSummarizer(llm, max_workers=4).analyze(clique_graph(4))
+
+    assert len(llm.prompts) == 4
+    assert time.perf_counter() - start < 0.6
+
+def test_large_graphs_get_a_second_level():
+    clusters = ClusterSummarizer(StubLLM(), max_clusters=4).analyze(clique_graph(12))
+
+    parents = [c for c in clusters if c['level'] == 1]
+    children = [c for c in clusters if c['level'] == 0]
+    assert parents
+    assert all(c['parent'] in {p['id'] for p in parents} for c in children if 'parent' in c)
+    assert sum(len(p['children']) for p in parents) <= len(children)
+
+def test_llm_calls_are_bounded_on_fragmented_graphs():
+    llm = StubLLM()
+    graph = nx.Graph()
+    for i in range(300):
+        graph.add_edge(f"a{i}", f"b{i}", weight=1.0)
+
+    clusters = ClusterSummarizer(llm, max_clusters=12).analyze(graph)
+
+    assert len([c for c in clusters if c['level'] == 0]) == 300
+    assert len(llm.prompts) <= 2 * 12
+    assert all(cluster['label'] for cluster in clusters)
+
+def test_llm_failure_falls_back_to_top_terms():
+    def failing(prompt):
+        raise RuntimeError("quota exceeded")
+
+    clusters = ClusterSummarizer(failing).analyze(clique_graph(2))
+
+    assert all(cluster['label'] for cluster in clusters)
+    assert all(cluster['keyTerms'] for cluster in clusters)
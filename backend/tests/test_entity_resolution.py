@@ -0,0 +1,49 @@
+import pytest
+import numpy as np
+import spacy
+from kg_gen.models import Graph
+from services.entity_resolution import EntityResolver, rewrite_graph
+
+@pytest.fixture
+def nlp():
+    nlp = spacy.blank("en")
+    rng = np.random.default_rng(1)
+    car = rng.standard_normal(50).astype(np.float32)
+    nlp.vocab.set_vector("car", car)
+    nlp.vocab.set_vector("automobile", car + 0.01 * rng.standard_normal(50).astype(np.float32))
+    nlp.vocab.set_vector("banana", rng.standard_normal(50).astype(np.float32))
+    return nlp
+
+def test_case_and_whitespace_variants_merge(nlp):
+    mapping = EntityResolver(nlp).resolve(["Neural Network", "neural network", "neural  network"])
+    assert len(set(mapping.values())) == 1
+
+def test_acronym_merges_with_expansion(nlp):
+    mapping = EntityResolver(nlp).resolve(["neural network", "NN", "data"])
+    assert mapping["NN"] == "neural network"
+    assert mapping["data"] == "data"
+
+def test_ambiguous_acronym_is_kept(nlp):
+    mapping = EntityResolver(nlp).resolve(["neural network", "natural number", "NN"])
+    assert mapping["NN"] == "NN"
+
+def test_similar_vectors_merge(nlp):
+    mapping = EntityResolver(nlp, similarity_threshold=0.95).resolve(["car", "automobile", "banana"])
+    assert mapping["car"] == mapping["automobile"]
+    assert mapping["banana"] == "banana"
+
+def test_rewrite_graph_uses_canonical_ids(nlp):
+    kg_result = Graph(
+        entities={"neural network", "NN", "data"},
+        edges={"uses", "is"},
+        relations={("NN", "uses", "data"), ("neural network", "uses", "data"), ("NN", "is", "neural network")}
+    )
+    mapping = EntityResolver(nlp).resolve(kg_result.entities)
+
+    resolved = rewrite_graph(kg_result, mapping)
+
+    assert resolved.entities == {"neural network", "data"}
+    assert resolved.relations == {("neural network", "uses", "data")}
+
+def test_empty_input(nlp):
+    assert EntityResolver(nlp).resolve([]) == {}
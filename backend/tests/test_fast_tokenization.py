@@ -0,0 +1,46 @@
+import pytest
+from services.lemma_lookup import LookupLemmatizer
+from text_processor import TextProcessor
+
+LEMMAS = {'cats': 'cat', 'running': 'run', 'saw': 'see', 'Graphs': 'graph'}
+
+@pytest.fixture
+def processor(make_processor):
+    return make_processor(
+        {'the', 'were', 'on'}, window_size=2, tokenization='fast', lemmatizer=LookupLemmatizer(LEMMAS)
+    )
+
+def test_lookup_lemmatizer_lowercases_and_passes_unknown_forms():
+    lemmatizer = LookupLemmatizer(LEMMAS)
+
+    assert lemmatizer('cats') == 'cat'
+    assert lemmatizer('Cats') == 'cat'
+    assert lemmatizer('Graphs') == 'graph'
+    assert lemmatizer('Zurich') == 'zurich'
+
+def test_fast_mode_filters_like_the_full_pipeline(processor):
+    text = 'The cats were running on 42 graphs, x!'
+
+    # The blank pipeline's tokens carry no tags, so the full path only lowercases
+    assert processor.preprocess_text(text, 'full') == ['cats', 'running', 'graphs']
+    assert processor.preprocess_text(text) == ['cat', 'run', 'graphs']
+
+def test_modes_are_stored_separately(processor):
+    fast = processor.process('the cats saw cats', 1)
+    full = processor.process('the cats saw cats', 1, tokenization='full')
+
+    assert fast['cooccurrences'] == {('cat', 'see'): 2}
+    assert full['cooccurrences'] == {('cats', 'saw'): 2}
+    assert processor.token_store.contains('the cats saw cats', 'fast')
+    assert processor.token_store.contains('the cats saw cats', 'full')
+
+def test_fast_documents_keep_offsets(processor):
+    result = processor.process_documents([('a', 'Cats saw graphs.')], tokenization='fast')
+
+    assert result['tokens'] == ['cat', 'see', 'graphs']
+    snippet = result['provenance'].edge_provenance('cat', 'see')['snippets'][0]
+    assert snippet['highlights'] == [[0, 4], [5, 8]]
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError):
+        TextProcessor(tokenization='turbo')
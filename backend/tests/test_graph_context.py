@@ -0,0 +1,62 @@
+import networkx as nx
+from services.graph_context import estimate_tokens, extract_neighbourhood, graph_from_data
+
+def make_graph():
+    graph = nx.Graph()
+    graph.add_edge("neural", "network", weight=1.0)
+    graph.add_edge("network", "layer", weight=0.8)
+    graph.add_edge("neural", "brain", weight=0.2)
+    graph.add_edge("layer", "activation", weight=0.5)
+    graph.add_edge("activation", "sigmoid", weight=0.5)
+    graph.add_edge("banana", "fruit", weight=1.0)
+    return graph
+
+def test_respects_hop_limit():
+    context = extract_neighbourhood(make_graph(), ["neural"], hops=1)
+    ids = [node['id'] for node in context['nodes']]
+
+    assert ids[0] == "neural"
+    assert set(ids) == {"neural", "network", "brain"}
+    assert "banana" not in ids
+
+def test_ranks_heavier_edges_first():
+    context = extract_neighbourhood(make_graph(), ["neural"], hops=2)
+    ids = [node['id'] for node in context['nodes']]
+
+    assert ids.index("network") < ids.index("brain")
+    assert ids.index("brain") < ids.index("layer")
+
+def test_stays_within_token_budget():
+    graph = nx.star_graph(2000)
+    nx.set_edge_attributes(graph, 1.0, 'weight')
+
+    context = extract_neighbourhood(graph, [0], hops=2, token_budget=200, max_neighbors=2000)
+
+    assert context['truncated']
+    assert estimate_tokens({'nodes': context['nodes'], 'edges': context['edges']}) <= 260
+    assert len(context['nodes']) < 50
+
+def test_seeds_count_against_the_budget():
+    graph = nx.path_graph(5000)
+    nx.set_edge_attributes(graph, 1.0, 'weight')
+
+    context = extract_neighbourhood(graph, list(graph), hops=1, token_budget=200)
+
+    assert context['truncated']
+    assert estimate_tokens({'nodes': context['nodes'], 'edges': context['edges']}) <= 260
+    assert context['nodes'][0]['id'] == 0
+
+def test_unknown_seeds_give_empty_context():
+    context = extract_neighbourhood(make_graph(), ["missing"])
+    assert context['nodes'] == []
+    assert context['edges'] == []
+
+def test_graph_from_frontend_data():
+    graph = graph_from_data({
+        'nodes': [{'id': 'a', 'label': 'A'}, {'id': 'b', 'label': 'B'}],
+        'edges': [{'source': {'id': 'a'}, 'target': 'b', 'label': 'rel'}]
+    })
+
+    assert graph.nodes['a']['label'] == 'A'
+    assert graph.edges['a', 'b']['label'] == 'rel'
+    assert graph.edges['a', 'b']['weight'] == 1.0
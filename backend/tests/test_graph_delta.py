@@ -0,0 +1,83 @@
+import pytest
+from services.graph_delta import diff_graph_data
+from services.graph_service import GraphService
+
+@pytest.fixture
+def graph_service(make_graph_service):
+    return make_graph_service(history_size=3)
+
+def apply(graph_data, delta):
+    nodes = {node['id']: node for node in graph_data['nodes']}
+    for node_id in delta['nodes_removed']:
+        del nodes[node_id]
+    for node in delta['nodes_added'] + delta['nodes_changed']:
+        nodes[node['id']] = node
+
+    def key(edge):
+        return tuple(sorted((edge['source'], edge['target'])))
+    edges = {key(edge): edge for edge in graph_data['edges']}
+    for edge in delta['edges_removed']:
+        del edges[key(edge)]
+    for edge in delta['edges_added'] + delta['edges_changed']:
+        edges[key(edge)] = edge
+    return nodes, edges
+
+def test_diff_reports_changes_only():
+    old = {
+        'nodes': [{'id': 'a', 'degree': 1}, {'id': 'b', 'degree': 2}, {'id': 'c', 'degree': 1}],
+        'edges': [{'source': 'a', 'target': 'b', 'weight': 1.0}, {'source': 'c', 'target': 'b', 'weight': 0.5}],
+        'metrics': {'node_count': 3}
+    }
+    new = {
+        'nodes': [{'id': 'a', 'degree': 1}, {'id': 'b', 'degree': 2}, {'id': 'd', 'degree': 1}],
+        'edges': [{'source': 'b', 'target': 'a', 'weight': 1.0}, {'source': 'b', 'target': 'd', 'weight': 0.5}],
+        'metrics': {'node_count': 3}
+    }
+    delta = diff_graph_data(old, new)
+
+    assert delta['nodes_added'] == [{'id': 'd', 'degree': 1}]
+    assert delta['nodes_removed'] == ['c']
+    assert delta['nodes_changed'] == []
+    assert delta['edges_added'] == [{'source': 'b', 'target': 'd', 'weight': 0.5}]
+    assert delta['edges_removed'] == [{'source': 'b', 'target': 'c'}]
+    assert delta['edges_changed'] == []
+    assert 'metrics' not in delta
+
+def test_versions_change_with_the_graph(graph_service):
+    first = graph_service.get_graph_data()['version']
+    assert graph_service.get_graph_data()['version'] == first
+
+    filtered = graph_service.filter_edges_by_weight(0.5)
+    assert filtered['version'] != first
+    assert graph_service.version == filtered['version']
+
+def test_delta_applied_to_the_old_graph_gives_the_new_graph(graph_service):
+    old = graph_service.get_graph_data()
+    new = graph_service.filter_edges_by_weight(0.5)
+    response = graph_service.versioned_response(new, old['version'])
+
+    assert response['base_version'] == old['version']
+    assert response['version'] == new['version']
+    assert response['delta']['nodes_removed'] == ['jump']
+
+    nodes, edges = apply(old, response['delta'])
+    assert nodes == {node['id']: node for node in new['nodes']}
+    assert set(edges) == {tuple(sorted((e['source'], e['target']))) for e in new['edges']}
+    assert response['delta']['metrics'] == new['metrics']
+
+def test_unknown_or_expired_versions_get_the_full_graph(graph_service):
+    oldest = graph_service.get_graph_data()
+    for threshold in (0.3, 0.5, 0.7):
+        latest = graph_service.filter_edges_by_weight(threshold)
+
+    assert graph_service.versioned_response(latest, oldest['version']) is latest
+    assert graph_service.versioned_response(latest, 'unknown') is latest
+    assert graph_service.versioned_response(latest, None) is latest
+
+def test_loaded_graph_gets_a_local_version(graph_service):
+    data = graph_service.get_graph_data()
+    other = GraphService()
+    other.load_graph_data(dict(data))
+
+    assert other.version is not None
+    assert other.version != data['version']
@@ -0,0 +1,100 @@
+import random
+import pytest
+import networkx as nx
+from services.graph_index import GraphIndex
+from services.graph_service import GraphService
+from services.graph_snapshot import GraphSnapshot
+
+@pytest.fixture
+def graph_service(sample_graph):
+    # The sample graph plus an isolated node and a second path between its parts
+    tokens, cooccurrences = sample_graph
+    service = GraphService()
+    service.build_graph(tokens + ["alone"], {**cooccurrences, ("fox", "lazy"): 1})
+    return service
+
+def ids(nodes):
+    return [node['id'] for node in nodes]
+
+def edge_set(edges):
+    return {tuple(sorted((edge['source'], edge['target']))) for edge in edges}
+
+def test_neighbours_by_hop(graph_service):
+    result = graph_service.query_index().neighbours(['quick'], hops=2)
+
+    assert {node['id']: node['hops'] for node in result['nodes']} == {'quick': 0, 'brown': 1, 'fox': 2}
+    assert edge_set(result['edges']) == {('brown', 'quick'), ('brown', 'fox')}
+    assert not result['truncated']
+
+def test_neighbours_keep_the_strongest_edges_when_truncated(graph_service):
+    result = graph_service.query_index().neighbours(['lazy'], hops=1, limit=2)
+
+    assert ids(result['nodes']) == ['lazy', 'dog']
+    assert result['truncated']
+
+def test_weighted_shortest_path_matches_networkx(graph_service):
+    path = graph_service.query_index().shortest_path('quick', 'dog')
+
+    graph = graph_service.graph
+    for u, v, data in graph.edges(data=True):
+        data['distance'] = 1 / data['weight']
+    assert ids(path['nodes']) == nx.shortest_path(graph, 'quick', 'dog', weight='distance')
+    assert path['distance'] == pytest.approx(nx.shortest_path_length(graph, 'quick', 'dog', weight='distance'))
+    assert len(path['edges']) == len(path['nodes']) - 1
+
+def test_shortest_path_without_a_path(graph_service):
+    index = graph_service.query_index()
+    assert index.shortest_path('quick', 'alone') is None
+    assert index.shortest_path('quick', 'missing') is None
+    assert ids(index.shortest_path('fox', 'fox')['nodes']) == ['fox']
+
+def test_top_k(graph_service):
+    index = graph_service.query_index()
+
+    assert set(ids(index.top_k('degree', 2))) == {'fox', 'lazy'}
+    assert index.top_k('degree', 1, ascending=True)[0]['id'] == 'alone'
+    assert index.top_k('betweenness', 1)[0]['value'] > 0
+    with pytest.raises(KeyError):
+        index.top_k('unknown')
+
+def test_subgraph(graph_service):
+    result = graph_service.query_index().subgraph(['fox', 'jump', 'lazy', 'nope'])
+
+    assert ids(result['nodes']) == ['fox', 'jump', 'lazy']
+    assert edge_set(result['edges']) == {('fox', 'jump'), ('jump', 'lazy'), ('fox', 'lazy')}
+    assert result['missing'] == ['nope']
+    assert {'weight', 'raw_count', 'log_weight'} <= set(result['edges'][0])
+
+def test_index_is_rebuilt_when_the_graph_changes(graph_service):
+    index = graph_service.query_index()
+    assert graph_service.query_index() is index
+
+    graph_service.filter_edges_by_weight(0.5)
+    rebuilt = graph_service.query_index()
+    assert rebuilt is not index
+    assert rebuilt.generation > index.generation
+    assert 'jump' not in rebuilt.node_index
+
+def test_snapshot_is_indexed_without_materializing(graph_service, tmp_path):
+    graph_service.save_snapshot(str(tmp_path / "sample"))
+    restored = GraphService()
+    restored.restore_snapshot(GraphSnapshot(str(tmp_path / "sample")))
+
+    index = restored.query_index()
+    assert restored._snapshot is not None
+    assert edge_set(index.subgraph(['fox', 'lazy', 'dog'])['edges']) == {('dog', 'lazy'), ('fox', 'lazy')}
+
+def test_neighbours_match_networkx_on_a_random_graph():
+    rng = random.Random(3)
+    graph = nx.gnm_random_graph(300, 900, seed=3)
+    graph = nx.relabel_nodes(graph, {i: f'n{i}' for i in graph})
+    for u, v in graph.edges():
+        graph[u][v]['weight'] = rng.random() + 0.01
+    index = GraphIndex.from_graph(graph)
+
+    result = index.neighbours(['n0', 'n1'], hops=2, limit=10000)
+    expected = nx.multi_source_dijkstra_path_length(graph, {'n0', 'n1'}, cutoff=2, weight=lambda u, v, d: 1)
+    assert {node['id']: node['hops'] for node in result['nodes']} == expected
+    assert edge_set(result['edges']) == edge_set(
+        {'source': u, 'target': v} for u, v in graph.subgraph(expected).edges()
+    )
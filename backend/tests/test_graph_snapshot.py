@@ -0,0 +1,70 @@
+import pytest
+import numpy as np
+from services.graph_service import GraphService
+from services.graph_snapshot import GraphSnapshot, SnapshotStore
+
+def test_snapshot_round_trip(graph_service, tmp_path):
+    original = graph_service.get_graph_data()
+    graph_service.save_snapshot(str(tmp_path / "sample"))
+
+    restored_service = GraphService()
+    summary = restored_service.restore_snapshot(GraphSnapshot(str(tmp_path / "sample")))
+    assert summary['node_count'] == 6
+    assert summary['edge_count'] == 5
+
+    restored = restored_service.get_graph_data()
+    assert {n['id']: n['betweenness'] for n in restored['nodes']} == \
+        {n['id']: n['betweenness'] for n in original['nodes']}
+
+    def edge_key(edge):
+        return tuple(sorted((edge['source'], edge['target'])))
+
+    original_edges = {edge_key(e): (e['weight'], e['raw_count']) for e in original['edges']}
+    restored_edges = {edge_key(e): (e['weight'], e['raw_count']) for e in restored['edges']}
+    assert restored_edges == original_edges
+    assert restored['metrics'] == original['metrics']
+
+def test_snapshot_arrays_are_memory_mapped(graph_service, tmp_path):
+    graph_service.save_snapshot(str(tmp_path / "sample"))
+    snapshot = GraphSnapshot(str(tmp_path / "sample"))
+
+    assert isinstance(snapshot.indices, np.memmap)
+    assert not snapshot.indices.flags.writeable
+
+    fox = snapshot.index_of("fox")
+    neighbours = {snapshot.term(i) for i in snapshot.neighbors(fox)}
+    assert neighbours == {"brown", "jump"}
+
+def test_restore_does_not_build_graph_until_needed(graph_service, tmp_path):
+    graph_service.save_snapshot(str(tmp_path / "sample"))
+
+    restored_service = GraphService()
+    restored_service.restore_snapshot(GraphSnapshot(str(tmp_path / "sample")))
+    assert restored_service._graph.number_of_nodes() == 0
+    assert restored_service.graph.number_of_nodes() == 6
+
+def test_snapshot_overwrite(graph_service, tmp_path):
+    path = str(tmp_path / "sample")
+    graph_service.save_snapshot(path)
+    graph_service.filter_edges_by_weight(0.5)
+    graph_service.save_snapshot(path)
+
+    assert GraphSnapshot(path).edge_count == graph_service.graph.number_of_edges()
+
+def test_empty_graph_snapshot(tmp_path):
+    service = GraphService()
+    service.build_graph(tokens=["hello"], cooccurrences={})
+    service.save_snapshot(str(tmp_path / "empty"))
+
+    snapshot = GraphSnapshot(str(tmp_path / "empty"))
+    assert snapshot.node_count == 1
+    assert snapshot.edge_count == 0
+    assert list(snapshot.to_networkx().nodes()) == ["hello"]
+
+def test_snapshot_store_rejects_unsafe_names(tmp_path):
+    store = SnapshotStore(str(tmp_path))
+    with pytest.raises(ValueError):
+        store.path_for("../escape")
+    with pytest.raises(KeyError):
+        store.open("missing")
+    assert store.list() == []
@@ -0,0 +1,80 @@
+import re
+import threading
+import time
+from services.instrumentation import Histogram, Instrumentation
+
+def test_stages_are_reported_in_server_timing():
+    metrics = Instrumentation()
+    started = metrics.start_request()
+    with metrics.stage('spacy_parse'):
+        time.sleep(0.01)
+    with metrics.stage('build_graph'):
+        pass
+    with metrics.stage('spacy_parse'):
+        time.sleep(0.01)
+
+    header = metrics.finish_request(started, '/api/process-text', 'POST', 200)
+    entries = dict(re.findall(r'(\w+);dur=([\d.]+)', header))
+    assert list(entries) == ['spacy_parse', 'build_graph', 'total']
+    assert float(entries['spacy_parse']) >= 20
+    assert float(entries['total']) >= float(entries['spacy_parse'])
+
+def test_timed_decorator_feeds_the_histogram():
+    metrics = Instrumentation()
+
+    @metrics.timed('betweenness')
+    def compute(x):
+        return x * 2
+
+    assert compute(21) == 42
+    assert 'kg_stage_duration_seconds_count{stage="betweenness"} 1' in metrics.render()
+
+def test_nested_requests_are_timed_once():
+    metrics = Instrumentation()
+    outer = metrics.start_request()
+
+    assert metrics.start_request() is None
+    metrics.name_request('/api/jobs/<job_id>')
+    metrics.finish_request(outer, 'mounted', 'GET', 200)
+
+    assert 'endpoint="/api/jobs/<job_id>",method="GET",status="200"} 1' in metrics.render()
+
+def test_requests_in_other_threads_are_separate():
+    metrics = Instrumentation()
+    headers = {}
+
+    def request(name):
+        started = metrics.start_request()
+        with metrics.stage(name):
+            time.sleep(0.01)
+        headers[name] = metrics.finish_request(started, name, 'GET', 200)
+
+    threads = [threading.Thread(target=request, args=(f'stage{i}',)) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    for name, header in headers.items():
+        assert header.startswith(f'{name};dur=')
+        assert header.count(';dur=') == 2
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram('latency_seconds', 'Latency.', ('stage',), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 5.0):
+        histogram.observe(value, 'parse')
+
+    lines = histogram.render()
+    assert 'latency_seconds_bucket{stage="parse",le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{stage="parse",le="1.0"} 3' in lines
+    assert 'latency_seconds_bucket{stage="parse",le="+Inf"} 4' in lines
+    assert 'latency_seconds_count{stage="parse"} 4' in lines
+
+def test_disabled_records_nothing():
+    metrics = Instrumentation(enabled=False)
+
+    assert metrics.start_request() is None
+    with metrics.stage('spacy_parse'):
+        pass
+    assert metrics.finish_request(None, '/', 'GET', 200) is None
+    assert 'stage="spacy_parse"' not in metrics.render()
@@ -0,0 +1,99 @@
+import pytest
+import threading
+import time
+from services.job_queue import JobQueue, JobStatus, QueueFullError
+
+@pytest.fixture
+def queue():
+    queue = JobQueue(max_workers=1, result_ttl=60)
+    yield queue
+    queue.shutdown()
+
+def test_submit_returns_immediately_and_completes(queue):
+    release = threading.Event()
+    job = queue.submit(lambda: release.wait(5) and "done", kind="test")
+
+    assert job.status in (JobStatus.PENDING, JobStatus.RUNNING)
+    release.set()
+
+    finished = queue.wait(job.id, timeout=5)
+    assert finished.status == JobStatus.SUCCEEDED
+    assert finished.to_dict()['result'] == "done"
+
+def test_failed_job_reports_error(queue):
+    def fail():
+        raise RuntimeError("boom")
+
+    job = queue.wait(queue.submit(fail).id, timeout=5)
+    assert job.status == JobStatus.FAILED
+    assert job.to_dict()['error'] == "boom"
+
+def test_higher_priority_runs_first(queue):
+    release = threading.Event()
+    order = []
+    blocker = queue.submit(release.wait, 5)
+
+    low = queue.submit(order.append, "low", priority=0)
+    high = queue.submit(order.append, "high", priority=10)
+    release.set()
+
+    queue.wait(low.id, timeout=5)
+    queue.wait(high.id, timeout=5)
+    assert queue.wait(blocker.id, timeout=5).status == JobStatus.SUCCEEDED
+    assert order == ["high", "low"]
+
+def test_cancel_pending_job_never_runs(queue):
+    release = threading.Event()
+    ran = []
+    queue.submit(release.wait, 5)
+    job = queue.submit(ran.append, "ran")
+
+    assert queue.cancel(job.id).status == JobStatus.CANCELLED
+    release.set()
+    time.sleep(0.1)
+
+    assert ran == []
+    assert queue.get(job.id).status == JobStatus.CANCELLED
+
+def test_cancel_running_job_discards_result(queue):
+    started = threading.Event()
+    release = threading.Event()
+
+    def work():
+        started.set()
+        release.wait(5)
+        return "late"
+
+    job = queue.submit(work)
+    started.wait(5)
+    queue.cancel(job.id)
+    assert job.cancel_requested
+    release.set()
+    time.sleep(0.1)
+
+    assert queue.get(job.id).status == JobStatus.CANCELLED
+    assert 'result' not in queue.get(job.id).to_dict()
+
+def test_finished_jobs_expire():
+    queue = JobQueue(max_workers=1, result_ttl=0.05)
+    try:
+        job = queue.wait(queue.submit(lambda: 1).id, timeout=5)
+        assert job.finished
+        time.sleep(0.1)
+        assert queue.get(job.id) is None
+    finally:
+        queue.shutdown()
+
+def test_queue_full():
+    queue = JobQueue(max_workers=1, max_pending=1)
+    release = threading.Event()
+    try:
+        started = threading.Event()
+        queue.submit(lambda: started.set() or release.wait(5))
+        started.wait(5)
+        queue.submit(lambda: None)
+        with pytest.raises(QueueFullError):
+            queue.submit(lambda: None)
+    finally:
+        release.set()
+        queue.shutdown()
@@ -0,0 +1,97 @@
+import pytest
+import threading
+import time
+from kg_gen.models import Graph
+from services.kg_extraction import ChunkedExtractor, IncrementalMerge, merge_graphs
+
+class StubModel:
+    """Local stand-in for KG-Gen: one entity per token, a relation per adjacent pair."""
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def generate(self, input_data, context):
+        with self.lock:
+            self.calls.append(input_data)
+        time.sleep(self.latency)
+        words = input_data.split()
+        return Graph(
+            entities=set(words),
+            edges={"next to"},
+            relations={(a, "next to", b) for a, b in zip(words, words[1:])}
+        )
+
+def test_short_input_is_a_single_call():
+    model = StubModel()
+    extractor = ChunkedExtractor(model.generate, chunk_size=10, overlap=2)
+
+    result = extractor.extract(["python", "programming", "language"], context="Extract")
+
+    assert model.calls == ["python programming language"]
+    assert result.entities == {"python", "programming", "language"}
+
+def test_chunks_overlap_and_cover_all_tokens():
+    extractor = ChunkedExtractor(StubModel().generate, chunk_size=4, overlap=1)
+    tokens = [f"t{i}" for i in range(10)]
+
+    chunks = extractor.split(tokens)
+
+    assert chunks == ["t0 t1 t2 t3", "t3 t4 t5 t6", "t6 t7 t8 t9"]
+
+def test_merge_deduplicates_entities_and_relations():
+    tokens = [f"t{i}" for i in range(10)]
+    model = StubModel()
+    extractor = ChunkedExtractor(model.generate, chunk_size=4, overlap=1)
+
+    result = extractor.extract(tokens, context="Extract")
+
+    assert len(model.calls) == 3
+    assert result.entities == set(tokens)
+    assert result.relations == {(a, "next to", b) for a, b in zip(tokens, tokens[1:])}
+
+def test_merge_is_case_insensitive():
+    merged = merge_graphs([
+        Graph(entities={"Neural Network"}, edges={"uses"}, relations={("Neural Network", "uses", "Data")}),
+        Graph(entities={"neural  network", "data"}, edges={"uses"}, relations={("neural  network", "uses", "data")})
+    ])
+
+    assert merged.entities == {"Neural Network", "data"}
+    assert len(merged.relations) == 1
+
+def test_incremental_merge_reports_only_new_items():
+    merge = IncrementalMerge()
+    first = merge.add(Graph(entities={"Neural Network", "Data"}, edges={"uses"},
+                            relations={("Neural Network", "uses", "Data")}))
+    second = merge.add(Graph(entities={"neural  network", "model"}, edges={"uses", "trains"},
+                             relations={("neural  network", "uses", "data"), ("data", "trains", "model")}))
+
+    assert first.entities == {"Neural Network", "Data"}
+    assert second.entities == {"model"}
+    # Known entities keep the spelling sent first
+    assert second.relations == {("Data", "trains", "model")}
+
+def test_chunks_run_concurrently():
+    model = StubModel(latency=0.2)
+    extractor = ChunkedExtractor(model.generate, chunk_size=4, overlap=1, max_workers=4)
+    tokens = [f"t{i}" for i in range(13)]
+
+    start = time.perf_counter()
+    extractor.extract(tokens, context="Extract")
+    elapsed = time.perf_counter() - start
+
+    assert len(model.calls) == 4
+    assert elapsed < 0.5
+
+def test_chunk_failure_propagates():
+    def failing(input_data, context):
+        raise ValueError("Invalid response format")
+
+    extractor = ChunkedExtractor(failing, chunk_size=4, overlap=1)
+    with pytest.raises(ValueError):
+        extractor.extract([f"t{i}" for i in range(10)], context="Extract")
+
+def test_invalid_overlap():
+    with pytest.raises(ValueError):
+        ChunkedExtractor(StubModel().generate, chunk_size=4, overlap=4)
@@ -0,0 +1,106 @@
+import pytest
+import time
+from types import SimpleNamespace
+from kg_gen.models import Graph
+from services.llm_cache import LLMResultCache
+from services.llm_client import LLMClient
+
+class StubKG:
+    def __init__(self):
+        self.calls = 0
+        self.model = SimpleNamespace(generate_content=self.generate_content)
+
+    def generate(self, input_data, context):
+        self.calls += 1
+        return Graph(
+            entities={"python", "programming language"},
+            edges={"is a"},
+            relations={("python", "is a", "programming language")}
+        )
+
+    def generate_content(self, prompt, generation_config):
+        self.calls += 1
+        return SimpleNamespace(text='{"nodes": [], "edges": []}')
+
+@pytest.fixture
+def cache(tmp_path):
+    return LLMResultCache(str(tmp_path / "llm_cache.sqlite3"))
+
+def test_cache_key_depends_on_all_parts():
+    base = LLMResultCache.make_key("model", 0.0, "context", "input")
+    assert base == LLMResultCache.make_key("model", 0.0, "context", "input")
+    assert base != LLMResultCache.make_key("other", 0.0, "context", "input")
+    assert base != LLMResultCache.make_key("model", 0.2, "context", "input")
+    assert base != LLMResultCache.make_key("model", 0.0, "other", "input")
+    assert base != LLMResultCache.make_key("model", 0.0, "context", "other")
+
+def test_client_serves_repeated_calls_from_cache(cache):
+    kg = StubKG()
+    client = LLMClient(kg, model="model", temperature=0.0, cache=cache)
+
+    first = client.generate(input_data="python programming", context="Extract")
+    second = client.generate(input_data="python programming", context="Extract")
+
+    assert kg.calls == 1
+    assert second.entities == first.entities
+    assert second.relations == first.relations
+
+    stats = client.stats()
+    assert stats['live_calls'] == 1
+    assert stats['cache_hits'] == 1
+    assert stats['cache']['entries'] == 1
+
+def test_client_caches_only_deterministic_text(cache):
+    kg = StubKG()
+    client = LLMClient(kg, model="model", temperature=0.0, cache=cache)
+    config = {"temperature": 0.0, "max_output_tokens": 1000}
+
+    assert client.generate_text("prompt", config) == client.generate_text("prompt", config)
+    assert kg.calls == 1
+
+    # Sampled output is not pinned to the first answer
+    sampled = {"temperature": 0.2, "max_output_tokens": 1000}
+    client.generate_text("prompt", sampled)
+    client.generate_text("prompt", sampled)
+    assert kg.calls == 3
+    assert cache.stats()['entries'] == 1
+
+def test_cache_persists_across_instances(tmp_path):
+    path = str(tmp_path / "llm_cache.sqlite3")
+    LLMResultCache(path).set("key", {"value": 1})
+    assert LLMResultCache(path).get("key") == {"value": 1}
+
+def test_expired_entries_are_misses(tmp_path):
+    cache = LLMResultCache(str(tmp_path / "llm_cache.sqlite3"), ttl_seconds=0.05)
+    cache.set("key", {"value": 1})
+    time.sleep(0.1)
+
+    assert cache.get("key") is None
+    assert cache.stats()['expired'] == 1
+
+def test_size_based_eviction_drops_least_recently_used(tmp_path):
+    cache = LLMResultCache(str(tmp_path / "llm_cache.sqlite3"), max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()['evictions'] == 1
+
+def test_errors_are_not_cached(cache):
+    class FailingKG(StubKG):
+        def generate(self, input_data, context):
+            self.calls += 1
+            raise ValueError("Invalid response format")
+
+    kg = FailingKG()
+    client = LLMClient(kg, model="model", temperature=0.0, cache=cache)
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            client.generate(input_data="text", context="Extract")
+
+    assert kg.calls == 2
+    assert client.stats()['errors'] == 2
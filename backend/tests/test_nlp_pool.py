@@ -0,0 +1,68 @@
+import asyncio
+import os
+import spacy
+import time
+from services.nlp_pool import NLPProcessPool
+from text_processor import TextProcessor
+
+class FakeProcessor:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.window_size = 4
+
+    def preprocess_text(self, text):
+        time.sleep(self.delay)
+        return {'tokens': text.split(), 'pid': os.getpid()}
+
+def blank_processor():
+    """The real TextProcessor on a blank pipeline, so results follow its key contract."""
+    processor = TextProcessor(nlp=spacy.blank('en'))
+    processor.stop_words = set()
+    return processor
+
+def test_work_runs_in_worker_processes():
+    pool = NLPProcessPool(max_workers=1, factory=FakeProcessor)
+    try:
+        result = asyncio.run(pool.call('preprocess_text', 'graph of words'))
+    finally:
+        pool.shutdown()
+
+    assert result['tokens'] == ['graph', 'of', 'words']
+    assert result['pid'] != os.getpid()
+
+def test_event_loop_stays_responsive():
+    pool = NLPProcessPool(max_workers=1, factory=FakeProcessor, factory_kwargs={'delay': 0.5})
+
+    async def scenario():
+        await pool.call('preprocess_text', 'warm up')
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.05)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        await pool.call('preprocess_text', 'slow parse')
+        task.cancel()
+        return ticks
+
+    try:
+        ticks = asyncio.run(scenario())
+    finally:
+        pool.shutdown()
+
+    assert ticks >= 5
+
+def test_process_text_builds_graph():
+    pool = NLPProcessPool(max_workers=1, factory=blank_processor)
+    try:
+        result = asyncio.run(pool.process_text('Knowledge graph from text', 2))
+    finally:
+        pool.shutdown()
+
+    assert result['tokens'] == ['knowledge', 'graph', 'from', 'text']
+    assert len(result['graph']['nodes']) == 4
+    assert len(result['graph']['edges']) == 5
+    assert result['cooccurrences']['graph_knowledge'] == 1
@@ -0,0 +1,43 @@
+import gc
+import os
+import numpy as np
+import pytest
+from services.job_queue import JobQueue
+from services.process_stats import freeze_shared_state, memory_usage, worker_stats
+
+class FakeNLP:
+    class vocab:
+        class vectors:
+            data = np.zeros((4, 3), dtype=np.float32)
+
+def test_freeze_shared_state_makes_vectors_read_only():
+    nlp = FakeNLP()
+    try:
+        freeze_shared_state(nlp)
+        assert gc.get_freeze_count() > 0
+        with pytest.raises(ValueError):
+            nlp.vocab.vectors.data[0, 0] = 1.0
+    finally:
+        gc.unfreeze()
+
+def test_memory_usage_reports_rss():
+    usage = memory_usage()
+    assert usage['rss'] > 0
+
+def test_worker_stats_without_master(monkeypatch):
+    monkeypatch.delenv('PREFORK_MASTER_PID', raising=False)
+    stats = worker_stats()
+    assert stats['master'] is None
+    assert stats['workers'][0]['pid'] == os.getpid()
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason="requires fork")
+def test_job_queue_works_after_fork():
+    queue = JobQueue(max_workers=1)
+    queue.wait(queue.submit(lambda: 1).id, timeout=5)
+
+    pid = os.fork()
+    if pid == 0:
+        job = queue.wait(queue.submit(lambda: 2).id, timeout=5)
+        os._exit(0 if job.result == 2 else 1)
+    _, status = os.waitpid(pid, 0)
+    assert os.WEXITSTATUS(status) == 0
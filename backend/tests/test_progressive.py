@@ -0,0 +1,67 @@
+from services.admission import estimate_text_cost
+from services.graph_service import DEFERRED_METRICS, GraphService
+
+def test_progressive_build_leaves_out_heavy_metrics(sample_graph):
+    graph_data = GraphService().build_graph(*sample_graph, progressive=True)
+
+    assert graph_data['pending_metrics'] == list(DEFERRED_METRICS)
+    assert all('betweenness' not in node and 'pagerank' in node for node in graph_data['nodes'])
+    assert 'average_clustering' not in graph_data['metrics']
+    assert graph_data['metrics']['node_count'] == len(sample_graph[0])
+
+def test_completed_metrics_arrive_as_a_delta(sample_graph):
+    service = GraphService()
+    progressive = service.build_graph(*sample_graph, progressive=True)
+
+    complete = service.complete_deferred_metrics(service.generation)
+    assert 'pending_metrics' not in complete
+    assert complete['version'] != progressive['version']
+    assert complete == GraphService().build_graph(*sample_graph) | {'version': complete['version']}
+
+    response = service.versioned_response(complete, progressive['version'])
+    assert response['base_version'] == progressive['version']
+    changed = {node['id']: node for node in response['delta']['nodes_changed']}
+    assert changed['brown']['betweenness'] > 0
+    assert 'average_clustering' in response['delta']['metrics']
+
+    # Once computed, progressive requests get the cached metrics
+    assert 'pending_metrics' not in service.get_graph_data(progressive=True)
+
+def test_metrics_of_a_replaced_graph_are_dropped(make_graph_service):
+    service = make_graph_service(progressive=True)
+    generation = service.generation
+    service.filter_edges_by_weight(0.5, progressive=True)
+
+    assert service.complete_deferred_metrics(generation) is None
+    assert 'betweenness' in service.get_graph_data()['nodes'][0]
+
+def test_rebuild_during_the_metrics_job_keeps_the_new_graph_consistent(make_graph_service):
+    service = make_graph_service(progressive=True)
+    generation = service.generation
+
+    # Another request replaces the graph while the job computes on the old one
+    calculate = service.calculate_graph_metrics
+    def rebuild_midway(graph=None, include_clustering=True):
+        metrics = calculate(graph, include_clustering)
+        service.calculate_graph_metrics = calculate
+        service.build_graph(['x', 'y', 'z'], {('x', 'y'): 1, ('y', 'z'): 1}, progressive=True)
+        return metrics
+    service.calculate_graph_metrics = rebuild_midway
+
+    assert service.complete_deferred_metrics(generation) is None
+    betweenness = {node['id']: node['betweenness'] for node in service.get_graph_data()['nodes']}
+    assert betweenness == {'x': 0.0, 'y': 1.0, 'z': 0.0}
+
+def test_loading_progressive_data_does_not_cache_missing_metrics(sample_graph):
+    graph_data = GraphService().build_graph(*sample_graph, progressive=True)
+
+    service = GraphService()
+    service.load_graph_data(graph_data)
+    assert service.get_graph_data(progressive=True)['pending_metrics'] == list(DEFERRED_METRICS)
+    full = service.get_graph_data()
+    assert max(node['betweenness'] for node in full['nodes']) > 0
+    assert 'average_clustering' in full['metrics']
+
+def test_progressive_requests_cost_less(sample_graph):
+    text = ' '.join(sample_graph[0] * 50)
+    assert estimate_text_cost(text, 4, with_betweenness=False) < estimate_text_cost(text, 4)
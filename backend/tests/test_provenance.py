@@ -0,0 +1,86 @@
+from services.provenance import ProvenanceBuilder
+
+def build(documents, window_size=2):
+    """Index whitespace-tokenized documents; sentences end at '.'."""
+    builder = ProvenanceBuilder()
+    for document_id, text in documents:
+        sentences, tokens, start = [], [], 0
+        for i, sentence in enumerate(text.split('.')):
+            offset = start
+            for word in sentence.split():
+                offset = text.index(word, offset)
+                tokens.append((word, offset, offset + len(word), i))
+                offset += len(word)
+            sentences.append((start, start + len(sentence)))
+            start += len(sentence) + 1
+        builder.add_document(document_id, text, sentences, tokens)
+    return builder.build(window_size)
+
+def test_lemma_postings_are_sorted_positions():
+    index = build([('a', 'x y x'), ('b', 'y x')])
+
+    assert index.lemma_occurrences('x').tolist() == [0, 2, 4]
+    assert index.lemma_occurrences('y').tolist() == [1, 3]
+    assert index.lemma_occurrences('missing').tolist() == []
+
+def test_pairs_stay_inside_documents_and_window():
+    index = build([('a', 'x y z'), ('b', 'z w')], window_size=1)
+
+    assert index.cooccurrences() == {('x', 'y'): 1, ('y', 'z'): 1, ('w', 'z'): 1}
+    positions, partners = index.pair_occurrences('z', 'y')
+    assert positions.tolist() == [1]
+    assert partners.tolist() == [2]
+    assert index.pair_occurrences('x', 'z')[0].tolist() == []
+
+def test_pair_counts_match_a_window_scan():
+    tokens = 'a b a c b a d c a b'.split()
+    index = build([('doc', ' '.join(tokens))], window_size=3)
+
+    expected = {}
+    for i, token in enumerate(tokens):
+        for other in tokens[i + 1:i + 4]:
+            if other != token:
+                key = tuple(sorted((token, other)))
+                expected[key] = expected.get(key, 0) + 1
+    assert index.cooccurrences() == expected
+    assert index.tokens() == tokens
+
+def test_node_provenance_returns_sentences_with_highlights():
+    index = build([('a', 'graphs store facts. nodes link graphs'), ('b', 'graphs grow')])
+    result = index.node_provenance('graphs')
+
+    assert result['occurrences'] == 3
+    assert result['documents'] == 2
+    first, second, third = result['snippets']
+    assert (first['document'], first['sentence'], first['text']) == ('a', 0, 'graphs store facts')
+    assert first['highlights'] == [[0, 6]]
+    assert (second['sentence'], second['text']) == (1, ' nodes link graphs')
+    assert third['document'] == 'b'
+
+def test_edge_provenance_and_limit():
+    index = build([('a', 'x y. x y. x y')])
+
+    # Windows cross sentence boundaries, like the graph's co-occurrences
+    result = index.edge_provenance('x', 'y', limit=2)
+    assert result['occurrences'] == 5
+    assert len(result['snippets']) == 2
+    assert result['snippets'][0]['highlights'] == [[0, 1], [2, 3]]
+
+def test_process_documents_builds_graph_input_and_index(make_processor):
+    processor = make_processor({'the', 'and'}, window_size=2)
+    processor.nlp.add_pipe('sentencizer')
+
+    result = processor.process_documents([
+        ('first', 'The parser builds trees. Trees have nodes and edges.'),
+        ('second', 'Nodes join edges.')
+    ])
+
+    assert result['tokens'] == ['parser', 'builds', 'trees', 'trees', 'have', 'nodes', 'edges', 'nodes', 'join', 'edges']
+    assert result['cooccurrences'][('edges', 'nodes')] == 2
+    assert ('edges', 'parser') not in result['cooccurrences']
+
+    snippets = result['provenance'].node_provenance('join')['snippets']
+    assert snippets == [{
+        'document': 'second', 'sentence': 0, 'start': 0, 'end': 17,
+        'text': 'Nodes join edges.', 'highlights': [[6, 10]]
+    }]
@@ -0,0 +1,72 @@
+import threading
+from services.rate_limiter import GCRARateLimiter, MemoryBackend, SQLiteBackend
+
+def test_allows_a_burst_up_to_the_limit():
+    limiter = GCRARateLimiter(10, period=60)
+    results = [limiter.hit('a', now=1000.0) for _ in range(11)]
+
+    assert all(r.allowed for r in results[:10])
+    assert not results[10].allowed
+    assert 5.9 < results[10].retry_after <= 6.0
+    assert results[9].remaining == 0
+
+def test_budget_refills_over_time():
+    limiter = GCRARateLimiter(10, period=60)
+    for _ in range(10):
+        limiter.hit('a', now=1000.0)
+
+    assert not limiter.hit('a', now=1005.0).allowed
+    assert limiter.hit('a', now=1006.0).allowed
+
+def test_clients_are_limited_separately():
+    limiter = GCRARateLimiter(2, period=60)
+    limiter.hit('a', now=0.0)
+    limiter.hit('a', now=0.0)
+
+    assert not limiter.hit('a', now=0.0).allowed
+    assert limiter.hit('b', now=0.0).allowed
+
+def test_cost_weights():
+    limiter = GCRARateLimiter(10, period=60)
+
+    assert limiter.hit('a', cost=5, now=0.0).allowed
+    assert limiter.hit('a', cost=5, now=0.0).allowed
+    refused = limiter.hit('a', cost=5, now=0.0)
+    assert not refused.allowed
+    assert round(refused.retry_after) == 30
+    assert limiter.hit('a', cost=1, now=6.0).allowed
+
+def test_thread_safety():
+    limiter = GCRARateLimiter(100, period=3600)
+    allowed = []
+
+    def worker():
+        for _ in range(50):
+            allowed.append(limiter.hit('a').allowed)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sum(allowed) == 100
+
+def test_memory_backend_sweeps_idle_keys():
+    limiter = GCRARateLimiter(10, period=60, backend=MemoryBackend(max_keys=3))
+    for i in range(3):
+        limiter.hit(f'client-{i}', now=0.0)
+    limiter.hit('late', now=100.0)
+
+    assert set(limiter.backend._tats) == {'late'}
+
+def test_sqlite_backend_is_shared(tmp_path):
+    path = str(tmp_path / 'limits.sqlite3')
+    first = GCRARateLimiter(3, period=60, backend=SQLiteBackend(path))
+    second = GCRARateLimiter(3, period=60, backend=SQLiteBackend(path))
+
+    assert first.hit('a', now=0.0).allowed
+    assert second.hit('a', now=0.0).allowed
+    assert first.hit('a', now=0.0).allowed
+    assert not second.hit('a', now=0.0).allowed
+    assert second.hit('b', now=0.0).allowed
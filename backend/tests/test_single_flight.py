@@ -0,0 +1,90 @@
+import pytest
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from kg_gen.models import Graph
+from services.llm_client import LLMClient
+from services.single_flight import SingleFlight
+
+def test_concurrent_identical_calls_share_one_execution():
+    flight = SingleFlight()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        time.sleep(0.2)
+        return "result"
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: flight.do("key", slow), range(8)))
+
+    assert results == ["result"] * 8
+    assert len(calls) == 1
+    assert flight.stats()['coalesced'] == 7
+    assert flight.stats()['in_flight'] == 0
+
+def test_errors_are_shared_with_waiters():
+    flight = SingleFlight()
+
+    def failing():
+        time.sleep(0.1)
+        raise ValueError("Invalid response format")
+
+    def run(_):
+        with pytest.raises(ValueError):
+            flight.do("key", failing)
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(run, range(4)))
+
+    assert flight.stats()['executed'] == 1
+
+def test_concurrency_limit_queues_distinct_calls():
+    flight = SingleFlight(max_concurrent=2)
+    running = []
+    peak = []
+    lock = threading.Lock()
+
+    def work():
+        with lock:
+            running.append(1)
+            peak.append(len(running))
+        time.sleep(0.05)
+        with lock:
+            running.pop()
+
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        list(pool.map(lambda i: flight.do(f"key-{i}", work), range(6)))
+
+    assert max(peak) == 2
+    assert flight.stats()['executed'] == 6
+
+def test_queue_timeout():
+    flight = SingleFlight(max_concurrent=1, queue_timeout=0.05)
+    release = threading.Event()
+    thread = threading.Thread(target=flight.do, args=("a", lambda: release.wait(5)))
+    thread.start()
+    time.sleep(0.02)
+
+    with pytest.raises(TimeoutError):
+        flight.do("b", lambda: None)
+
+    release.set()
+    thread.join()
+
+def test_client_coalesces_identical_generate_calls():
+    class SlowKG:
+        calls = 0
+
+        def generate(self, input_data, context):
+            SlowKG.calls += 1
+            time.sleep(0.2)
+            return Graph(entities={"python"}, edges=set(), relations=set())
+
+    client = LLMClient(SlowKG(), model="model", temperature=0.0)
+    with ThreadPoolExecutor(max_workers=5) as pool:
+        results = list(pool.map(lambda _: client.generate("python", "Extract"), range(5)))
+
+    assert SlowKG.calls == 1
+    assert all(result.entities == {"python"} for result in results)
+    assert client.stats()['live_calls'] == 1
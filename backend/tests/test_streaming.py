@@ -0,0 +1,40 @@
+import json
+from services.streaming import JsonArrayStreamParser, format_sse
+
+def test_format_sse():
+    assert format_sse('entities', {'entities': ['a']}) == 'event: entities\ndata: {"entities": ["a"]}\n\n'
+
+def test_parser_yields_items_as_they_complete():
+    parser = JsonArrayStreamParser(('nodes', 'edges'))
+
+    assert parser.feed('```json\n{"nodes": [{"id": "a", "lab') == []
+    assert parser.feed('el": "A"}, {"id": "b"') == [('nodes', {'id': 'a', 'label': 'A'})]
+    assert parser.feed(', "label": "B"}],\n "edges": [') == [('nodes', {'id': 'b', 'label': 'B'})]
+    assert parser.feed('{"source": "a", "target": "b"}]}\n```') == [
+        ('edges', {'source': 'a', 'target': 'b'})
+    ]
+
+def test_parser_handles_brackets_inside_strings():
+    parser = JsonArrayStreamParser(('nodes',))
+    document = '{"nodes": [{"id": "a]", "label": "{x}"}, {"id": "b"}]}'
+
+    items = []
+    for i in range(0, len(document), 3):
+        items.extend(parser.feed(document[i:i + 3]))
+
+    assert items == [('nodes', {'id': 'a]', 'label': '{x}'}), ('nodes', {'id': 'b'})]
+
+def test_parser_matches_full_parse():
+    document = json.dumps({
+        'nodes': [{'id': f'n{i}', 'label': f'Node {i}'} for i in range(5)],
+        'edges': [{'source': 'n0', 'target': f'n{i}'} for i in range(1, 5)]
+    })
+    parser = JsonArrayStreamParser(('nodes', 'edges'))
+
+    items = []
+    for char in document:
+        items.extend(parser.feed(char))
+
+    parsed = json.loads(document)
+    assert [item for key, item in items if key == 'nodes'] == parsed['nodes']
+    assert [item for key, item in items if key == 'edges'] == parsed['edges']
@@ -0,0 +1,64 @@
+import json
+import time
+import pytest
+from services.stub_llm import StubKGGen
+from loadtest.run import percentile, summarize
+
+def test_generate_chains_words_from_the_input():
+    stub = StubKGGen(latency=0, entities_per_call=3)
+    graph = stub.generate("the graph connects nodes with weighted edges")
+
+    assert graph.entities == {'graph', 'connects', 'nodes'}
+    assert graph.relations == {('graph', 'related to', 'connects'), ('connects', 'related to', 'nodes')}
+    assert graph.edges == {'related to'}
+
+def test_generate_returns_canned_output():
+    output = {'entities': ['a', 'b'], 'edges': ['likes'], 'relations': [['a', 'likes', 'b']]}
+    graph = StubKGGen(latency=0, output=output).generate("ignored")
+
+    assert graph.entities == {'a', 'b'}
+    assert graph.relations == {('a', 'likes', 'b')}
+
+def test_latency_is_applied():
+    stub = StubKGGen(latency=0.05)
+    start = time.perf_counter()
+    stub.generate("some words here")
+    assert time.perf_counter() - start >= 0.05
+
+def test_errors_are_injected():
+    stub = StubKGGen(latency=0, error_rate=1.0)
+    with pytest.raises(RuntimeError):
+        stub.generate("text")
+
+def test_model_answers_prompts_with_json():
+    stub = StubKGGen(latency=0)
+    reply = json.loads(stub.model.generate_content("Summarize: alpha beta gamma").text)
+
+    assert reply['label'] and reply['summary']
+    assert len(reply['nodes']) == 3
+    assert len(reply['edges']) == 2
+
+def test_streamed_reply_joins_to_the_full_text():
+    stub = StubKGGen(latency=0, stream_pieces=4)
+    pieces = list(stub.model.generate_content("alpha beta", stream=True))
+
+    assert len(pieces) > 1
+    assert json.loads(''.join(p.text for p in pieces)) == stub.text_output("alpha beta")
+
+def test_percentile_nearest_rank():
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 0.5) == 50.0
+    assert percentile(values, 0.99) == 99.0
+    assert percentile([3.0], 0.95) == 3.0
+    assert percentile([], 0.5) is None
+
+def test_summarize_counts_errors_and_statuses():
+    samples = [(200, 0.1), (200, 0.2), (500, 0.3), (0, 0.4)]
+    summary = summarize(samples, elapsed=2.0)
+
+    assert summary['requests'] == 4
+    assert summary['throughput_rps'] == 2.0
+    assert summary['errors'] == 2
+    assert summary['error_rate'] == 0.5
+    assert summary['statuses'] == {'200': 2, '500': 1, '0': 1}
+    assert summary['max_ms'] == 400.0
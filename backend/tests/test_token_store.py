@@ -0,0 +1,60 @@
+from benchmarks.corpus import count_cooccurrences, generate_tokens
+from services.admission import estimate_text_cost
+from services.token_store import PositionalTokens, TokenStore, join_pair_keys
+
+def test_counts_match_a_window_scan():
+    tokens = generate_tokens(2000, seed=3)
+    positional = PositionalTokens(tokens)
+
+    for window_size in (1, 2, 4, 7):
+        assert positional.cooccurrences(window_size) == count_cooccurrences(tokens, window_size)
+
+def test_several_windows_in_one_pass():
+    tokens = generate_tokens(1500, seed=5)
+    by_window = PositionalTokens(tokens).cooccurrences_by_window([5, 1, 3])
+
+    assert sorted(by_window) == [1, 3, 5]
+    for window_size, counts in by_window.items():
+        assert counts == count_cooccurrences(tokens, window_size)
+
+def test_windows_longer_than_the_document():
+    tokens = generate_tokens(50, seed=7)
+    positional = PositionalTokens(tokens)
+    by_window = positional.cooccurrences_by_window([1, 2_000_000])
+
+    assert by_window[2_000_000] == count_cooccurrences(tokens, 49)
+    assert positional.cooccurrences(2_000_000) == by_window[2_000_000]
+
+def test_short_and_empty_documents():
+    assert PositionalTokens([]).cooccurrences(4) == {}
+    assert PositionalTokens(['solo']).cooccurrences_by_window([1, 2]) == {1: {}, 2: {}}
+    assert PositionalTokens(['b', 'a', 'b']).cooccurrences(10) == {('a', 'b'): 2}
+
+def test_store_evicts_least_recently_used():
+    store = TokenStore(max_documents=2)
+    store.put('one', ['a'])
+    store.put('two', ['b'])
+    store.get('one')
+    store.put('three', ['c'])
+
+    assert 'one' in store and 'three' in store
+    assert 'two' not in store
+    assert store.stats()['documents'] == 2
+
+def test_new_window_size_does_not_reparse(make_processor):
+    processor = make_processor({'the', 'on'})
+
+    parses = []
+    preprocess = processor.preprocess_text
+    processor.preprocess_text = lambda text, *args: parses.append(text) or preprocess(text, *args)
+
+    text = 'the cat sat on the mat near the cat'
+    narrow = processor.process(text, 1)
+    wide = processor.process(text, 3)
+
+    assert parses == [text]
+    assert narrow['tokens'] == wide['tokens'] == ['cat', 'sat', 'mat', 'near', 'cat']
+    assert narrow['cooccurrences'] == {('cat', 'sat'): 1, ('mat', 'sat'): 1, ('mat', 'near'): 1, ('cat', 'near'): 1}
+    assert wide['cooccurrences'][('cat', 'mat')] == 2
+    assert join_pair_keys(narrow['cooccurrences'])['cat_sat'] == 1
+    assert estimate_text_cost(text, 3, parsed=True) < estimate_text_cost(text, 3)
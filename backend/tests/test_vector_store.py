@@ -0,0 +1,87 @@
+import os
+import numpy as np
+import pytest
+import spacy
+from spacy.vectors import Vectors
+from services.vector_store import VectorStore, build_vector_store, open_vector_store
+
+WORDS = ['graph', 'node', 'edge', 'Graph', 'knowledge']
+
+@pytest.fixture
+def nlp():
+    nlp = spacy.blank('en')
+    nlp.vocab.vectors = Vectors(strings=nlp.vocab.strings, shape=(len(WORDS), 8))
+    rng = np.random.default_rng(0)
+    for word in WORDS:
+        nlp.vocab.set_vector(word, rng.normal(size=8).astype(np.float32))
+    return nlp
+
+def test_vectors_match_spacy(nlp, tmp_path):
+    store = VectorStore(build_vector_store(nlp, str(tmp_path / 'vectors')))
+
+    assert len(store) == len(WORDS)
+    for word in WORDS:
+        assert np.array_equal(store.vector(word), nlp.vocab.get_vector(word))
+    assert store.vector('missing') is None
+    assert 'graph' in store and 'GRAPH' not in store
+
+def test_lookups_are_zero_copy(nlp, tmp_path):
+    store = VectorStore(build_vector_store(nlp, str(tmp_path / 'vectors')))
+
+    vector = store.vector('node')
+    assert isinstance(store.matrix, np.memmap)
+    assert np.shares_memory(vector, store.matrix)
+    assert not vector.flags.writeable
+
+def test_gather_marks_missing_words(nlp, tmp_path):
+    store = VectorStore(build_vector_store(nlp, str(tmp_path / 'vectors')))
+
+    vectors, found = store.gather(['edge', 'missing', 'graph'])
+    assert found.tolist() == [True, False, True]
+    assert np.array_equal(vectors[0], nlp.vocab.get_vector('edge'))
+    assert not vectors[1].any()
+
+def test_float16_store(nlp, tmp_path):
+    store = VectorStore(build_vector_store(nlp, str(tmp_path / 'vectors'), dtype='float16'))
+
+    assert store.dtype == np.float16
+    assert np.allclose(store.vector('edge'), nlp.vocab.get_vector('edge'), atol=1e-2)
+    assert not store.attach(nlp)
+
+def test_attach_keeps_spacy_vectors_working(nlp, tmp_path):
+    expected = nlp('graph node').vector.copy()
+    store = open_vector_store(nlp, str(tmp_path / 'vectors'))
+
+    assert store.attach(nlp)
+    assert np.shares_memory(nlp.vocab.vectors.data, store.matrix)
+    assert np.allclose(nlp('graph node').vector, expected)
+
+def test_rebuild_keeps_open_stores_readable(nlp, tmp_path):
+    path = str(tmp_path / 'vectors')
+    store = VectorStore(build_vector_store(nlp, path))
+    before = np.array(store.matrix[:3])
+
+    rebuilt = VectorStore(build_vector_store(nlp, path, dtype='float16'))
+
+    assert rebuilt.matrix.dtype == np.float16
+    assert np.array_equal(store.matrix[:3], before)
+    assert sorted(os.listdir(tmp_path)) == ['vectors']
+
+def test_open_builds_once(nlp, tmp_path):
+    path = str(tmp_path / 'vectors')
+    open_vector_store(nlp, path)
+    nlp.vocab.set_vector('graph', np.zeros(8, dtype=np.float32))
+
+    assert open_vector_store(nlp, path).vector('graph').any()
+
+def test_text_processor_term_vectors_use_store(nlp, tmp_path, monkeypatch):
+    from text_processor import TextProcessor
+    monkeypatch.setattr(spacy, 'load', lambda name: nlp)
+
+    plain = TextProcessor()
+    plain_vectors, plain_found = plain._term_vectors(['knowledge graph', 'missing edge', 'node'])
+    stored = TextProcessor(vector_store_path=str(tmp_path / 'vectors'))
+    store_vectors, store_found = stored._term_vectors(['knowledge graph', 'missing edge', 'node'])
+
+    assert plain_found.tolist() == store_found.tolist() == [True, False, True]
+    assert np.allclose(plain_vectors, store_vectors)
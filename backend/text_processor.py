@@ -1,13 +1,35 @@
 import spacy
-from typing import List, Dict, Set, Tuple, Any
+from spacy.attrs import ORTH
+from spacy.language import Language
+from typing import List, Dict, Set, Tuple, Any, Optional
 from collections import Counter
 from sklearn.feature_extraction.text import TfidfVectorizer
 import numpy as np
+from services.vector_store import open_vector_store
+from services.instrumentation import instrumentation
+from services.provenance import ProvenanceBuilder
+from services.token_store import PositionalTokens, TokenStore
+from services.lemma_lookup import LookupLemmatizer
+
+# 'full' runs the whole spaCy pipeline; 'fast' only the tokenizer and a lemma table
+TOKENIZATION_MODES = ('full', 'fast')
 
 class TextProcessor:
-    def __init__(self, window_size=4):
-        # Load English language model with word vectors
-        self.nlp = spacy.load('en_core_web_md')
+    def __init__(self, window_size=4, vector_store_path: Optional[str] = None,
+                 vector_dtype: str = 'float32', token_store_documents: int = 32,
+                 tokenization: str = 'full', nlp: Optional[Language] = None,
+                 lemmatizer: Optional[LookupLemmatizer] = None):
+        if tokenization not in TOKENIZATION_MODES:
+            raise ValueError(f"tokenization must be one of {', '.join(TOKENIZATION_MODES)}")
+        # Load English language model with word vectors, unless a pipeline is given
+        self.nlp = nlp if nlp is not None else spacy.load('en_core_web_md')
+
+        # Optionally serve vectors from a memory-mapped store shared by all
+        # processes; a float32 store also replaces the model's heap copy
+        self.vector_store = None
+        if vector_store_path:
+            self.vector_store = open_vector_store(self.nlp, vector_store_path, dtype=vector_dtype)
+            self.vector_store.attach(self.nlp)
         
         # Get default stop words from spaCy
         self.stop_words = self.nlp.Defaults.stop_words
@@ -22,6 +44,14 @@ class TextProcessor:
         self.stop_words.update(self.technical_stop_words)
         self.window_size = window_size
 
+        # Kept tokens of recent texts, so a new window size skips the parse
+        self.token_store = TokenStore(max_documents=token_store_documents)
+
+        # Default mode of the co-occurrence path; the lemma table loads on first use
+        self.tokenization = tokenization
+        self._lookup_lemmatizer: Optional[LookupLemmatizer] = lemmatizer
+        self._fast_forms: Dict[int, Optional[str]] = {}
+
     def lemmatize(self, text: str) -> str:
         """Lemmatize text using spaCy."""
         if not text:
@@ -46,23 +76,139 @@ class TextProcessor:
                 ngrams.add((tokens[i], tokens[j]))
         return ngrams
 
-    def preprocess_text(self, text: str) -> List[str]:
-        """Preprocess text using spaCy's advanced NLP features."""
-        doc = self.nlp(text)
+    def preprocess_text(self, text: str, tokenization: Optional[str] = None) -> List[str]:
+        """Preprocess text using spaCy's advanced NLP features, or the fast tokenizer-only path."""
+        if (tokenization or self.tokenization) == 'fast':
+            return self.preprocess_text_fast(text)
+        with instrumentation.stage('spacy_parse'):
+            doc = self.nlp(text)
+        return [self._token_form(token) for token in doc if self._keep_token(token)]
+
+    def preprocess_text_fast(self, text: str) -> List[str]:
+        """
+        Preprocess text with the tokenizer and a lemma lookup table only.
+
+        No pipeline component (tagger, parser, NER, lemmatizer) runs. Tokens
+        are split and filtered exactly like in preprocess_text: the stop-word,
+        punctuation, space, number and length checks only use lexical
+        attributes, and their outcome is cached per vocabulary entry. Only
+        the token forms can differ from the full pipeline:
+
+        - Every kept word is looked up, whatever its part of speech. The full
+          pipeline lemmatizes nouns, verbs, adjectives and proper nouns only
+          and lowercases the rest, so e.g. "better" (adverb) becomes "well"
+          here but stays "better" there.
+        - A form has one lemma regardless of context: "saw" is always "see",
+          "meeting" always "meet", even where the full pipeline tags a noun.
+        - Forms missing from the table (names, jargon, typos) are only
+          lowercased; the full pipeline lemmatizes them by rule.
+        - Lemmas are lowercased, while the full pipeline keeps the case of
+          proper noun lemmas ("Paris" there, "paris" here).
+
+        On English prose most kept tokens are nouns and verbs in the table,
+        so the co-occurrence graphs of both modes share nearly all nodes.
+
+        Args:
+            text (str): Input text
+
+        Returns:
+            List[str]: Kept lowercase lemmas in document order
+        """
+        with instrumentation.stage('tokenize'):
+            orths = self.nlp.make_doc(text).to_array(ORTH).tolist()
+
+        forms = self._fast_forms
         tokens = []
-        for token in doc:
-            if (token.text.lower() not in self.stop_words and
+        for orth in orths:
+            if orth not in forms:
+                forms[orth] = self._fast_form(orth)
+            form = forms[orth]
+            if form is not None:
+                tokens.append(form)
+        return tokens
+
+    def _fast_form(self, orth: int) -> Optional[str]:
+        """Kept form of a vocabulary entry, or None if the entry is filtered out."""
+        lexeme = self.nlp.vocab[orth]
+        if not self._keep_token(lexeme):
+            return None
+        if self._lookup_lemmatizer is None:
+            self._lookup_lemmatizer = LookupLemmatizer(lang=self.nlp.lang)
+        return self._lookup_lemmatizer(lexeme.text)
+
+    def _keep_token(self, token) -> bool:
+        return (token.text.lower() not in self.stop_words and
                 not token.is_punct and
                 not token.is_space and
                 not (token.like_num and token.text.isdigit()) and
-                len(token.text) > 1):
-                
-                if token.pos_ in {'VERB', 'NOUN', 'PROPN', 'ADJ'}:
-                    tokens.append(token.lemma_)
+                len(token.text) > 1)
+
+    def _token_form(self, token) -> str:
+        if token.pos_ in {'VERB', 'NOUN', 'PROPN', 'ADJ'}:
+            return token.lemma_
+        return token.text.lower()
+
+    def process_documents(self, documents: List[Tuple[str, str]],
+                          window_size: Optional[int] = None,
+                          tokenization: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Process several documents into one co-occurrence graph input with a provenance index.
+
+        Tokens are kept exactly as preprocess_text keeps them; co-occurrence
+        windows do not cross document boundaries. In fast mode there are no
+        sentence boundaries, so every document is one snippet sentence.
+
+        Args:
+            documents (List[Tuple[str, str]]): (document id, text) pairs
+            window_size (Optional[int]): Co-occurrence window; defaults to self.window_size
+            tokenization (Optional[str]): 'full' or 'fast'; defaults to self.tokenization
+
+        Returns:
+            Dict[str, Any]: 'tokens', 'cooccurrences' keyed by sorted token
+                pairs, and 'provenance', the ProvenanceIndex
+        """
+        window_size = window_size or self.window_size
+        fast = (tokenization or self.tokenization) == 'fast'
+        builder = ProvenanceBuilder()
+
+        with instrumentation.stage('tokenize' if fast else 'spacy_parse'):
+            texts = (text for _, text in documents)
+            docs = self.nlp.tokenizer.pipe(texts) if fast else self.nlp.pipe(texts)
+            for (document_id, text), doc in zip(documents, docs):
+                # Without a parser or sentencizer the whole document is one sentence
+                if doc.has_annotation('SENT_START') or doc.has_annotation('DEP'):
+                    sentences = list(doc.sents)
                 else:
-                    tokens.append(token.text.lower())
-        return tokens
+                    sentences = [doc[:]]
+
+                tokens = []
+                for i, sentence in enumerate(sentences):
+                    for token in sentence:
+                        if fast:
+                            if token.orth not in self._fast_forms:
+                                self._fast_forms[token.orth] = self._fast_form(token.orth)
+                            form = self._fast_forms[token.orth]
+                        else:
+                            form = self._token_form(token) if self._keep_token(token) else None
+                        if form is not None:
+                            tokens.append((form, token.idx, token.idx + len(token.text), i))
+                builder.add_document(
+                    document_id, text,
+                    sentences=[(sentence.start_char, sentence.end_char) for sentence in sentences],
+                    tokens=tokens
+                )
 
+        with instrumentation.stage('cooccurrence'):
+            index = builder.build(window_size)
+            cooccurrences = index.cooccurrences()
+
+        return {
+            "tokens": index.tokens(),
+            "cooccurrences": cooccurrences,
+            "provenance": index
+        }
+
+    @instrumentation.timed('extract_ngrams')
     def extract_ngrams(self, tokens: List[str]) -> Set[Tuple[str, str]]:
         """Extract n-grams and their co-occurrence counts."""
         cooccurrences = set()
@@ -71,26 +217,82 @@ class TextProcessor:
                 cooccurrences.add((tokens[i], tokens[j]))
         return cooccurrences
 
-    def process(self, text: str, window_size: int = 2) -> Dict[str, Any]:
-        """Process text and extract co-occurrences"""
-        # Preprocess text
-        tokens = self.preprocess_text(text)
-        
-        # Extract co-occurrences
-        cooccurrences = {}
-        for i in range(len(tokens)):
-            for j in range(max(0, i - window_size), min(len(tokens), i + window_size + 1)):
-                if i != j:
-                    # Sort tokens to ensure consistent key ordering
-                    pair = tuple(sorted([tokens[i], tokens[j]]))
-                    key = f"{pair[0]}_{pair[1]}"
-                    cooccurrences[key] = cooccurrences.get(key, 0) + 1
+    def positional_tokens(self, text: str, tokenization: Optional[str] = None) -> PositionalTokens:
+        """
+        Kept tokens of a text, parsed once and then served from the token store.
 
-        return {
-            "tokens": tokens,
+        Args:
+            text (str): Input text
+            tokenization (Optional[str]): 'full' or 'fast'; defaults to self.tokenization
+
+        Returns:
+            PositionalTokens: Tokens in document order as vocabulary ids
+        """
+        tokenization = tokenization or self.tokenization
+        positional = self.token_store.get(text, tokenization)
+        if positional is None:
+            tokens = self.preprocess_text(text, tokenization)
+            positional = self.token_store.put(text, tokens, tokenization)
+        return positional
+
+    def process(self, text: str, window_size: Optional[int] = None,
+                tokenization: Optional[str] = None, weighting: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Process text and extract co-occurrences.
+
+        Each token is paired with the window_size tokens after it; a token
+        does not pair with itself. Only the first call for a text runs the
+        spaCy pipeline.
+
+        Args:
+            text (str): Input text
+            window_size (Optional[int]): Co-occurrence window; defaults to self.window_size
+            tokenization (Optional[str]): 'full' or 'fast'; defaults to self.tokenization
+            weighting (Optional[str]): Association measure for edge weights, one
+                of services.association.WEIGHTINGS
+
+        Returns:
+            Dict[str, Any]: 'tokens' and 'cooccurrences' keyed by sorted token
+                pairs; with a weighting also 'weights', aligned with cooccurrences
+        """
+        window_size = window_size or self.window_size
+        positional = self.positional_tokens(text, tokenization)
+        with instrumentation.stage('cooccurrence'):
+            cooccurrences = positional.cooccurrences(window_size)
+
+        result = {
+            "tokens": list(positional.tokens),
             "cooccurrences": cooccurrences
         }
+        if weighting:
+            with instrumentation.stage('association'):
+                result["weights"] = positional.weights(window_size, weighting)
+        return result
+
+    def process_windows(self, text: str, window_sizes: List[int],
+                        tokenization: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Process text and extract co-occurrences for several window sizes at once.
+
+        Args:
+            text (str): Input text
+            window_sizes (List[int]): Co-occurrence windows
+            tokenization (Optional[str]): 'full' or 'fast'; defaults to self.tokenization
 
+        Returns:
+            Dict[str, Any]: 'tokens' and 'cooccurrences_by_window', the
+                co-occurrences of every window size
+        """
+        positional = self.positional_tokens(text, tokenization)
+        with instrumentation.stage('cooccurrence'):
+            by_window = positional.cooccurrences_by_window(window_sizes)
+
+        return {
+            "tokens": list(positional.tokens),
+            "cooccurrences_by_window": by_window
+        }
+
+    @instrumentation.timed('key_terms')
     def extract_key_terms(self, text: str, max_terms: int = 10) -> List[Dict[str, float]]:
         """
         Extract key terms using TF-IDF and word vectors
@@ -104,20 +306,21 @@ class TextProcessor:
         term_freq = Counter(all_terms)
         vectorizer = TfidfVectorizer(stop_words='english')
         tfidf_matrix = vectorizer.fit_transform([text])
-        feature_names = vectorizer.get_feature_names_out()
-        
+        feature_index = {name: i for i, name in enumerate(vectorizer.get_feature_names_out())}
+
+        candidates = term_freq.most_common(max_terms * 2)
+        term_vectors, has_vector = self._term_vectors([term for term, _ in candidates])
+        doc_vector = doc.vector / np.linalg.norm(doc.vector)
+
         term_scores = []
-        for term, freq in term_freq.most_common(max_terms * 2):
-            term_doc = self.nlp(term)
-            if len(term_doc) > 0 and term_doc[0].has_vector:
-                doc_vector = doc.vector / np.linalg.norm(doc.vector)
-                term_vector = term_doc.vector / np.linalg.norm(term_doc.vector)
+        for (term, freq), term_vector, found in zip(candidates, term_vectors, has_vector):
+            if found:
+                term_vector = term_vector / np.linalg.norm(term_vector)
                 vector_similarity = np.dot(doc_vector, term_vector)
                 
                 tfidf_score = 0
-                if term in feature_names:
-                    term_idx = list(feature_names).index(term)
-                    tfidf_score = tfidf_matrix[0, term_idx]
+                if term in feature_index:
+                    tfidf_score = tfidf_matrix[0, feature_index[term]]
                 
                 combined_score = (vector_similarity + tfidf_score) / 2
                 term_scores.append({
@@ -128,11 +331,84 @@ class TextProcessor:
         
         return sorted(term_scores, key=lambda x: x['score'], reverse=True)[:max_terms]
 
+    def _term_vectors(self, terms: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Average word vectors of several terms in one batch.
+
+        Terms are only tokenized, not run through the full pipeline; vectors
+        are gathered from the vector store when one is configured.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: One vector per term and a mask of
+                the terms whose first token has a vector
+        """
+        term_tokens = [[token.text for token in self.nlp.make_doc(term)] for term in terms]
+        words = [word for tokens in term_tokens for word in tokens]
+
+        if self.vector_store is not None:
+            word_vectors, word_found = self.vector_store.gather(words)
+        else:
+            vocab = self.nlp.vocab
+            width = vocab.vectors.shape[1]
+            word_found = np.array([vocab.has_vector(word) for word in words], dtype=bool)
+            word_vectors = np.array(
+                [vocab.get_vector(word) for word in words], dtype=np.float32
+            ).reshape(len(words), width)
+
+        vectors = np.zeros((len(terms), word_vectors.shape[1]), dtype=np.float32)
+        found = np.zeros(len(terms), dtype=bool)
+        start = 0
+        for i, tokens in enumerate(term_tokens):
+            if tokens:
+                vectors[i] = word_vectors[start:start + len(tokens)].mean(axis=0)
+                found[i] = word_found[start]
+            start += len(tokens)
+        return vectors, found
+
+    def find_related_terms(self, term: str, text: str, window_size: int = 5) -> List[Dict[str, float]]:
+        """
+        Find terms related to a given term using word vectors and co-occurrence
+        """
+        doc = self.nlp(text)
+        term_doc = self.nlp.make_doc(term)
+
+        related_terms = {}
+
+        # Find terms using word vectors
+        if len(term_doc) > 0 and term_doc[0].has_vector:
+            term_vector = term_doc[0].vector
+            term_norm = np.linalg.norm(term_vector)
+
+            for token in doc:
+                if (token.has_vector and
+                    token.text.lower() != term.lower() and
+                    token.text.lower() not in self.stop_words):
+                    similarity = token.vector.dot(term_vector) / (np.linalg.norm(token.vector) * term_norm)
+                    related_terms[token.text] = float(similarity)
+
+        # Add co-occurrence information
+        tokens = [token.text.lower() for token in doc]
+        term_indices = [i for i, t in enumerate(tokens) if t == term.lower()]
+
+        for idx in term_indices:
+            start = max(0, idx - window_size)
+            end = min(len(tokens), idx + window_size + 1)
+
+            for i in range(start, end):
+                if i != idx:
+                    coterm = tokens[i]
+                    if coterm not in self.stop_words:
+                        related_terms[coterm] = related_terms.get(coterm, 0) + (1 / (abs(i - idx)))
+
+        result = [{'term': t, 'score': s} for t, s in related_terms.items()]
+        return sorted(result, key=lambda x: x['score'], reverse=True)
+
     def process_for_topic_modeling(self, text: str) -> List[str]:
         """
         Process text for topic modeling
         """
-        doc = self.nlp(text)
+        with instrumentation.stage('spacy_parse'):
+            doc = self.nlp(text)
         tokens = []
         for token in doc:
             if (token.pos_ in {'NOUN', 'PROPN', 'VERB', 'ADJ'} and
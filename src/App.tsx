@@ -1,4 +1,4 @@
-import React, { useState } from 'react';
+import React, { useRef, useState } from 'react';
 import { Button } from './components/ui/button';
 import { Textarea } from './components/ui/textarea';
 import { Card, CardContent, CardDescription, CardHeader, CardTitle } from './components/ui/card';
@@ -7,6 +7,7 @@ import { TextAnalysisService } from './services/textAnalysis';
 import GraphVisualization from './components/GraphVisualization';
 import { GraphData } from './types/graph';
 import { LLMLog } from './components/LLMLog';
+import { applyGraphDelta, isDeltaResponse, MetricsJobHandle, VersionedGraphResponse } from './services/graphDelta';
 
 function App() {
   const [text, setText] = useState('');
@@ -16,6 +17,15 @@ function App() {
   const [error, setError] = useState<string | null>(null);
   const [llmLogs, setLlmLogs] = useState<string[]>([]);
   const [isFiltering, setIsFiltering] = useState(false);
+  // Version of the server-side graph held in graphData, so filtering only transfers changes
+  const [graphVersion, setGraphVersion] = useState<string | null>(null);
+  // Read by the metrics poller, which outlives the render it was started from
+  const graphVersionRef = useRef<string | null>(null);
+
+  const updateGraphVersion = (version: string | null) => {
+    graphVersionRef.current = version;
+    setGraphVersion(version);
+  };
 
   const handleTextChange = (e: React.ChangeEvent<HTMLTextAreaElement>) => {
     setText(e.target.value);
@@ -34,6 +44,7 @@ function App() {
     setIsAnalyzing(true);
     setError(null);
     setGraphData(null);
+    updateGraphVersion(null);
     setLlmLogs([]);
 
     try {
@@ -70,6 +81,28 @@ function App() {
     }
   };
 
+  // Wait for the deferred metrics of a progressive response and merge them in
+  const completeMetrics = async (job: MetricsJobHandle) => {
+    try {
+      for (;;) {
+        const response = await fetch(`http://localhost:5000${job.status_url}?wait=25`);
+        if (!response.ok) return;
+        const status = await response.json();
+        if (status.status === 'pending' || status.status === 'running') continue;
+        if (status.status !== 'succeeded') return;
+
+        const completed: VersionedGraphResponse = status.result;
+        // The delta is against the progressive version; drop it if the graph moved on
+        if (!isDeltaResponse(completed) || graphVersionRef.current !== completed.base_version) return;
+        setGraphData(current => (current ? applyGraphDelta(current, completed.delta) : current));
+        updateGraphVersion(completed.version);
+        return;
+      }
+    } catch {
+      // Metrics are best effort; the graph is already shown
+    }
+  };
+
   const handleFilterChange = async (minWeight: number) => {
     if (!graphData) return;
     
@@ -80,15 +113,23 @@ function App() {
         headers: {
           'Content-Type': 'application/json',
         },
-        body: JSON.stringify({ min_weight: minWeight }),
+        body: JSON.stringify({ min_weight: minWeight, since_version: graphVersion, progressive: true }),
       });
 
       if (!response.ok) {
         throw new Error('Failed to filter edges');
       }
 
-      const filteredData = await response.json();
-      setGraphData(filteredData);
+      const filteredData: VersionedGraphResponse = await response.json();
+      if (isDeltaResponse(filteredData)) {
+        setGraphData(applyGraphDelta(graphData, filteredData.delta, filteredData.pending_metrics));
+      } else {
+        setGraphData(filteredData);
+      }
+      updateGraphVersion(filteredData.version ?? null);
+      if (filteredData.metrics_job) {
+        void completeMetrics(filteredData.metrics_job);
+      }
     } catch (err) {
       setError(err instanceof Error ? err.message : 'An error occurred while filtering');
     } finally {
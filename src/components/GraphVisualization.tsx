@@ -182,7 +182,7 @@ const GraphVisualization: React.FC<GraphVisualizationProps> = ({ data, onFilterC
           <div className="grid grid-cols-2 gap-2 text-sm text-gray-300">
             <div>Nodes: {data.metrics.node_count}</div>
             <div>Density: {data.metrics.density.toFixed(3)}</div>
-            <div>Avg. Clustering: {data.metrics.average_clustering.toFixed(3)}</div>
+            <div>Avg. Clustering: {data.metrics.average_clustering?.toFixed(3) ?? '…'}</div>
             <div>Avg. Degree: {data.metrics.average_degree.toFixed(2)}</div>
             <div>Components: {data.metrics.connected_components}</div>
             <div>Largest Component: {(data.metrics.largest_component_ratio * 100).toFixed(1)}%</div>
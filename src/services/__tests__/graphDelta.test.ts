@@ -0,0 +1,56 @@
+import { applyGraphDelta, GraphDelta } from '../graphDelta';
+import { GraphData } from '../../types/graph';
+
+const node = (id: string, betweenness?: number) => ({
+  id,
+  label: id,
+  keyTerms: [],
+  ...(betweenness === undefined ? {} : { betweenness })
+});
+
+const emptyDelta: GraphDelta = {
+  nodes_added: [],
+  nodes_removed: [],
+  nodes_changed: [],
+  edges_added: [],
+  edges_removed: [],
+  edges_changed: []
+};
+
+describe('applyGraphDelta', () => {
+  const graph: GraphData = {
+    nodes: [node('a', 0), node('b', 1), node('c', 0)],
+    edges: [
+      { source: 'a', target: 'b', weight: 1 },
+      { source: 'b', target: 'c', weight: 1 }
+    ]
+  };
+
+  test('drops betweenness a changed node no longer carries', () => {
+    const result = applyGraphDelta(graph, { ...emptyDelta, nodes_changed: [node('b')] });
+
+    expect(result.nodes.find(n => n.id === 'b')).not.toHaveProperty('betweenness');
+    expect(result.nodes.find(n => n.id === 'a')?.betweenness).toBe(0);
+  });
+
+  test('drops pending betweenness once edges change', () => {
+    const delta = { ...emptyDelta, edges_removed: [{ source: 'c', target: 'b' }] };
+    const result = applyGraphDelta(graph, delta, ['betweenness', 'average_clustering']);
+
+    expect(result.edges).toHaveLength(1);
+    result.nodes.forEach(n => expect(n).not.toHaveProperty('betweenness'));
+  });
+
+  test('keeps betweenness when no edges change', () => {
+    const result = applyGraphDelta(graph, emptyDelta, ['betweenness']);
+
+    expect(result.nodes.map(n => n.betweenness)).toEqual([0, 1, 0]);
+  });
+
+  test('takes betweenness delivered by the metrics job', () => {
+    const delta = { ...emptyDelta, nodes_changed: [node('a', 0.5)] };
+    const result = applyGraphDelta({ ...graph, nodes: [node('a'), node('b')] }, delta);
+
+    expect(result.nodes.find(n => n.id === 'a')?.betweenness).toBe(0.5);
+  });
+});
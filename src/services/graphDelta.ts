@@ -0,0 +1,89 @@
+import { Edge, GraphData, GraphMetrics, Node } from '../types/graph';
+
+export interface GraphDelta {
+  nodes_added: Node[];
+  nodes_removed: string[];
+  nodes_changed: Node[];
+  edges_added: Edge[];
+  edges_removed: { source: string; target: string }[];
+  edges_changed: Edge[];
+  metrics?: GraphMetrics;
+}
+
+export interface DeltaResponse {
+  version: string;
+  base_version: string;
+  delta: GraphDelta;
+}
+
+// Background job computing the metrics a progressive response left out
+export interface MetricsJobHandle {
+  job_id: string;
+  status_url: string;
+  events_url: string;
+}
+
+interface ProgressiveFields {
+  pending_metrics?: string[];
+  metrics_job?: MetricsJobHandle | null;
+}
+
+export type VersionedGraphResponse = ((GraphData & { version?: string }) | DeltaResponse) & ProgressiveFields;
+
+export const isDeltaResponse = (response: VersionedGraphResponse): response is DeltaResponse =>
+  'delta' in response;
+
+const endpointId = (endpoint: string | Node): string =>
+  typeof endpoint === 'string' ? endpoint : endpoint.id;
+
+const edgeKey = (edge: { source: string | Node; target: string | Node }): string => {
+  const source = endpointId(edge.source);
+  const target = endpointId(edge.target);
+  return source <= target ? `${source}\u0000${target}` : `${target}\u0000${source}`;
+};
+
+// Node attributes the backend may leave out until the metrics job delivers them
+const DEFERRED_NODE_METRICS = ['betweenness'] as const;
+
+const withoutDeferredMetrics = (node: Node, keep: Node | undefined, pending: Set<string>): Node => {
+  const stale = DEFERRED_NODE_METRICS.filter(name => name in node && (keep ? !(name in keep) : pending.has(name)));
+  if (stale.length === 0) return node;
+  const result = { ...node };
+  stale.forEach(name => delete result[name]);
+  return result;
+};
+
+/**
+ * Apply a delta from the backend to the graph the client already has.
+ * Edges are undirected, so they are matched regardless of direction.
+ *
+ * Changed nodes arrive in full, so a deferred metric they leave out is
+ * dropped rather than kept from the old graph. Once edges change, every
+ * node's metrics listed in pendingMetrics are dropped too, until the
+ * metrics job delivers them.
+ */
+export const applyGraphDelta = (graph: GraphData, delta: GraphDelta, pendingMetrics: string[] = []): GraphData => {
+  const removedNodes = new Set(delta.nodes_removed);
+  const changedNodes = new Map(delta.nodes_changed.map(node => [node.id, node]));
+  const edgesChanged = delta.edges_added.length + delta.edges_removed.length + delta.edges_changed.length > 0;
+  const pending = new Set(edgesChanged ? pendingMetrics : []);
+  const nodes = graph.nodes
+    .filter(node => !removedNodes.has(node.id))
+    .map(node => {
+      const changed = changedNodes.get(node.id);
+      return withoutDeferredMetrics(changed ? { ...node, ...changed } : node, changed, pending);
+    })
+    .concat(delta.nodes_added);
+
+  const removedEdges = new Set(delta.edges_removed.map(edgeKey));
+  const changedEdges = new Map(delta.edges_changed.map(edge => [edgeKey(edge), edge]));
+  const edges = graph.edges
+    .filter(edge => !removedEdges.has(edgeKey(edge)))
+    .map(edge => {
+      const changed = changedEdges.get(edgeKey(edge));
+      return changed ? { ...edge, ...changed, source: edge.source, target: edge.target } : edge;
+    })
+    .concat(delta.edges_added);
+
+  return { ...graph, nodes, edges, metrics: delta.metrics ?? graph.metrics };
+};
@@ -28,7 +28,8 @@ export interface Edge {
 export interface GraphMetrics {
   node_count: number;
   density: number;
-  average_clustering: number;
+  // Left out of progressive responses until the metrics job finishes
+  average_clustering?: number;
   average_degree: number;
   connected_components: number;
   largest_component_ratio: number;